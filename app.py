@@ -6,26 +6,18 @@ Version: 2.0 with Full CRUD Support
 
 import streamlit as st
 import os
-from dotenv import load_dotenv
 import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Force reload of modules (for Streamlit Cloud)
-import importlib
-if 'src.sheets_manager' in sys.modules:
-    importlib.reload(sys.modules['src.sheets_manager'])
-if 'src.conflict_detector' in sys.modules:
-    importlib.reload(sys.modules['src.conflict_detector'])
-
-from src.sheets_manager import get_sheets_manager
-from src.conflict_detector import ConflictDetector
-import pandas as pd
-import requests
-
-# Load environment variables
-load_dotenv()
+# Only light modules here (src.config also loads .env). The data and AI
+# modules pull in pandas, scipy and requests, so they are imported where
+# they are first needed; the warm-up thread loads them in the background.
+from src.config import get_setting, get_bool_setting
+from src.metrics import get_metrics, export_metrics, start_metrics_server
 
 # Configure page
 st.set_page_config(
@@ -134,65 +126,126 @@ def init_groq():
     return api_key
 
 
-# Initialize Sheets Manager
+# Initialize LLM client (one pooled HTTP session for all queries)
+@st.cache_resource
+def init_llm_client():
+    """Initialize the Groq chat client"""
+    from src.llm_client import GroqClient
+    return GroqClient(init_groq())
+
+
+def warm_up():
+    """Connect, load the sheets and import the query modules; returns the SheetsManager"""
+    from src.sheets_manager import get_sheets_manager
+    from src.fleet_counters import get_fleet_counters
+    sheets_manager = get_sheets_manager()
+    # Seeding the sidebar counts reads all three sheets in one request
+    get_fleet_counters(sheets_manager)
+    import src.assignment_solver, src.conflict_state, src.llm_context, src.llm_cache, src.llm_client, src.rendering  # noqa: E401,F401
+    return sheets_manager
+
+
+# Start connecting to Google Sheets (once per process) on a background thread
 @st.cache_resource
+def start_warm_up():
+    """Run warm_up() in the background; returns its Future"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='warm-up').submit(warm_up)
+
+
 def init_sheets_manager():
-    """Initialize Google Sheets connection"""
-    return get_sheets_manager()
+    """Get the SheetsManager, waiting for the warm-up if it is still running"""
+    future = start_warm_up()
+    if not future.done():
+        with st.spinner("Connecting to the fleet sheets..."):
+            future.exception()
+    try:
+        return future.result()
+    except Exception:
+        # Don't keep the failure: the next run tries to connect again
+        start_warm_up.clear()
+        raise
+
+
+# Initialize AI response cache
+@st.cache_resource
+def init_response_cache():
+    """Initialize the cache of AI responses"""
+    from src.llm_cache import get_response_cache
+    return get_response_cache()
+
+
+# Start the Prometheus /metrics endpoint (once per process) if METRICS_PORT is set
+@st.cache_resource
+def init_metrics_server():
+    """Initialize the metrics HTTP endpoint"""
+    port = get_setting('METRICS_PORT', '')
+    if not port:
+        return None
+    try:
+        return start_metrics_server(int(port))
+    except (OSError, ValueError) as e:
+        print(f"Error starting metrics server on port {port}: {e}")
+        return None
 
 
 def get_pilot_summary(sheets_manager):
-    """Get summary of pilot roster"""
-    pilots = sheets_manager.get_pilots()
-    
-    # Normalize column names (lowercase and strip spaces)
-    pilots.columns = pilots.columns.str.lower().str.strip()
-    
-    total = len(pilots)
-    
-    # Handle case where 'status' column might not exist
-    if 'status' not in pilots.columns:
-        return {'total': total, 'available': 0, 'assigned': 0, 'on_leave': 0}
-    
-    available = len(pilots[pilots['status'] == 'Available'])
-    assigned = len(pilots[pilots['status'] == 'Assigned'])
-    on_leave = len(pilots[pilots['status'] == 'On Leave'])
-    
-    return {
-        'total': total,
-        'available': available,
-        'assigned': assigned,
-        'on_leave': on_leave
-    }
+    """Get summary of pilot roster (from the materialized counters, no sheet read)"""
+    from src.fleet_counters import get_fleet_counters
+    return get_fleet_counters(sheets_manager).pilot_summary()
 
 
 def get_drone_summary(sheets_manager):
-    """Get summary of drone fleet"""
-    drones = sheets_manager.get_drones()
-    
-    # Normalize column names (lowercase and strip spaces)
-    drones.columns = drones.columns.str.lower().str.strip()
-    
-    total = len(drones)
-    
-    # Handle case where 'status' column might not exist
-    if 'status' not in drones.columns:
-        return {'total': total, 'available': 0, 'maintenance': 0, 'assigned': 0}
-    
-    available = len(drones[drones['status'] == 'Available'])
-    maintenance = len(drones[drones['status'] == 'Maintenance'])
-    assigned = len(drones[drones['status'] == 'Assigned'])
+    """Get summary of drone fleet (from the materialized counters, no sheet read)"""
+    from src.fleet_counters import get_fleet_counters
+    return get_fleet_counters(sheets_manager).drone_summary()
+
+
+# Sidebar counts from the local snapshot, shown while the warm-up connects
+@st.cache_data
+def get_saved_summaries():
+    """Get (pilot summary, drone summary, synced_at) from the snapshot file, or None without one"""
+    if get_setting('STORAGE_BACKEND', 'google').lower() == 'local':
+        return None
+    path = get_setting('SNAPSHOT_FILE', '.cache/sheets_snapshot.sqlite')
+    if not path or not os.path.exists(path):
+        return None
+    from src.fleet_counters import FleetCounters
+    from src.sheets_manager import SHEET_TITLES
+    from src.snapshot_store import SnapshotStore
+    store = SnapshotStore(path)
+    try:
+        sheets = store.load()
+    finally:
+        store.close()
+    if not all(title in sheets for title in SHEET_TITLES):
+        return None
+    counters = FleetCounters()
+    counters.seed(*(sheets[title][0] for title in SHEET_TITLES))
+    return counters.pilot_summary(), counters.drone_summary(), min(sheets[title][1] for title in SHEET_TITLES)
+
+
+def render_fleet_stats(pilot_summary, drone_summary):
+    """Render the pilot and drone stat boxes"""
+    # Pilots
+    st.markdown(f'''
+    <div class="stat-box">
+        <div class="stat-number">{pilot_summary['available']}/{pilot_summary['total']}</div>
+        <div class="stat-label">Pilots Available</div>
+    </div>
+    ''', unsafe_allow_html=True)
     
-    return {
-        'total': total,
-        'available': available,
-        'maintenance': maintenance,
-        'assigned': assigned
-    }
+    # Drones
+    st.markdown(f'''
+    <div class="stat-box">
+        <div class="stat-number">{drone_summary['available']}/{drone_summary['total']}</div>
+        <div class="stat-label">Drones Available</div>
+    </div>
+    ''', unsafe_allow_html=True)
 
 
 def format_pilot_info(pilot_row):
     """Format pilot information for display"""
+    from src.sheets_manager import format_date
     return f"""
 **{pilot_row.get('name', 'N/A')}** (ID: {pilot_row.get('pilot_id', 'N/A')})
 - **Skills**: {pilot_row.get('skills', 'N/A')}
@@ -200,41 +253,123 @@ def format_pilot_info(pilot_row):
 - **Location**: {pilot_row.get('location', 'N/A')}
 - **Status**: {pilot_row.get('status', 'N/A')}
 - **Current Assignment**: {pilot_row.get('current_assignment', 'N/A')}
-- **Available From**: {pilot_row.get('available_from', 'N/A')}
+- **Available From**: {format_date(pilot_row.get('available_from', 'N/A'))}
 """
 
 
 def format_drone_info(drone_row):
     """Format drone information for display"""
+    from src.sheets_manager import format_date
     return f"""
 **{drone_row.get('model', 'N/A')}** (ID: {drone_row.get('drone_id', 'N/A')})
 - **Capabilities**: {drone_row.get('capabilities', 'N/A')}
 - **Location**: {drone_row.get('location', 'N/A')}
 - **Status**: {drone_row.get('status', 'N/A')}
 - **Current Assignment**: {drone_row.get('current_assignment', 'N/A')}
-- **Maintenance Due**: {drone_row.get('maintenance_due', 'N/A')}
+- **Maintenance Due**: {format_date(drone_row.get('maintenance_due', 'N/A'))}
 """
 
 
 def format_mission_info(mission_row):
     """Format mission information for display"""
+    from src.sheets_manager import format_date
     return f"""
 **{mission_row.get('project_id', 'N/A')}** - {mission_row.get('client', 'N/A')}
 - **Location**: {mission_row.get('location', 'N/A')}
 - **Required Skills**: {mission_row.get('required_skills', 'N/A')}
 - **Required Certifications**: {mission_row.get('required_certs', 'N/A')}
-- **Duration**: {mission_row.get('start_date', 'N/A')} to {mission_row.get('end_date', 'N/A')}
+- **Duration**: {format_date(mission_row.get('start_date', 'N/A'))} to {format_date(mission_row.get('end_date', 'N/A'))}
 - **Priority**: {mission_row.get('priority', 'N/A')}
 """
 
 
-def process_query(query: str, sheets_manager) -> str:
-    """Process user query and generate response"""
+def process_query(query: str, sheets_manager, stream: bool = False):
+    """
+    Process user query and generate response
+    
+    With stream=True, AI answers are returned as a generator of text
+    pieces (see render_response); list answers are a TableResult and
+    every other answer is a string.
+    
+    The call is timed as a 'query' span tagged with the detected intent;
+    the sheet reads, conflict checks and LLM call it makes are its children.
+    A streamed answer's span stays open until the stream is drained.
+    """
+    metrics = get_metrics()
+    span = metrics.start_span('query', intent='unknown')
+    try:
+        with metrics.attach(span):
+            response = _process_query(query, sheets_manager, stream)
+    except BaseException:
+        metrics.end_span(span, error=True)
+        export_metrics()
+        raise
+    if isinstance(response, types.GeneratorType):
+        return traced_stream(response, span)
+    metrics.end_span(span)
+    export_metrics()
+    return response
+
+
+def traced_stream(tokens, span):
+    """Yield a streamed answer, finishing its query span once it is drained"""
+    metrics = get_metrics()
+    error = False
+    try:
+        while True:
+            # Attached only while producing a token, not while the caller holds it
+            with metrics.attach(span):
+                token = next(tokens, None)
+            if token is None:
+                break
+            yield token
+    except BaseException:
+        error = True
+        raise
+    finally:
+        metrics.end_span(span, error=error)
+        export_metrics()
+
+
+def is_write_query(query_lower: str) -> bool:
+    """Whether a query is an update, add or delete (same tests as the intents in _process_query)"""
+    return (
+        ('update' in query_lower and 'status' in query_lower)
+        or (('add' in query_lower or 'delete' in query_lower) and ('drone' in query_lower or 'pilot' in query_lower))
+    )
+
+
+def offline_message(sheets_manager) -> str:
+    """Why a change can't be saved while the sheets are offline"""
+    from datetime import datetime
+    return (
+        "📴 Google Sheets is unreachable, so changes are disabled until it's back. "
+        f"Showing saved data from {datetime.fromtimestamp(sheets_manager.staleness()):%Y-%m-%d %H:%M}."
+    )
+
+
+def _process_query(query: str, sheets_manager, stream: bool = False):
+    """Route a query to its intent and build the answer (see process_query)"""
+    from src.conflict_state import get_conflict_state
+    from src.fleet_counters import get_fleet_counters
+    from src.rendering import TableResult
     
     query_lower = query.lower()
     
+    # Count breakdowns, e.g. "how many available thermal drones in Mumbai"
+    if query_lower.startswith('how many') or query_lower.startswith('count '):
+        get_metrics().tag(intent='count')
+        breakdown = get_fleet_counters(sheets_manager).breakdown(query)
+        if breakdown is not None:
+            filters = [breakdown['status'], breakdown['tag']]
+            description = ' '.join(f for f in filters if f) + (' ' if any(filters) else '') + breakdown['table']
+            if breakdown['location']:
+                description += f" in {breakdown['location'].title()}"
+            return f"There are **{breakdown['count']}** {description}."
+    
     # Query pilots
     if 'pilot' in query_lower and ('show' in query_lower or 'list' in query_lower or 'available' in query_lower):
+        get_metrics().tag(intent='list_pilots')
         pilots = sheets_manager.get_pilots()
         
         if len(pilots) == 0:
@@ -259,14 +394,11 @@ def process_query(query: str, sheets_manager) -> str:
         if len(pilots) == 0:
             return "No pilots found matching your criteria."
         
-        response = f"Found **{len(pilots)}** pilot(s):\n\n"
-        for idx, pilot in pilots.iterrows():
-            response += format_pilot_info(pilot) + "\n---\n"
-        
-        return response
+        return TableResult('pilots', pilots)
     
     # Query drones
     elif 'drone' in query_lower and ('show' in query_lower or 'list' in query_lower or 'available' in query_lower):
+        get_metrics().tag(intent='list_drones')
         drones = sheets_manager.get_drones()
         
         if len(drones) == 0:
@@ -294,14 +426,11 @@ def process_query(query: str, sheets_manager) -> str:
         if len(drones) == 0:
             return "No drones found matching your criteria."
         
-        response = f"Found **{len(drones)}** drone(s):\n\n"
-        for idx, drone in drones.iterrows():
-            response += format_drone_info(drone) + "\n---\n"
-        
-        return response
+        return TableResult('drones', drones)
     
     # Query missions
     elif 'mission' in query_lower or 'project' in query_lower:
+        get_metrics().tag(intent='list_missions')
         missions = sheets_manager.get_missions()
         
         if len(missions) == 0:
@@ -313,52 +442,43 @@ def process_query(query: str, sheets_manager) -> str:
         if 'urgent' in query_lower and 'priority' in missions.columns:
             missions = missions[missions['priority'].str.contains('Urgent', case=False, na=False)]
         
-        response = f"Found **{len(missions)}** mission(s):\n\n"
-        for idx, mission in missions.iterrows():
-            response += format_mission_info(mission) + "\n---\n"
-        
-        return response
+        return TableResult('missions', missions)
     
     # Check conflicts
     elif 'conflict' in query_lower:
-        pilots = sheets_manager.get_pilots()
-        drones = sheets_manager.get_drones()
-        missions = sheets_manager.get_missions()
-        # Normalize column names
-        pilots.columns = pilots.columns.str.lower().str.strip()
-        drones.columns = drones.columns.str.lower().str.strip()
-        missions.columns = missions.columns.str.lower().str.strip()
-        
-        all_conflicts = []
-        
-        # Check assigned pilots and drones
-        for idx, pilot in pilots.iterrows():
-            pilot_status = pilot.get('status', '')
-            if pilot_status == 'Assigned':
-                pilot_name = pilot.get('name', 'Unknown')
-                current_assignment = pilot.get('current_assignment', 'Unknown')
-                all_conflicts.append(f"⚠️ Pilot {pilot_name} is assigned to {current_assignment}")
-        
-        for idx, drone in drones.iterrows():
-            drone_status = drone.get('status', '')
-            drone_id = drone.get('drone_id', 'Unknown')
-            if drone_status == 'Maintenance':
-                all_conflicts.append(f"🚨 Drone {drone_id} is in maintenance")
-            elif drone_status == 'Assigned':
-                current_assignment = drone.get('current_assignment', 'Unknown')
-                all_conflicts.append(f"⚠️ Drone {drone_id} is assigned to {current_assignment}")
+        get_metrics().tag(intent='check_conflicts')
+        # Conflicts are kept up to date by every write; this is a read
+        with get_metrics().span('conflicts', stage='check'):
+            # "Since last check" is per session: each one keeps what it was last shown
+            result = get_conflict_state(sheets_manager).check(st.session_state.get('last_conflicts'))
+        st.session_state.last_conflicts = result['conflicts']
+        all_conflicts = result['conflicts']
+        
+        changes = ""
+        if result['new'] is not None and (result['new'] or result['resolved']):
+            changes = "\n**Since last check:**\n\n"
+            for conflict in result['new']:
+                changes += f"- 🆕 {conflict}\n"
+            for conflict in result['resolved']:
+                changes += f"- ✅ Resolved: {conflict}\n"
         
         if len(all_conflicts) == 0:
-            return "✅ No conflicts detected! All systems operational."
+            return "✅ No conflicts detected! All systems operational." + ("\n" + changes if changes else "")
         
         response = f"Found **{len(all_conflicts)}** conflict(s):\n\n"
         for conflict in all_conflicts:
             response += f"- {conflict}\n"
+        response += changes
         
         return response
     
     # Suggest assignment
     elif 'suggest' in query_lower or 'recommend' in query_lower or 'assign' in query_lower:
+        get_metrics().tag(intent='suggest_assignment')
+        from src.assignment_solver import AssignmentSolver
+        from src.batch_conflict_detector import BatchConflictDetector
+        from src.booking_calendar import BookingCalendar
+        from src.conflict_detector import ConflictDetector
         # Extract project ID if mentioned
         project_id = None
         for word in query.split():
@@ -369,7 +489,7 @@ def process_query(query: str, sheets_manager) -> str:
         if not project_id:
             return "Please specify a project ID (e.g., PRJ001) to get assignment suggestions."
         
-        missions = sheets_manager.get_missions()
+        pilots, drones, missions = sheets_manager.get_snapshot(typed=True)
         # Normalize column names
         missions.columns = missions.columns.str.lower().str.strip()
         
@@ -384,8 +504,6 @@ def process_query(query: str, sheets_manager) -> str:
         mission = mission.iloc[0].to_dict()
         
         # Find suitable pilots and drones
-        pilots = sheets_manager.get_pilots()
-        drones = sheets_manager.get_drones()
         # Normalize column names
         pilots.columns = pilots.columns.str.lower().str.strip()
         drones.columns = drones.columns.str.lower().str.strip()
@@ -396,21 +514,26 @@ def process_query(query: str, sheets_manager) -> str:
         if 'status' not in drones.columns:
             return f"Error: 'status' column not found in drones data. Available columns: {list(drones.columns)}"
         
-        available_pilots = pilots[pilots['status'] == 'Available']
-        available_drones = drones[drones['status'] == 'Available']
-        
-        # Filter by location
-        location_pilots = available_pilots[available_pilots['location'] == mission['location']]
-        location_drones = available_drones[available_drones['location'] == mission['location']]
-        
-        if len(location_pilots) == 0 or len(location_drones) == 0:
-            return f"⚠️ No available pilot-drone pairs found in {mission['location']} for {project_id}"
-        
-        # Check conflicts for first match
-        pilot = location_pilots.iloc[0].to_dict()
-        drone = location_drones.iloc[0].to_dict()
+        # Check every pilot and drone against every mission in one vectorized pass
+        with get_metrics().span('conflicts', stage='detect'):
+            detector = BatchConflictDetector(pilots, drones, missions)
+        
+        # Solve all open missions together so competing missions don't take
+        # each other's pilots; fall back to the best pair for this mission alone
+        with get_metrics().span('conflicts', stage='solve'):
+            solved = AssignmentSolver(detector).assignment_for(project_id)
+        if solved and solved['assigned']:
+            pilot = detector.pilots[detector.pilots['pilot_id'] == solved['pilot_id']].iloc[0].to_dict()
+            drone = detector.drones[detector.drones['drone_id'] == solved['drone_id']].iloc[0].to_dict()
+        else:
+            best = detector.best_pair(project_id)
+            if best is None:
+                return f"⚠️ No available pilot-drone pairs found in {mission['location']} for {project_id}"
+            pilot, drone = best
         
-        conflict_check = ConflictDetector.full_assignment_check(pilot, drone, mission)
+        with get_metrics().span('conflicts', stage='validate'):
+            calendar = BookingCalendar.from_frames(pilots, drones, missions)
+            conflict_check = ConflictDetector.full_assignment_check(pilot, drone, mission, calendar)
         
         response = f"## Assignment Suggestion for {project_id}\n\n"
         response += "### Recommended Pilot:\n"
@@ -428,6 +551,9 @@ def process_query(query: str, sheets_manager) -> str:
             for warning in conflict_check['warnings']:
                 response += f"- {warning}\n"
         
+        if solved and not solved['assigned']:
+            response += "\n_Note: every conflict-free pilot or drone is needed by a higher-priority mission, so this pair competes with another suggestion._\n"
+        
         if conflict_check['is_valid']:
             response += "\n✅ **This assignment is VALID and ready to proceed!**"
         else:
@@ -435,8 +561,14 @@ def process_query(query: str, sheets_manager) -> str:
         
         return response
     
+    # Offline: the data is the local snapshot, so refuse writes up front
+    elif is_write_query(query_lower) and sheets_manager.is_offline():
+        get_metrics().tag(intent='offline_write')
+        return offline_message(sheets_manager)
+    
     # Update status
     elif 'update' in query_lower and 'status' in query_lower:
+        get_metrics().tag(intent='update_status')
         # Parse update command: "update pilot P001 status to Available" or "update drone D001 status to Maintenance"
         import re
         
@@ -493,6 +625,7 @@ Valid drone statuses: Available, Maintenance, Assigned"""
     
     # Add new drone
     elif 'add' in query_lower and 'drone' in query_lower:
+        get_metrics().tag(intent='add_drone')
         # Parse: "Add drone D005 model DJI M300 capabilities RGB, Thermal location Bangalore"
         import re
         
@@ -530,6 +663,7 @@ Required fields:
     
     # Add new pilot
     elif 'add' in query_lower and 'pilot' in query_lower:
+        get_metrics().tag(intent='add_pilot')
         # Parse: "Add pilot P005 name Rahul skills Mapping, Survey certifications DGCA location Bangalore"
         import re
         
@@ -570,6 +704,7 @@ Required fields:
     
     # Delete drone
     elif 'delete' in query_lower and 'drone' in query_lower:
+        get_metrics().tag(intent='delete_drone')
         import re
         drone_id_match = re.search(r'drone\s+(\w+)', query_lower)
         
@@ -585,6 +720,7 @@ Required fields:
     
     # Delete pilot
     elif 'delete' in query_lower and 'pilot' in query_lower:
+        get_metrics().tag(intent='delete_pilot')
         import re
         pilot_id_match = re.search(r'pilot\s+(\w+)', query_lower)
         
@@ -600,69 +736,51 @@ Required fields:
     
     # Default: Use AI for general queries
     else:
+        get_metrics().tag(intent='ai_question')
+        from src.llm_cache import data_hash
+        from src.llm_context import ContextBuilder
         try:
             # Build context
-            pilots = sheets_manager.get_pilots()
-            drones = sheets_manager.get_drones()
-            missions = sheets_manager.get_missions()
+            pilots, drones, missions = sheets_manager.get_snapshot()
             
             # Normalize column names
             pilots.columns = pilots.columns.str.lower().str.strip()
             drones.columns = drones.columns.str.lower().str.strip()
             missions.columns = missions.columns.str.lower().str.strip()
             
-            # Calculate available counts safely
-            pilots_available = len(pilots[pilots['status']=='Available']) if 'status' in pilots.columns else 0
-            drones_available = len(drones[drones['status']=='Available']) if 'status' in drones.columns else 0
+            # Only the rows relevant to the query, within the token budget
+            with get_metrics().span('llm_context'):
+                data_context = ContextBuilder(pilots, drones, missions).build(query)
             
             context = f"""
 You are a Drone Operations Coordinator AI assistant for Skylark Drones.
 
-Current Status:
-- Pilots: {len(pilots)} total ({pilots_available} available)
-- Drones: {len(drones)} total ({drones_available} available)
-- Missions: {len(missions)} total
-
-Pilot Data:
-{pilots.to_string()}
-
-Drone Data:
-{drones.to_string()}
-
-Mission Data:
-{missions.to_string()}
+{data_context}
 
 User Query: {query}
 
 Provide a helpful, concise response based on the available data.
 """
             
-            # Call Groq API
-            api_key = init_groq()
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
+            # Answer repeated questions about unchanged data from the cache
+            llm_client = init_llm_client()
+            response_cache = init_response_cache()
+            snapshot_hash = data_hash(pilots, drones, missions)
+            cached = response_cache.get(query, snapshot_hash, llm_client.model)
+            if cached is not None:
+                return cached
             
-            payload = {
-                "model": "llama-3.1-8b-instant",
-                "messages": [
-                    {"role": "system", "content": "You are a Drone Operations Coordinator AI assistant for Skylark Drones. Provide helpful, concise responses based on the data provided."},
-                    {"role": "user", "content": context}
-                ],
-                "max_tokens": 500
-            }
+            messages = [
+                {"role": "system", "content": "You are a Drone Operations Coordinator AI assistant for Skylark Drones. Provide helpful, concise responses based on the data provided."},
+                {"role": "user", "content": context}
+            ]
             
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
+            if stream:
+                return stream_answer(llm_client, messages, query, snapshot_hash, response_cache)
             
-            if response.status_code == 200:
-                return response.json()['choices'][0]['message']['content']
-            else:
-                return f"I can help you with:\n- Viewing pilots/drones/missions\n- Checking conflicts\n- Suggesting assignments\n- Updating statuses\n\nTry: 'Show available pilots in Bangalore' or 'Suggest assignment for PRJ001'\n\n*(AI response unavailable: {response.status_code} - {response.text})*"
+            answer = llm_client.chat(messages, max_tokens=500)
+            response_cache.put(query, snapshot_hash, answer, llm_client.model)
+            return answer
             
         except Exception as e:
             # Log the error for debugging
@@ -670,7 +788,96 @@ Provide a helpful, concise response based on the available data.
             error_details = traceback.format_exc()
             print(f"Groq API Error: {str(e)}\n{error_details}")
             
-            return f"I can help you with:\n- Viewing pilots/drones/missions\n- Checking conflicts\n- Suggesting assignments\n- Updating statuses\n\nTry: 'Show available pilots in Bangalore' or 'Suggest assignment for PRJ001'\n\n*(AI response unavailable: {str(e)})*"
+            return ai_unavailable(str(e))
+
+
+def ai_unavailable(reason: str) -> str:
+    """Help text shown when the AI answer can't be produced"""
+    return f"I can help you with:\n- Viewing pilots/drones/missions\n- Checking conflicts\n- Suggesting assignments\n- Updating statuses\n\nTry: 'Show available pilots in Bangalore' or 'Suggest assignment for PRJ001'\n\n*(AI response unavailable: {reason})*"
+
+
+def stream_answer(llm_client, messages, query, snapshot_hash, response_cache):
+    """Yield the AI answer as it arrives; the full answer is cached at the end"""
+    from src.llm_client import LLMError
+    parts = []
+    try:
+        for token in llm_client.stream_chat(messages, max_tokens=500):
+            parts.append(token)
+            yield token
+    except LLMError as e:
+        print(f"Groq API Error: {str(e)}")
+        yield ("\n\n" if parts else "") + ai_unavailable(str(e))
+        return
+    response_cache.put(query, snapshot_hash, ''.join(parts), llm_client.model)
+
+
+def render_response(response):
+    """
+    Show a process_query result; streamed answers are written as they arrive
+    
+    Returns what to keep in the chat history: the text, or the TableResult
+    itself (already row-capped) for list answers.
+    """
+    from src.rendering import TableResult
+    if isinstance(response, TableResult):
+        st.markdown(response.heading())
+        st.dataframe(response.frame, hide_index=True, use_container_width=True)
+        if response.truncated:
+            st.caption(response.footer())
+        return response
+    if isinstance(response, str):
+        st.markdown(response)
+        return response
+    return st.write_stream(response)
+
+
+def _trace_lines(trace, depth=0):
+    """Indented markdown list of a span and its children"""
+    lines = [f"{'  ' * depth}- `{trace['name']}` {trace['ms']:.1f} ms"]
+    for child in trace['children']:
+        lines.extend(_trace_lines(child, depth + 1))
+    return lines
+
+
+def render_performance_panel():
+    """Sidebar panel: last query breakdown, latency by intent, API calls and cache hits"""
+    import pandas as pd
+    metrics = get_metrics()
+
+    traces = metrics.traces('query')
+    if traces:
+        st.caption("Last query")
+        st.markdown('\n'.join(_trace_lines(traces[0])))
+    else:
+        st.caption("No queries yet")
+
+    rows = metrics.summary('query')
+    if rows:
+        latency = pd.DataFrame(rows).groupby('intent', as_index=False).agg(
+            count=('count', 'sum'), p50_ms=('p50_ms', 'max'), p95_ms=('p95_ms', 'max')
+        ).sort_values('count', ascending=False)
+        st.dataframe(latency.round(1), hide_index=True, use_container_width=True)
+
+    api_calls = metrics.counter_value('sheets_api_calls')
+    api_errors = metrics.counter_value('sheets_api_calls', outcome='error')
+    sheet_hits = metrics.counter_value('sheets_cache', result='hit')
+    sheet_lookups = metrics.counter_value('sheets_cache')
+    llm_hits = metrics.counter_value('llm_cache', result='hit')
+    llm_lookups = metrics.counter_value('llm_cache')
+    received = metrics.counter_value('sheets_bytes_received') + metrics.counter_value('llm_bytes_received')
+    st.markdown(
+        f"Sheets API calls: **{api_calls:g}** ({api_errors:g} failed, "
+        f"{metrics.counter_value('sheets_api_retries'):g} retried)  \n"
+        f"Shared in-flight reads: **{metrics.counter_value('sheets_coalesced_reads'):g}**  \n"
+        f"Sheet cache hits: **{sheet_hits:g}/{sheet_lookups:g}**  \n"
+        f"AI cache hits: **{llm_hits:g}/{llm_lookups:g}**  \n"
+        f"LLM calls: **{metrics.counter_value('llm_calls'):g}**  \n"
+        f"Received: **{received / 1024:.1f} KB**"
+    )
+    st.download_button(
+        "⬇️ Metrics (Prometheus)", metrics.to_prometheus(),
+        file_name="skylark_metrics.prom", mime="text/plain", use_container_width=True
+    )
 
 
 # Main UI
@@ -679,52 +886,63 @@ def main():
     st.markdown('<div class="title">🚁 Skylark Drone Ops</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">Manage your fleet and pilots easily</div>', unsafe_allow_html=True)
     
-    # Initialize
-    try:
-        sheets_manager = init_sheets_manager()
-    except Exception as e:
-        st.error(f"Connection failed: {str(e)}")
-        return
+    init_metrics_server()
+    
+    # Initialize. Fast start paints the page while the sheets load in the
+    # background; the sidebar counts are filled in by a rerun once they arrive.
+    sheets_manager = None
+    if start_warm_up().done() or not get_bool_setting('FAST_START', True):
+        try:
+            sheets_manager = init_sheets_manager()
+        except Exception as e:
+            st.error(f"Connection failed: {str(e)}")
+            return
     
     # Sidebar - Simple Stats
     with st.sidebar:
         st.markdown('<div class="section-title">Fleet Status</div>', unsafe_allow_html=True)
         
-        pilot_summary = get_pilot_summary(sheets_manager)
-        drone_summary = get_drone_summary(sheets_manager)
-        
-        # Pilots
-        st.markdown(f'''
-        <div class="stat-box">
-            <div class="stat-number">{pilot_summary['available']}/{pilot_summary['total']}</div>
-            <div class="stat-label">Pilots Available</div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        # Drones
-        st.markdown(f'''
-        <div class="stat-box">
-            <div class="stat-number">{drone_summary['available']}/{drone_summary['total']}</div>
-            <div class="stat-label">Drones Available</div>
-        </div>
-        ''', unsafe_allow_html=True)
+        if sheets_manager is None:
+            # Still connecting: show the saved counts, if there are any
+            saved = get_saved_summaries()
+            if saved is None:
+                st.caption("⏳ Connecting to the fleet sheets...")
+            else:
+                from datetime import datetime
+                pilot_summary, drone_summary, synced_at = saved
+                st.caption(f"⏳ Connecting to the fleet sheets... showing saved data from {datetime.fromtimestamp(synced_at):%Y-%m-%d %H:%M}")
+                render_fleet_stats(pilot_summary, drone_summary)
+        else:
+            pilot_summary = get_pilot_summary(sheets_manager)
+            drone_summary = get_drone_summary(sheets_manager)
+            
+            # Offline: reads come from the local snapshot and writes are refused (see is_write_query)
+            stale_since = sheets_manager.staleness()
+            if stale_since is not None:
+                from datetime import datetime
+                st.warning(
+                    f"📴 Google Sheets is unreachable. Showing saved data from "
+                    f"{datetime.fromtimestamp(stale_since):%Y-%m-%d %H:%M}; changes can't be saved until it's back."
+                )
+            
+            render_fleet_stats(pilot_summary, drone_summary)
         
         st.markdown('<div class="section-title">Quick Actions</div>', unsafe_allow_html=True)
         
         if st.button("📋 All Pilots", use_container_width=True):
             with st.chat_message("assistant"):
-                result = process_query("show all pilots", sheets_manager)
-                st.markdown(result)
+                render_response(process_query("show all pilots", sheets_manager or init_sheets_manager()))
         
         if st.button("🚁 All Drones", use_container_width=True):
             with st.chat_message("assistant"):
-                result = process_query("show all drones", sheets_manager)
-                st.markdown(result)
+                render_response(process_query("show all drones", sheets_manager or init_sheets_manager()))
         
         if st.button("⚠️ Check Conflicts", use_container_width=True):
             with st.chat_message("assistant"):
-                result = process_query("check conflicts", sheets_manager)
-                st.markdown(result)
+                render_response(process_query("check conflicts", sheets_manager or init_sheets_manager()))
+        
+        if st.toggle("⚡ Performance", value=get_bool_setting('METRICS_PANEL', False)):
+            render_performance_panel()
     
     # Main Area - Simple Tabs
     tab1, tab2, tab3 = st.tabs(["💬 Chat", "➕ Add New", "📖 Help"])
@@ -733,7 +951,7 @@ def main():
         # Chat Interface
         for message in st.session_state.messages:
             with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+                render_response(message["content"])
         
         if prompt := st.chat_input("Type your command here..."):
             st.session_state.messages.append({"role": "user", "content": prompt})
@@ -742,8 +960,8 @@ def main():
             
             with st.chat_message("assistant"):
                 with st.spinner("Processing..."):
-                    response = process_query(prompt, sheets_manager)
-                    st.markdown(response)
+                    response = process_query(prompt, sheets_manager or init_sheets_manager(), stream=True)
+                response = render_response(response)
             
             st.session_state.messages.append({"role": "assistant", "content": response})
     
@@ -771,8 +989,10 @@ def main():
                 'current_assignment': '–',
                 'available_from': '–'
             }
-            success = sheets_manager.add_pilot(pilot_data)
-            if success:
+            manager = sheets_manager or init_sheets_manager()
+            if manager.is_offline():
+                st.error(offline_message(manager))
+            elif manager.add_pilot(pilot_data):
                 st.success(f"✅ Pilot {p_name} added successfully!")
             else:
                 st.error("❌ Failed to add pilot. ID may already exist.")
@@ -800,8 +1020,10 @@ def main():
                 'current_assignment': '–',
                 'maintenance_due': '2026-12-31'
             }
-            success = sheets_manager.add_drone(drone_data)
-            if success:
+            manager = sheets_manager or init_sheets_manager()
+            if manager.is_offline():
+                st.error(offline_message(manager))
+            elif manager.add_drone(drone_data):
                 st.success(f"✅ Drone {d_id.upper()} added successfully!")
             else:
                 st.error("❌ Failed to add drone. ID may already exist.")
@@ -836,7 +1058,7 @@ def main():
     # Display chat messages
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+            render_response(message["content"])
     
     # Chat input
     if prompt := st.chat_input("Ask me about pilots, drones, missions, or conflicts..."):
@@ -848,11 +1070,20 @@ def main():
         # Generate response
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
-                response = process_query(prompt, sheets_manager)
-                st.markdown(response)
+                response = process_query(prompt, sheets_manager or init_sheets_manager(), stream=True)
+            response = render_response(response)
         
         # Add assistant message
         st.session_state.messages.append({"role": "assistant", "content": response})
+    
+    # Fast start: the page is up, now wait for the sheets and show the counts
+    if sheets_manager is None:
+        try:
+            init_sheets_manager()
+        except Exception as e:
+            st.error(f"Connection failed: {str(e)}")
+            return
+        st.rerun()
 
 
 if __name__ == "__main__":
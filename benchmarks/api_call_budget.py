@@ -0,0 +1,85 @@
+"""
+API Call Budget
+Counts the Sheets API calls each process_query intent makes, using the
+fake gspread backend, and fails if any intent goes over its budget
+
+Usage:
+    python benchmarks/api_call_budget.py [--size 1000] [--latency 0.05]
+
+"cold" is connecting a fresh SheetsManager (empty caches) plus the first
+query; "warm" is the same intent asked again straight after. Worksheets
+are opened on first use, so only the intents that need one pay for it.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import query_intents, use_stub_llm
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.synthetic import generate_fleet, to_spreadsheet
+
+# Max API calls per intent: (cold, warm)
+BUDGETS = {
+    'count': (1, 0),
+    'list_pilots': (2, 0),
+    'list_drones': (2, 0),
+    'list_missions': (2, 0),
+    'check_conflicts': (1, 0),
+    'suggest_assignment': (1, 0),
+    'update_status': (3, 1),
+    'add_pilot': (3, 1),
+    'add_drone': (3, 1),
+    'delete_pilot': (3, 1),
+    'delete_drone': (3, 1),
+    'ai_question': (1, 0),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000, help='Pilots in the generated fleet')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per API call')
+    args = parser.parse_args()
+
+    from stub_llm_server import serve
+    stub = serve(port=0)
+    use_stub_llm(f"http://127.0.0.1:{stub.server_address[1]}/v1")
+    import app
+
+    fleet = generate_fleet(args.size)
+    over = 0
+    print(f"{'intent':<20} {'cold':>5} {'warm':>5} {'budget':>8} {'seconds':>9}  calls (cold)")
+    for intent, (cold_budget, warm_budget) in BUDGETS.items():
+        fake = FakeSpreadsheet(to_spreadsheet(*fleet), latency=args.latency)
+        make_query = query_intents(*fleet)[intent]
+
+        started = time.perf_counter()
+        with fake.track() as cold:
+            manager = SheetsManager(fake, scheduler=RequestScheduler())  # count calls, don't pace them
+            app.process_query(make_query(0), manager)
+        elapsed = time.perf_counter() - started
+        with fake.track() as warm:
+            app.process_query(make_query(1), manager)
+
+        cold_calls, warm_calls = sum(cold.values()), sum(warm.values())
+        flag = ''
+        if cold_calls > cold_budget or warm_calls > warm_budget:
+            flag = '  OVER BUDGET'
+            over += 1
+        print(f"{intent:<20} {cold_calls:>5} {warm_calls:>5} {cold_budget:>4}/{warm_budget:<3} {elapsed:>9.3f}  "
+              f"{dict(cold)}{flag}")
+    stub.shutdown()
+
+    if over:
+        print(f"\n{over} intent(s) over budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Delta Sync Benchmark
+Refreshes a cached fleet over and over against the fake Sheets backend,
+with and without delta sync, while someone edits a few rows directly in
+the sheet between refreshes
+
+Usage:
+    python benchmarks/bench_delta_sync.py [--size 1000] [--rounds 20] [--edits 0 5] [--latency 0.05]
+
+Each round calls refresh_data() and then reads the sidebar counts and the
+conflict list, like a session pressing "Refresh Data". Without delta sync
+every refresh downloads all three sheets and re-seeds the materialized
+views; with it, an unchanged spreadsheet costs one revision check, and a
+changed one is downloaded once and applied as row events. The views are
+compared against a fresh seed after the last round.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.conflict_state import ConflictState, get_conflict_state
+from src.fake_gspread import FakeSpreadsheet
+from src.fleet_counters import FleetCounters, get_fleet_counters
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.synthetic import generate_fleet, to_spreadsheet
+
+STATUSES = {
+    'pilot_roster': ['Available', 'Assigned', 'On Leave'],
+    'drone_fleet': ['Available', 'Assigned', 'Maintenance'],
+}
+
+
+def edit_rows(fake: FakeSpreadsheet, count: int, rng: random.Random):
+    """Change the status of `count` random pilots and drones, bypassing the app"""
+    for _ in range(count):
+        title = rng.choice(list(STATUSES))
+        worksheet = fake._spreadsheet.worksheet(title)
+        header = worksheet.get_all_values()[0]
+        row = rng.randint(2, worksheet.row_count)
+        worksheet.update_cell(row, header.index('status') + 1, rng.choice(STATUSES[title]))
+
+
+def run(delta: bool, edits: int, fleet, args) -> dict:
+    """refresh_data() plus the sidebar and conflict views, args.rounds times"""
+    fake = FakeSpreadsheet(to_spreadsheet(*fleet), latency=args.latency)
+    manager = SheetsManager(fake, scheduler=RequestScheduler(), delta_sync=delta)
+    get_fleet_counters(manager)
+    get_conflict_state(manager)
+    rng = random.Random(args.seed)
+
+    fake.reset_calls()
+    seconds = 0.0
+    for _ in range(args.rounds):
+        edit_rows(fake, edits, rng)
+        started = time.perf_counter()
+        manager.refresh_data()
+        counters = get_fleet_counters(manager)
+        conflicts = get_conflict_state(manager).check()['conflicts']
+        seconds += time.perf_counter() - started
+
+    fresh_counters, fresh_conflicts = FleetCounters(), ConflictState()
+    fresh_counters.seed(*manager.get_snapshot())
+    fresh_conflicts.seed(*manager.get_snapshot())
+    return {
+        'calls': fake.total_calls / args.rounds,
+        'downloads': (fake.calls['values_batch_get'] + fake.calls['get_all_records']) / args.rounds,
+        'ms': seconds / args.rounds * 1000,
+        'consistent': (counters.pilot_summary() == fresh_counters.pilot_summary()
+                       and counters.drone_summary() == fresh_counters.drone_summary()
+                       and conflicts == fresh_conflicts.conflicts()),
+        'events': (manager.delta_sync.stats()['rows_changed'] / args.rounds) if delta else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000, help='Pilots in the generated fleet')
+    parser.add_argument('--rounds', type=int, default=20, help='Refreshes per run')
+    parser.add_argument('--edits', type=int, nargs='+', default=[0, 5], help='Rows edited outside the app per round')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated seconds per Sheets API call')
+    parser.add_argument('--seed', type=int, default=7, help='Seed for the edits')
+    args = parser.parse_args()
+
+    fleet = generate_fleet(args.size)
+    print(f"{args.size} pilots, {args.rounds} refreshes, Sheets API latency {args.latency:g}s; per refresh:\n")
+    print(f"{'edits':>5}  {'mode':<10} {'calls':>6} {'downloads':>9} {'row events':>10} {'ms':>9}  views match")
+    for edits in args.edits:
+        for label, delta in (('full', False), ('delta', True)):
+            r = run(delta, edits, fleet, args)
+            print(f"{edits:>5}  {label:<10} {r['calls']:>6.1f} {r['downloads']:>9.1f} {r['events']:>10.1f} "
+                  f"{r['ms']:>9.1f}  {'yes' if r['consistent'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Quota Benchmark
+Several sessions write to the fake Sheets backend at once, against a
+scaled-down write quota, with and without the request scheduler, to show
+the scheduler trading failed writes for slower ones
+
+Usage:
+    python benchmarks/bench_quota.py [--sessions 8] [--writes 10] [--quota 20] [--window 2]
+
+The fake answers 429 once more than --quota writes land in any --window
+seconds (Google's real window is 60 s; a short one keeps the run quick).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.synthetic import generate_fleet, to_spreadsheet
+
+
+def run(label: str, scheduler: RequestScheduler, args) -> dict:
+    """Every session updates its own drones as fast as it can"""
+    pilots, drones, missions = generate_fleet(args.sessions * args.writes)
+    fake = FakeSpreadsheet(
+        to_spreadsheet(pilots, drones, missions), latency=args.latency,
+        write_quota=args.quota, quota_window=args.window
+    )
+    manager = SheetsManager(fake, scheduler=scheduler)
+    manager.get_drones()  # build the row index up front; only writes are measured
+    drone_ids = drones['drone_id'].tolist()
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def session(number: int):
+        for i in range(args.writes):
+            drone_id = drone_ids[number * args.writes + i]
+            started = time.perf_counter()
+            ok = manager.update_drone_status(drone_id, 'Maintenance')
+            elapsed = time.perf_counter() - started
+            with lock:
+                (latencies if ok else failures).append(elapsed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(args.sessions)]
+    # Failed writes and retries print a line each; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    total = time.perf_counter() - started
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        'mode': label,
+        'ok': len(latencies),
+        'failed': len(failures),
+        'rejected_429': sum(fake.rejected.values()),
+        'seconds': total,
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+        'retries': scheduler.stats()['retries'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=8, help='Concurrent sessions')
+    parser.add_argument('--writes', type=int, default=10, help='Writes per session')
+    parser.add_argument('--quota', type=int, default=20, help='Writes allowed per window')
+    parser.add_argument('--window', type=float, default=2.0, help='Quota window in seconds')
+    parser.add_argument('--latency', type=float, default=0.01, help='Simulated seconds per API call')
+    args = parser.parse_args()
+
+    rate = args.quota / args.window
+    modes = [
+        ('no scheduler', RequestScheduler(max_retries=0)),
+        ('backoff only', RequestScheduler(backoff=0.25, max_backoff=args.window)),
+        ('paced + backoff', RequestScheduler(write_rate=rate, burst=1, backoff=0.25, max_backoff=args.window)),
+    ]
+    print(f"{args.sessions} sessions x {args.writes} writes, quota {args.quota} writes / {args.window:g}s\n")
+    print(f"{'mode':<16} {'ok':>4} {'failed':>6} {'429s':>5} {'retries':>7} {'seconds':>8} {'p50':>7} {'p95':>7}")
+    for label, scheduler in modes:
+        r = run(label, scheduler, args)
+        print(f"{r['mode']:<16} {r['ok']:>4} {r['failed']:>6} {r['rejected_429']:>5} {r['retries']:>7} "
+              f"{r['seconds']:>8.2f} {r['p50']:>7.3f} {r['p95']:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Startup Benchmark
+Times a cold start of the app in a fresh Python process, with and without
+FAST_START, against the fake Sheets backend with simulated API latency, and
+a warm restart that finds the local snapshot from a previous run
+
+Usage:
+    python benchmarks/bench_startup.py [--latency 0.3] [--repeat 3] [--output startup.json]
+
+Stages, in seconds from when `streamlit run` would start the script:
+    import       app.py imported (settings, metrics)
+    first_paint  main() can draw the page: straight away with FAST_START,
+                 after connecting and loading the sheets without it
+    data_ready   sheets loaded, sidebar counts seeded, query modules imported
+    first_query  "show all pilots" answered
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child process; prints the stage timings as JSON
+CHILD = r'''
+import json
+import logging
+import sys
+import time
+logging.disable(logging.WARNING)  # bare-mode Streamlit warnings
+sys.path.insert(0, {root!r})
+# `streamlit run` has imported streamlit and loaded the secrets before the script starts
+import streamlit as st
+'_' in st.secrets
+started = time.perf_counter()
+import app
+stages = {{'import': time.perf_counter() - started}}
+app.start_warm_up()
+if not app.get_bool_setting('FAST_START', True):
+    app.init_sheets_manager()
+stages['first_paint'] = time.perf_counter() - started
+manager = app.init_sheets_manager()
+stages['data_ready'] = time.perf_counter() - started
+app.process_query('show all pilots', manager)
+stages['first_query'] = time.perf_counter() - started
+print(json.dumps(stages))
+'''
+
+STAGES = ('import', 'first_paint', 'data_ready', 'first_query')
+
+
+def measure(fast_start: bool, latency: float, snapshot_file: str = '') -> dict:
+    """One start in a new interpreter (cold unless snapshot_file holds a previous run's snapshot)"""
+    env = dict(
+        os.environ,
+        STORAGE_BACKEND='fake',
+        FAKE_SHEETS_LATENCY=str(latency),
+        FAST_START='true' if fast_start else 'false',
+        SNAPSHOT_FILE=snapshot_file,
+        METRICS_FILE='',
+        METRICS_PORT='',
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD.format(root=ROOT)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.3, help='Simulated seconds per Sheets API call')
+    parser.add_argument('--repeat', type=int, default=3, help='Cold starts per mode (median is shown)')
+    parser.add_argument('--output', help='Also write the medians to this JSON file')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"Sheets API latency {args.latency:g}s, median of {args.repeat} starts\n")
+    print(f"{'mode':<14}" + ''.join(f"{stage:>13}" for stage in STAGES))
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file = os.path.join(directory, 'snapshot.sqlite')
+        measure(True, 0.0, snapshot_file)  # a previous run leaves the snapshot behind
+        modes = (('fast start', True, ''), ('eager', False, ''), ('warm restart', True, snapshot_file))
+        for label, fast_start, snapshot in modes:
+            runs = [measure(fast_start, args.latency, snapshot) for _ in range(args.repeat)]
+            medians = {stage: statistics.median(run[stage] for run in runs) for stage in STAGES}
+            results[label] = medians
+            print(f"{label:<14}" + ''.join(f"{medians[stage]:>12.3f}s" for stage in STAGES))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'latency': args.latency, 'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Benchmark Suite
+Times conflict checks, every process_query intent and every SheetsManager
+read/write method on synthetic fleets held in an in-memory spreadsheet, and
+writes the results as JSON so runs from different versions can be compared
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 1000 10000] [--repeat 5] [--only sheets]
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+
+Each size N is N pilots, N drones and N/2 missions (see src/synthetic.py).
+The AI intent talks to the local stub server (scripts/stub_llm_server.py),
+so it measures context building and the HTTP round trip, not Groq.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+# Importing app.py outside `streamlit run` logs a warning per st call; keep
+# answers out of the AI cache, so the AI intent is timed end to end every run
+logging.disable(logging.WARNING)
+os.environ['LLM_CACHE_SIZE'] = '0'
+
+import numpy as np
+import pandas as pd
+
+from src.synthetic import generate_fleet, to_spreadsheet
+from src.sheets_manager import SheetsManager
+from src.conflict_detector import ConflictDetector
+from src.booking_calendar import BookingCalendar
+
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Median slowdown reported as a regression by --compare
+DEFAULT_THRESHOLD = 1.25
+
+
+class Suite:
+    """Collects timings for one run"""
+
+    def __init__(self, repeat: int, only: Optional[List[str]] = None):
+        self.repeat = repeat
+        self.only = only or []
+        self.results: List[Dict[str, Any]] = []
+
+    def wanted(self, group: str, name: str) -> bool:
+        label = f"{group}.{name}"
+        return not self.only or any(pattern in label for pattern in self.only)
+
+    def time(self, group: str, name: str, size: int, func: Callable[[int], Any],
+             setup: Optional[Callable[[int], Any]] = None):
+        """
+        Time func(i) for i in 0..repeat; call 0 is reported separately as 'first'
+
+        Args:
+            group: 'conflicts', 'queries' or 'sheets'
+            name: Benchmark name
+            size: Fleet size the run used
+            func: Timed call; i lets writes use a fresh ID each time
+            setup: Untimed call before each func(i), e.g. clearing the cache
+        """
+        if not self.wanted(group, name):
+            return
+        timings = []
+        for i in range(self.repeat + 1):
+            if setup is not None:
+                setup(i)
+            started = time.perf_counter()
+            func(i)
+            timings.append(time.perf_counter() - started)
+        first, rest = timings[0], timings[1:]
+        result = {
+            'group': group,
+            'name': name,
+            'size': size,
+            'repeat': len(rest),
+            'first_s': first,
+            'min_s': min(rest),
+            'median_s': statistics.median(rest),
+            'mean_s': statistics.fmean(rest),
+            'max_s': max(rest),
+        }
+        self.results.append(result)
+        print(f"  {group:<10} {name:<32} median {result['median_s'] * 1000:10.3f} ms  first {first * 1000:10.3f} ms")
+
+
+def bench_conflicts(suite: Suite, size: int, manager: SheetsManager):
+    """ConflictDetector.full_assignment_check on one pilot/drone/mission"""
+    pilots, drones, missions = manager.get_snapshot(typed=True)
+    pilot = pilots.iloc[0].to_dict()
+    drone = drones.iloc[0].to_dict()
+    mission = missions.iloc[0].to_dict()
+    mission['location'] = pilot['location'] = drone['location']
+
+    suite.time('conflicts', 'full_assignment_check', size,
+               lambda i: ConflictDetector.full_assignment_check(pilot, drone, mission))
+    calendar = BookingCalendar.from_frames(pilots, drones, missions)
+    suite.time('conflicts', 'full_assignment_check[calendar]', size,
+               lambda i: ConflictDetector.full_assignment_check(pilot, drone, mission, calendar))
+    suite.time('conflicts', 'BookingCalendar.from_frames', size,
+               lambda i: BookingCalendar.from_frames(pilots, drones, missions))
+
+
+def query_intents(pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame) -> Dict[str, Callable[[int], str]]:
+    """
+    One chat query per process_query intent, for the given fleet: {intent: make_query(i)}
+
+    Writes use row i (or the i-th from the end for deletes), so repeated
+    calls never collide.
+    """
+    pilot_ids = pilots['pilot_id'].tolist()
+    drone_ids = drones['drone_id'].tolist()
+    project_id = missions['project_id'].iloc[0]
+    return {
+        'count': lambda i: 'how many available thermal drones in Mumbai',
+        'list_pilots': lambda i: 'show available pilots in Bangalore',
+        'list_drones': lambda i: 'show available thermal drones',
+        'list_missions': lambda i: 'show urgent missions',
+        'check_conflicts': lambda i: 'check conflicts',
+        'suggest_assignment': lambda i: f'suggest assignment for {project_id}',
+        # Drone status: 'available'/'assigned' would route to the list/suggest intents
+        'update_status': lambda i: f'update drone {drone_ids[i]} status to maintenance',
+        'add_pilot': lambda i: f'add pilot PB{i:04d} name Bench Pilot skills Mapping certifications DGCA location Pune',
+        'add_drone': lambda i: f'add drone DB{i:04d} model DJI M300 capabilities RGB location Pune',
+        'delete_pilot': lambda i: f'delete pilot {pilot_ids[-1 - i]}',
+        'delete_drone': lambda i: f'delete drone {drone_ids[-1 - i]}',
+        'ai_question': lambda i: 'which thermal pilots in Pune are free next week',
+    }
+
+
+def use_stub_llm(stub_url: str):
+    """Point the app's Groq client at the stub server"""
+    os.environ['GROQ_BASE_URL'] = stub_url
+    os.environ.setdefault('GROQ_API_KEY', 'stub')
+
+
+def bench_queries(suite: Suite, size: int, manager: SheetsManager, stub_url: str):
+    """Every process_query intent, answered against warm caches"""
+    use_stub_llm(stub_url)
+    import app
+
+    for name, make_query in query_intents(*manager.get_snapshot()).items():
+        suite.time('queries', name, size, lambda i: app.process_query(make_query(i), manager))
+
+
+def bench_sheets(suite: Suite, size: int, manager: SheetsManager):
+    """Every SheetsManager read and write method"""
+    pilots, drones, missions = manager.get_snapshot()
+    pilot_ids = pilots['pilot_id'].tolist()
+    drone_ids = drones['drone_id'].tolist()
+    project_ids = missions['project_id'].tolist()
+    cold = lambda i: manager.invalidate_cache()
+
+    for method in ('get_pilots', 'get_drones', 'get_missions', 'get_snapshot'):
+        func = getattr(manager, method)
+        suite.time('sheets', f'{method}[cold]', size, lambda i: func(), setup=cold)
+        suite.time('sheets', f'{method}[warm]', size, lambda i: func())
+    suite.time('sheets', 'get_snapshot[typed,cold]', size, lambda i: manager.get_snapshot(typed=True), setup=cold)
+
+    suite.time('sheets', 'update_pilot_status', size,
+               lambda i: manager.update_pilot_status(pilot_ids[i], 'On Leave'))
+    suite.time('sheets', 'update_pilot_assignment', size,
+               lambda i: manager.update_pilot_assignment(pilot_ids[i], project_ids[i], '2026-03-01'))
+    suite.time('sheets', 'update_drone_status', size,
+               lambda i: manager.update_drone_status(drone_ids[i], 'Maintenance'))
+    suite.time('sheets', 'update_drone_assignment', size,
+               lambda i: manager.update_drone_assignment(drone_ids[i], project_ids[i]))
+    suite.time('sheets', 'assign_mission', size,
+               lambda i: manager.assign_mission(project_ids[i], pilot_ids[i], drone_ids[i], '2026-03-01'))
+
+    suite.time('sheets', 'add_pilot', size, lambda i: manager.add_pilot({
+        'pilot_id': f'PS{i:04d}', 'name': 'Bench', 'skills': 'Mapping', 'certifications': 'DGCA',
+        'location': 'Pune', 'status': 'Available', 'current_assignment': '–', 'available_from': '–',
+    }))
+    suite.time('sheets', 'add_drone', size, lambda i: manager.add_drone({
+        'drone_id': f'DS{i:04d}', 'model': 'DJI M300', 'capabilities': 'RGB', 'status': 'Available',
+        'location': 'Pune', 'current_assignment': '–', 'maintenance_due': '2026-12-31',
+    }))
+
+    # Bulk adds: 100 fresh rows per call, IDs renamed so they never collide
+    extra_pilots, extra_drones, extra_missions = generate_fleet(100, 100, 100, seed=size + 1)
+    def renamed(df, column, prefix, i):
+        return df.assign(**{column: df[column].str.replace(r'^[A-Z]+', f'{prefix}{i:02d}X', regex=True)})
+    suite.time('sheets', 'add_pilots[100]', size,
+               lambda i: manager.add_pilots(renamed(extra_pilots, 'pilot_id', 'PB', i)))
+    suite.time('sheets', 'add_drones[100]', size,
+               lambda i: manager.add_drones(renamed(extra_drones, 'drone_id', 'DB', i)))
+    suite.time('sheets', 'add_missions[100]', size,
+               lambda i: manager.add_missions(renamed(extra_missions, 'project_id', 'PRB', i)))
+
+    suite.time('sheets', 'delete_pilot', size, lambda i: manager.delete_pilot(pilot_ids[-1 - i]))
+    suite.time('sheets', 'delete_drone', size, lambda i: manager.delete_drone(drone_ids[-1 - i]))
+    suite.time('sheets', 'refresh_data', size, lambda i: manager.refresh_data())
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """Print median ratios against a baseline run; returns the number of regressions"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['group'], r['name'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (regression: median > {threshold:.2f}x):")
+    for result in current:
+        old = baseline.get((result['group'], result['name'], result['size']))
+        if old is None or not old['median_s']:
+            continue
+        ratio = result['median_s'] / old['median_s']
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print(f"  {result['group']:<10} {result['name']:<32} {result['size']:>8}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help='Fleet sizes (pilots; drones = pilots, missions = pilots / 2)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed calls per benchmark, after a first call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', help="Run benchmarks whose 'group.name' contains any of these")
+    parser.add_argument('--output', help='JSON results file (default: benchmarks/results/bench-<time>.json)')
+    parser.add_argument('--compare', help='Earlier JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Median slowdown counted as a regression by --compare')
+    args = parser.parse_args()
+
+    from stub_llm_server import serve
+    stub = serve(port=0)
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}/v1"
+
+    suite = Suite(args.repeat, args.only)
+    for size in args.sizes:
+        print(f"\n{size} pilots, {size} drones, {max(size // 2, 1)} missions")
+        for bench in (bench_conflicts, bench_queries, bench_sheets):
+            # A fresh fleet per group, so one group's writes don't skew the next
+            manager = SheetsManager(to_spreadsheet(*generate_fleet(size, seed=args.seed)))
+            if bench is bench_queries:
+                bench(suite, size, manager, stub_url)
+            else:
+                bench(suite, size, manager)
+    stub.shutdown()
+
+    report = {
+        'schema': 1,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'packages': {'pandas': pd.__version__, 'numpy': np.__version__},
+        'args': {'sizes': args.sizes, 'repeat': args.repeat, 'seed': args.seed, 'only': args.only},
+        'results': suite.results,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(DEFAULT_RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(DEFAULT_RESULTS_DIR, f'bench-{stamp}.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(suite.results)} results to {output}")
+
+    if args.compare and compare(suite.results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
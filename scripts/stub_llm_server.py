@@ -0,0 +1,137 @@
+"""
+Stub LLM Server
+A local stand-in for the OpenAI-compatible chat completions endpoint, for
+trying the app and GroqClient without a Groq key or network access.
+
+Usage:
+    python scripts/stub_llm_server.py --port 8765 --token-delay 0.05
+    GROQ_BASE_URL=http://127.0.0.1:8765/v1 GROQ_API_KEY=stub streamlit run app.py
+
+POST /v1/chat/completions answers with a canned reply built from the last
+user message, either as one JSON response or as server-sent events when
+the request has "stream": true. --fail-first N answers the first N
+requests with 503 to exercise retries; --delay stalls every request to
+exercise timeouts.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    """Options and counters shared by the request handlers"""
+
+    def __init__(self, delay: float = 0.0, token_delay: float = 0.0, fail_first: int = 0):
+        self.delay = delay
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_reply(messages) -> str:
+    """Canned reply that echoes the start of the last user message"""
+    question = ''
+    for message in reversed(messages):
+        if message.get('role') == 'user':
+            question = message.get('content', '')
+            break
+    question = ' '.join(question.split())
+    return f"(stub reply) You asked about: {question[-120:]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+
+        with self.state.lock:
+            self.state.requests += 1
+            failing = self.state.requests <= self.state.fail_first
+        if self.state.delay:
+            time.sleep(self.state.delay)
+        if failing:
+            self._send_json(503, {'error': {'message': 'stub: simulated outage'}})
+            return
+
+        reply = make_reply(payload.get('messages', []))
+        model = payload.get('model', 'stub')
+
+        if not payload.get('stream'):
+            self._send_json(200, {
+                'id': 'stub',
+                'object': 'chat.completion',
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for word in reply.split(' '):
+            chunk = {
+                'id': 'stub',
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if self.state.token_delay:
+                time.sleep(self.state.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def serve(port: int = 8765, delay: float = 0.0, token_delay: float = 0.0, fail_first: int = 0) -> ThreadingHTTPServer:
+    """Start the stub on a background thread and return the server (port 0 picks a free port)"""
+    handler = type('BoundStubHandler', (StubHandler,), {'state': StubState(delay, token_delay, fail_first)})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub OpenAI-compatible chat completions server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to stall before answering')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='Seconds between streamed tokens')
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer the first N requests with 503')
+    args = parser.parse_args()
+
+    server = serve(args.port, args.delay, args.token_delay, args.fail_first)
+    print(f"Stub LLM server on http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
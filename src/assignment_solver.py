@@ -0,0 +1,150 @@
+"""
+Assignment Solver
+Assigns pilots and drones to all open missions at once as a min-cost
+bipartite matching, instead of picking the first match per mission
+"""
+
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+from src.batch_conflict_detector import BatchConflictDetector
+
+# Missions with a higher weight win contested pilots and drones
+PRIORITY_WEIGHTS = {
+    'Urgent': 3,
+    'High': 2,
+    'Standard': 1
+}
+
+# Cost of a pair with conflicts; it is never kept in the result
+FORBIDDEN = 1e9
+
+# Reward per priority weight; larger than the most warnings one entity can have
+PRIORITY_REWARD = 10
+
+
+class AssignmentSolver:
+    """
+    Solves pilot and drone assignment for every open mission together
+
+    Costs come from BatchConflictDetector: pairs with conflicts are
+    forbidden, each warning adds 1, and each mission earns
+    PRIORITY_REWARD x its priority weight for being staffed. Each matching
+    therefore staffs as many of its missions as it can without conflicts,
+    prefers higher-priority missions when they compete, and picks the
+    candidates with the fewest warnings.
+
+    Pilot checks and drone checks are independent, so the solver runs two
+    bipartite matchings (Hungarian algorithm): drones first, then pilots
+    for the missions that received a drone. Missions that no pilot or no
+    drone can fly are left out up front. A mission that gets a drone but
+    no pilot gives the drone back: it is dropped and the drones are matched
+    again, until every mission holding a drone also has a pilot.
+    """
+
+    def __init__(self, detector: BatchConflictDetector, open_only: bool = True):
+        """
+        Args:
+            detector: Conflict arrays for the current pilots, drones and missions
+            open_only: Skip missions that a pilot or drone is already assigned to
+        """
+        self.detector = detector
+        missions = detector.missions
+
+        priority = missions['priority'] if 'priority' in missions.columns else pd.Series('', index=missions.index)
+        self.priority_weights = priority.fillna('').astype(str).str.strip().map(PRIORITY_WEIGHTS).fillna(1).to_numpy()
+
+        self.open_missions = np.ones(len(detector.mission_ids), dtype=bool)
+        if open_only:
+            taken = set()
+            for frame in (detector.pilots, detector.drones):
+                if 'current_assignment' in frame.columns:
+                    taken.update(frame['current_assignment'].astype(str).str.strip())
+            self.open_missions = ~np.isin(detector.mission_ids, list(taken))
+
+    def _match(self, missions: np.ndarray, conflicts: np.ndarray, warnings: np.ndarray) -> Dict[int, int]:
+        """
+        Min-cost matching of missions to one entity type
+
+        Args:
+            missions: Row positions of the missions to staff
+            conflicts: M x N conflict counts
+            warnings: M x N warning counts
+
+        Returns:
+            {mission position: entity position} for conflict-free matches
+        """
+        if len(missions) == 0 or conflicts.shape[1] == 0:
+            return {}
+
+        valid = conflicts[missions] == 0
+        # Entities that are invalid for every mission can't help; drop them
+        candidates = np.flatnonzero(valid.any(axis=0))
+        if len(candidates) == 0:
+            return {}
+
+        valid = valid[:, candidates]
+        reward = (self.priority_weights[missions] * PRIORITY_REWARD)[:, None]
+        cost = np.where(valid, warnings[missions][:, candidates] - reward, FORBIDDEN)
+
+        rows, cols = linear_sum_assignment(cost)
+        return {
+            int(missions[r]): int(candidates[c])
+            for r, c in zip(rows, cols)
+            if valid[r, c]
+        }
+
+    def solve(self) -> pd.DataFrame:
+        """
+        Assign pilots and drones to all open missions
+
+        Returns:
+            DataFrame with one row per open mission: project_id, priority,
+            pilot_id, drone_id, warnings, assigned (pilot_id/drone_id are
+            None where nothing conflict-free was available)
+        """
+        detector = self.detector
+        open_positions = np.flatnonzero(self.open_missions)
+
+        # Missions some pilot and some drone can fly; the rest would only hold on to drones
+        candidates = open_positions[
+            (detector.pilot_conflicts[open_positions] == 0).any(axis=1)
+            & (detector.drone_conflicts[open_positions] == 0).any(axis=1)
+        ]
+
+        while True:
+            drone_matches = self._match(candidates, detector.drone_conflicts, detector.drone_warnings)
+            staffed = np.array(sorted(drone_matches), dtype=np.int64)
+            pilot_matches = self._match(staffed, detector.pilot_conflicts, detector.pilot_warnings)
+            # Release the drones of missions left without a pilot, then match again
+            unpiloted = [m for m in drone_matches if m not in pilot_matches]
+            if not unpiloted:
+                break
+            candidates = candidates[~np.isin(candidates, unpiloted)]
+
+        rows = []
+        for m in open_positions:
+            pilot = pilot_matches.get(int(m))
+            drone = drone_matches.get(int(m)) if pilot is not None else None
+            warnings = 0
+            if pilot is not None and drone is not None:
+                warnings = int(detector.pilot_warnings[m, pilot] + detector.drone_warnings[m, drone])
+            rows.append({
+                'project_id': detector.mission_ids[m],
+                'priority': detector.missions['priority'].iloc[m] if 'priority' in detector.missions.columns else '',
+                'pilot_id': detector.pilot_ids[pilot] if pilot is not None else None,
+                'drone_id': detector.drone_ids[drone] if drone is not None else None,
+                'warnings': warnings,
+                'assigned': pilot is not None and drone is not None,
+            })
+        return pd.DataFrame(rows, columns=['project_id', 'priority', 'pilot_id', 'drone_id', 'warnings', 'assigned'])
+
+    def assignment_for(self, project_id: str) -> Optional[Dict]:
+        """Get the solved assignment row for one mission (None if not an open mission)"""
+        result = self.solve()
+        match = result[result['project_id'] == project_id]
+        if len(match) == 0:
+            return None
+        return match.iloc[0].to_dict()
@@ -0,0 +1,214 @@
+"""
+Batch Conflict Detector
+Runs the ConflictDetector checks for every mission against every pilot and
+every drone at once, using NumPy array operations instead of per-row loops
+"""
+
+from functools import cached_property
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from src.conflict_detector import SKILL_TO_CAPABILITY
+from src.vocabulary import (
+    SKILLS, CERTIFICATIONS, CAPABILITIES,
+    encode_columns, lacks, required_capabilities
+)
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy a frame with lower-cased, stripped column names"""
+    df = df.copy()
+    df.columns = df.columns.str.lower().str.strip()
+    return df
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Get a column as stripped strings ('' if the column is missing)"""
+    if name not in df.columns:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    return df[name].fillna('').astype(str).str.strip()
+
+
+def _dates(df: pd.DataFrame, name: str) -> np.ndarray:
+    """
+    Get a date column as datetime64 ('–' and bad dates become NaT)
+
+    Columns already typed by SheetsManager (typed=True) are used as-is;
+    string columns are parsed.
+    """
+    if name in df.columns and pd.api.types.is_datetime64_any_dtype(df[name]):
+        return df[name].to_numpy()
+    return pd.to_datetime(_column(df, name), format='%Y-%m-%d', errors='coerce').to_numpy()
+
+
+class BatchConflictDetector:
+    """
+    All-pairs conflict detection for pilots x drones x missions
+
+    Pilot checks depend only on (mission, pilot) and drone checks only on
+    (mission, drone), so results are stored as M x P and M x D arrays. The
+    P x D pair matrix for a mission is built on demand, never for all
+    missions at once.
+
+    Conflicts (block an assignment) and warnings match full_assignment_check:
+        - Pilot conflicts: on leave, already assigned, available_from after
+          mission start, missing certifications
+        - Pilot warnings: missing skills, location mismatch
+        - Drone conflicts: in maintenance, already assigned
+        - Drone warnings: missing capabilities, location mismatch
+    """
+
+    def __init__(self, pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame):
+        self.pilots = _normalize(pilots).reset_index(drop=True)
+        self.drones = _normalize(drones).reset_index(drop=True)
+        self.missions = _normalize(missions).reset_index(drop=True)
+
+        self.pilot_ids = _column(self.pilots, 'pilot_id').to_numpy()
+        self.drone_ids = _column(self.drones, 'drone_id').to_numpy()
+        self.mission_ids = _column(self.missions, 'project_id').to_numpy()
+        self._mission_positions = {pid: i for i, pid in enumerate(self.mission_ids)}
+
+        self._check_pilots()
+        self._check_drones()
+
+    def _check_pilots(self):
+        """Compute the M x P pilot check arrays"""
+        pilots, missions = self.pilots, self.missions
+        status = _column(pilots, 'status').to_numpy()
+
+        # Availability: status conflicts and available_from after mission start
+        self.pilot_on_leave = status == 'On Leave'
+        self.pilot_assigned = status == 'Assigned'
+        available_from = _dates(pilots, 'available_from')
+        mission_start = _dates(missions, 'start_date')
+        # NaT compares False, matching parse_date returning None
+        self.pilot_late = available_from[None, :] > mission_start[:, None]
+
+        # Skills and certifications as bitmasks: missing = need & ~have
+        self.pilot_skills, self.required_skills = encode_columns(
+            SKILLS, _column(pilots, 'skills'), _column(missions, 'required_skills')
+        )
+        self.lacks_skills = lacks(self.required_skills, self.pilot_skills)
+
+        self.pilot_certs, self.required_certs = encode_columns(
+            CERTIFICATIONS, _column(pilots, 'certifications'), _column(missions, 'required_certs')
+        )
+        self.lacks_certs = lacks(self.required_certs, self.pilot_certs)
+
+        self.pilot_location_ok = self._same_location(_column(pilots, 'location'))
+
+    def _check_drones(self):
+        """Compute the M x D drone check arrays"""
+        drones, missions = self.drones, self.missions
+        status = _column(drones, 'status').to_numpy()
+        self.drone_in_maintenance = status == 'Maintenance'
+        self.drone_assigned = status == 'Assigned'
+
+        # Map each mission's required skills to the capabilities they need
+        required_caps = _column(missions, 'required_skills').map(
+            lambda skills: ','.join(CAPABILITIES.decode(required_capabilities(skills, SKILL_TO_CAPABILITY)))
+        )
+        self.drone_capabilities, self.required_capabilities = encode_columns(
+            CAPABILITIES, _column(drones, 'capabilities'), required_caps
+        )
+        self.lacks_capabilities = lacks(self.required_capabilities, self.drone_capabilities)
+
+        self.drone_location_ok = self._same_location(_column(drones, 'location'))
+
+    def _same_location(self, locations: pd.Series) -> np.ndarray:
+        """M x N array: does each entity share each mission's location?"""
+        mission_locations = _column(self.missions, 'location')
+        codes, _ = pd.factorize(pd.concat([mission_locations, locations], ignore_index=True))
+        mission_codes = codes[:len(mission_locations)]
+        entity_codes = codes[len(mission_locations):]
+        return mission_codes[:, None] == entity_codes[None, :]
+
+    # ------------------------------------------------------------------
+    # Aggregated views
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def pilot_conflicts(self) -> np.ndarray:
+        """M x P number of conflicts for each mission/pilot"""
+        return (
+            self.pilot_on_leave[None, :].astype(np.int32)
+            + self.pilot_assigned[None, :]
+            + self.pilot_late
+            + self.lacks_certs
+        )
+
+    @cached_property
+    def pilot_warnings(self) -> np.ndarray:
+        """M x P number of warnings for each mission/pilot"""
+        return self.lacks_skills.astype(np.int32) + ~self.pilot_location_ok
+
+    @cached_property
+    def drone_conflicts(self) -> np.ndarray:
+        """M x D number of conflicts for each mission/drone"""
+        per_drone = self.drone_in_maintenance.astype(np.int32) + self.drone_assigned
+        return np.broadcast_to(per_drone[None, :], (len(self.mission_ids), len(self.drone_ids)))
+
+    @cached_property
+    def drone_warnings(self) -> np.ndarray:
+        """M x D number of warnings for each mission/drone"""
+        return self.lacks_capabilities.astype(np.int32) + ~self.drone_location_ok
+
+    def mission_index(self, project_id: str) -> int:
+        """Get the row position of a mission"""
+        if project_id not in self._mission_positions:
+            raise KeyError(f"Project {project_id} not found")
+        return self._mission_positions[project_id]
+
+    def pair_matrix(self, project_id: str) -> pd.DataFrame:
+        """
+        Get the pilot x drone validity matrix for one mission
+
+        Returns:
+            Boolean DataFrame (index: pilot_id, columns: drone_id); True where
+            the pair has no conflicts
+        """
+        m = self.mission_index(project_id)
+        pilot_ok = self.pilot_conflicts[m] == 0
+        drone_ok = self.drone_conflicts[m] == 0
+        return pd.DataFrame(
+            pilot_ok[:, None] & drone_ok[None, :],
+            index=self.pilot_ids,
+            columns=self.drone_ids
+        )
+
+    def best_pair(self, project_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Pick the pilot and drone with the fewest conflicts, then fewest warnings
+
+        Pilot and drone checks are independent, so the best pair is the best
+        pilot plus the best drone: O(P + D) instead of O(P x D).
+
+        Returns:
+            (pilot, drone) as dicts, or None if there are no pilots or drones
+        """
+        if len(self.pilot_ids) == 0 or len(self.drone_ids) == 0:
+            return None
+        m = self.mission_index(project_id)
+        # Conflicts dominate warnings (at most 2 warnings per entity)
+        pilot_cost = self.pilot_conflicts[m] * 10 + self.pilot_warnings[m]
+        drone_cost = self.drone_conflicts[m] * 10 + self.drone_warnings[m]
+        pilot = self.pilots.iloc[int(np.argmin(pilot_cost))].to_dict()
+        drone = self.drones.iloc[int(np.argmin(drone_cost))].to_dict()
+        return pilot, drone
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Count conflict-free pilots, drones and pairs for every mission
+
+        Returns:
+            DataFrame with project_id, valid_pilots, valid_drones, valid_pairs
+        """
+        valid_pilots = (self.pilot_conflicts == 0).sum(axis=1)
+        valid_drones = (self.drone_conflicts == 0).sum(axis=1)
+        return pd.DataFrame({
+            'project_id': self.mission_ids,
+            'valid_pilots': valid_pilots,
+            'valid_drones': valid_drones,
+            'valid_pairs': valid_pilots.astype(np.int64) * valid_drones,
+        })
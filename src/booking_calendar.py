@@ -0,0 +1,241 @@
+"""
+Booking Calendar
+Date-range reservations for pilots and drones, used to detect double
+bookings and answer "is X free between d1 and d2" in logarithmic time
+"""
+
+import heapq
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Tuple, Union
+import pandas as pd
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+# Open-ended blocks (e.g. "on leave until 2026-02-15") start here
+EARLIEST = date(1900, 1, 1).toordinal()
+
+# Booking kinds
+MISSION = 'mission'
+UNAVAILABLE = 'unavailable'
+
+
+def _to_ordinal(value: DateLike) -> Optional[int]:
+    """Convert a date-like value to a day number (None for '–', blanks and bad dates)"""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date().toordinal()
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').date().toordinal()
+    except ValueError:
+        return None
+
+
+def _format(ordinal: int) -> str:
+    """Format a day number as YYYY-MM-DD"""
+    return date.fromordinal(ordinal).strftime('%Y-%m-%d')
+
+
+class _EntityBookings:
+    """Bookings for one pilot or drone, plus merged busy intervals for lookups"""
+
+    def __init__(self):
+        self.bookings: List[Tuple[int, int, str, str]] = []  # (start, end, label, kind), inclusive days
+        self._busy_starts: List[int] = []
+        self._busy_ends: List[int] = []
+        self._dirty = False
+
+    def add(self, start: int, end: int, label: str, kind: str):
+        self.bookings.append((start, end, label, kind))
+        self._dirty = True
+
+    def _merge(self):
+        """Rebuild the sorted, non-overlapping busy intervals"""
+        starts, ends = [], []
+        for start, end, _, _ in sorted(self.bookings):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._busy_starts, self._busy_ends = starts, ends
+        self._dirty = False
+
+    def is_free(self, start: int, end: int) -> bool:
+        """Binary search the busy interval that starts last at or before `end`"""
+        if self._dirty:
+            self._merge()
+        i = bisect_right(self._busy_starts, end) - 1
+        return i < 0 or self._busy_ends[i] < start
+
+
+class BookingCalendar:
+    """
+    Reservations for pilots and drones keyed by ID
+
+    Bookings are inclusive date ranges. Each entity keeps its bookings in
+    sorted arrays with the overlapping ranges merged, so is_free() is a
+    single bisect: O(log k) for k bookings. find_overlaps() sweeps each
+    entity's bookings in start order: O(n log n + overlaps found).
+    """
+
+    def __init__(self):
+        self._entities: Dict[str, _EntityBookings] = {}
+
+    def reserve(self, entity_id: str, start: DateLike, end: DateLike, label: str) -> bool:
+        """
+        Book an entity for a date range
+
+        Args:
+            entity_id: Pilot or drone ID
+            start: First day (YYYY-MM-DD string, date or Timestamp)
+            end: Last day, inclusive
+            label: What the booking is for (usually a project ID)
+
+        Returns:
+            bool: False if the dates could not be parsed
+        """
+        start_day, end_day = _to_ordinal(start), _to_ordinal(end)
+        if start_day is None or end_day is None:
+            return False
+        if end_day < start_day:
+            start_day, end_day = end_day, start_day
+        self._entities.setdefault(entity_id, _EntityBookings()).add(start_day, end_day, label, MISSION)
+        return True
+
+    def block_until(self, entity_id: str, available_from: DateLike, label: str) -> bool:
+        """Mark an entity busy from the distant past until the day before available_from"""
+        day = _to_ordinal(available_from)
+        if day is None:
+            return False
+        self._entities.setdefault(entity_id, _EntityBookings()).add(EARLIEST, day - 1, label, UNAVAILABLE)
+        return True
+
+    def is_free(self, entity_id: str, start: DateLike, end: DateLike) -> bool:
+        """Check whether an entity has no booking between start and end (inclusive)"""
+        entity = self._entities.get(entity_id)
+        start_day, end_day = _to_ordinal(start), _to_ordinal(end)
+        if entity is None or start_day is None or end_day is None:
+            return True
+        return entity.is_free(start_day, end_day)
+
+    def bookings_for(self, entity_id: str) -> List[Dict[str, Any]]:
+        """List an entity's bookings in start order"""
+        entity = self._entities.get(entity_id)
+        if entity is None:
+            return []
+        return [
+            {'start': _format(start) if start != EARLIEST else '–', 'end': _format(end), 'label': label, 'kind': kind}
+            for start, end, label, kind in sorted(entity.bookings)
+        ]
+
+    def conflicting_bookings(self, entity_id: str, start: DateLike, end: DateLike,
+                             exclude: Optional[str] = None, kind: Optional[str] = MISSION) -> List[Dict[str, Any]]:
+        """
+        List an entity's bookings that overlap a date range
+
+        Args:
+            entity_id: Pilot or drone ID
+            start: First day of the range
+            end: Last day of the range (inclusive)
+            exclude: Label to ignore (e.g. the mission being checked)
+            kind: Only this booking kind ('mission' or 'unavailable'); None for all
+        """
+        # The bisect rules out the common case; only busy entities are scanned
+        if self.is_free(entity_id, start, end):
+            return []
+        start_day, end_day = _to_ordinal(start), _to_ordinal(end)
+        return [
+            {'start': _format(b_start) if b_start != EARLIEST else '–', 'end': _format(b_end),
+             'label': label, 'kind': b_kind}
+            for b_start, b_end, label, b_kind in sorted(self._entities[entity_id].bookings)
+            if b_start <= end_day and b_end >= start_day
+            and label != exclude and (kind is None or b_kind == kind)
+        ]
+
+    def find_overlaps(self) -> List[Dict[str, Any]]:
+        """
+        Find every pair of overlapping bookings on the same pilot or drone
+
+        Returns:
+            List of dicts with entity_id, first, second (labels) and the
+            overlapping start/end dates
+        """
+        overlaps = []
+        for entity_id, entity in self._entities.items():
+            # Active bookings ordered by end day; anything ending before the
+            # current start can no longer overlap and is popped
+            active: List[Tuple[int, int, str]] = []
+            for start, end, label, _ in sorted(entity.bookings):
+                while active and active[0][0] < start:
+                    heapq.heappop(active)
+                for other_end, other_start, other_label in active:
+                    overlaps.append({
+                        'entity_id': entity_id,
+                        'first': other_label,
+                        'second': label,
+                        'start': _format(max(start, other_start)),
+                        'end': _format(min(end, other_end)),
+                    })
+                heapq.heappush(active, (end, start, label))
+        return overlaps
+
+    def book_assignment(self, entity_id: str, assignment: str, status: str, available_from: DateLike,
+                        mission_dates: Dict[str, Tuple[DateLike, DateLike]]) -> bool:
+        """
+        Book one pilot or drone from its sheet values
+
+        The entity is booked for the dates of every mission in its
+        current_assignment (comma-separated IDs are allowed). If none of them
+        is a known mission and it is Assigned or On Leave, it is blocked
+        until available_from instead.
+
+        Args:
+            entity_id: Pilot or drone ID
+            assignment: current_assignment value
+            status: status value
+            available_from: available_from value (None for drones)
+            mission_dates: {project_id: (start_date, end_date)}
+
+        Returns:
+            bool: True if anything was booked
+        """
+        booked = False
+        for project_id in str(assignment).split(','):
+            project_id = project_id.strip()
+            if project_id in mission_dates:
+                start, end = mission_dates[project_id]
+                booked = self.reserve(entity_id, start, end, project_id) or booked
+        if not booked and status in ('Assigned', 'On Leave'):
+            label = 'On Leave' if status == 'On Leave' else str(assignment).strip()
+            booked = self.block_until(entity_id, available_from, label)
+        return booked
+
+    @classmethod
+    def from_frames(cls, pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame) -> 'BookingCalendar':
+        """
+        Build a calendar from the current sheets
+
+        Every pilot and drone is booked with book_assignment().
+        """
+        calendar = cls()
+        mission_dates = {}
+        if len(missions) and 'project_id' in missions.columns:
+            for project_id, start, end in zip(missions['project_id'], missions['start_date'], missions['end_date']):
+                mission_dates[str(project_id).strip()] = (start, end)
+
+        for frame, id_column in ((pilots, 'pilot_id'), (drones, 'drone_id')):
+            if len(frame) == 0 or id_column not in frame.columns:
+                continue
+            assignments = frame['current_assignment'] if 'current_assignment' in frame.columns else [''] * len(frame)
+            statuses = frame['status'] if 'status' in frame.columns else [''] * len(frame)
+            available = frame['available_from'] if 'available_from' in frame.columns else [None] * len(frame)
+
+            for entity_id, assignment, status, available_from in zip(frame[id_column], assignments, statuses, available):
+                calendar.book_assignment(entity_id, assignment, status, available_from, mission_dates)
+        return calendar
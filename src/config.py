@@ -0,0 +1,57 @@
+"""
+Configuration Helpers
+Reads settings from Streamlit secrets or environment variables
+"""
+
+import os
+from typing import Any
+
+from dotenv import load_dotenv
+
+# Every module reads its settings through here, so .env is loaded once, on first import
+load_dotenv()
+
+
+def get_setting(name: str, default: Any = None) -> Any:
+    """
+    Look up a setting, preferring Streamlit secrets over the environment
+
+    Args:
+        name: Setting name (e.g., 'STORAGE_BACKEND')
+        default: Value returned when the setting is not defined anywhere
+
+    Returns:
+        The configured value, or default
+    """
+    # Try Streamlit secrets first (for cloud deployment)
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets') and name in st.secrets:
+            return st.secrets[name]
+    except Exception:
+        # Streamlit not installed, or no secrets.toml present
+        pass
+
+    return os.getenv(name, default)
+
+
+def get_bool_setting(name: str, default: bool = False) -> bool:
+    """Look up a boolean setting ('1', 'true', 'yes', 'on' are truthy)"""
+    value = get_setting(name)
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_float_setting(name: str, default: float) -> float:
+    """Look up a numeric setting, falling back to default if it is not a number"""
+    value = get_setting(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        print(f"Invalid value for {name}: {value!r}, using {default}")
+        return default
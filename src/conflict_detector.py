@@ -4,26 +4,54 @@ Identifies scheduling conflicts, skill mismatches, and equipment issues
 """
 
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 import pandas as pd
 
+from src.booking_calendar import BookingCalendar
+from src.sheets_manager import DATE_FORMAT, NO_DATE, format_date
+from src.vocabulary import SKILLS, CERTIFICATIONS, CAPABILITIES, required_capabilities
+
+
+# Mapping of skills to required drone capabilities
+# e.g., "Thermal" skill needs "Thermal" capability
+SKILL_TO_CAPABILITY = {
+    'Thermal': 'Thermal',
+    'Mapping': 'LiDAR',
+    'Survey': 'RGB',
+    'Inspection': 'RGB'
+}
+
 
 class ConflictDetector:
     """Detects various types of conflicts in drone operations"""
     
     @staticmethod
-    def parse_date(date_str: str) -> datetime:
-        """Parse date string to datetime object"""
+    def parse_date(value: Any) -> Optional[datetime]:
+        """
+        Get a date as a datetime (None for '–', NaT and malformed dates)
+        
+        Typed values from SheetsManager.get_snapshot(typed=True) pass
+        straight through; strings are parsed as a fallback.
+        """
+        if value is None or value is pd.NaT:
+            return None
+        if isinstance(value, datetime):
+            return value
+        value = str(value).strip()
+        if value in NO_DATE:
+            return None
         try:
-            return datetime.strptime(date_str, '%Y-%m-%d')
-        except:
+            return datetime.strptime(value, DATE_FORMAT)
+        except ValueError:
             return None
     
     @staticmethod
-    def check_pilot_availability(pilot_data: Dict, mission_start: str, mission_end: str) -> List[str]:
+    def check_pilot_availability(pilot_data: Dict, mission_start: Any, mission_end: Any) -> List[str]:
         """
         Check if pilot is available for a mission
         
+        Dates may be datetime64/Timestamp values (typed load) or strings.
+        
         Returns:
             List of conflict messages (empty if no conflicts)
         """
@@ -31,46 +59,73 @@ class ConflictDetector:
         
         # Check status
         if pilot_data['status'] == 'On Leave':
-            available_from = pilot_data.get('available_from', '–')
+            available_from = format_date(pilot_data.get('available_from', '–'))
             conflicts.append(
                 f"⚠️ Pilot {pilot_data['name']} is on leave until {available_from}"
             )
         
         if pilot_data['status'] == 'Assigned':
             current_assignment = pilot_data.get('current_assignment', 'Unknown')
-            available_from = pilot_data.get('available_from', '–')
+            available_from = format_date(pilot_data.get('available_from', '–'))
             conflicts.append(
                 f"⚠️ Pilot {pilot_data['name']} is already assigned to {current_assignment} "
                 f"(available from: {available_from})"
             )
         
         # Check if available_from date is after mission start
-        if pilot_data.get('available_from') and pilot_data['available_from'] != '–':
-            available_date = ConflictDetector.parse_date(pilot_data['available_from'])
-            mission_start_date = ConflictDetector.parse_date(mission_start)
-            
-            if available_date and mission_start_date and available_date > mission_start_date:
-                conflicts.append(
-                    f"⚠️ Pilot {pilot_data['name']} won't be available until {pilot_data['available_from']}, "
-                    f"but mission starts on {mission_start}"
-                )
+        available_date = ConflictDetector.parse_date(pilot_data.get('available_from'))
+        mission_start_date = ConflictDetector.parse_date(mission_start)
+        
+        if available_date and mission_start_date and available_date > mission_start_date:
+            conflicts.append(
+                f"⚠️ Pilot {pilot_data['name']} won't be available until {format_date(pilot_data['available_from'])}, "
+                f"but mission starts on {format_date(mission_start)}"
+            )
         
         return conflicts
     
     @staticmethod
-    def check_skill_match(pilot_skills: str, required_skills: str) -> List[str]:
+    def encode_record(record: Dict) -> Dict:
+        """
+        Encode a pilot, drone or mission record's skill/cert/capability fields as bitmasks
+        
+        The check_* methods accept the encoded ints in place of the
+        comma-separated strings and produce the same messages.
+        """
+        encoded = dict(record)
+        for field, vocabulary in (
+            ('skills', SKILLS),
+            ('required_skills', SKILLS),
+            ('certifications', CERTIFICATIONS),
+            ('required_certs', CERTIFICATIONS),
+            ('capabilities', CAPABILITIES),
+        ):
+            if field in encoded:
+                encoded[field] = vocabulary.encode(encoded[field])
+        return encoded
+    
+    @staticmethod
+    def check_skill_match(pilot_skills: Union[str, int], required_skills: Union[str, int]) -> List[str]:
         """
         Check if pilot has required skills
         
         Args:
-            pilot_skills: Comma-separated skills (e.g., "Mapping, Survey")
-            required_skills: Required skills for mission
+            pilot_skills: Comma-separated skills (e.g., "Mapping, Survey") or skills bitmask
+            required_skills: Required skills for mission (string or bitmask)
         
         Returns:
             List of warnings (empty if all skills match)
         """
         warnings = []
         
+        if isinstance(pilot_skills, int) or isinstance(required_skills, int):
+            missing_skills = SKILLS.missing(pilot_skills, required_skills)
+            if missing_skills:
+                warnings.append(
+                    f"⚠️ Pilot is missing required skills: {', '.join(missing_skills)}"
+                )
+            return warnings
+        
         # Parse skills (handle quoted strings)
         pilot_skills_list = [s.strip() for s in pilot_skills.split(',')]
         required_skills_list = [s.strip() for s in required_skills.split(',')]
@@ -89,15 +144,27 @@ class ConflictDetector:
         return warnings
     
     @staticmethod
-    def check_certification_match(pilot_certs: str, required_certs: str) -> List[str]:
+    def check_certification_match(pilot_certs: Union[str, int], required_certs: Union[str, int]) -> List[str]:
         """
         Check if pilot has required certifications
         
+        Args:
+            pilot_certs: Comma-separated certifications or certifications bitmask
+            required_certs: Required certifications (string or bitmask)
+        
         Returns:
             List of warnings (empty if all certs match)
         """
         warnings = []
         
+        if isinstance(pilot_certs, int) or isinstance(required_certs, int):
+            missing_certs = CERTIFICATIONS.missing(pilot_certs, required_certs)
+            if missing_certs:
+                warnings.append(
+                    f"🚨 CRITICAL: Pilot lacks required certifications: {', '.join(missing_certs)}"
+                )
+            return warnings
+        
         # Parse certifications
         pilot_certs_list = [c.strip() for c in pilot_certs.split(',')]
         required_certs_list = [c.strip() for c in required_certs.split(',')]
@@ -148,26 +215,26 @@ class ConflictDetector:
         return conflicts
     
     @staticmethod
-    def check_drone_capability(drone_capabilities: str, required_skills: str) -> List[str]:
-        """Check if drone has required capabilities"""
+    def check_drone_capability(drone_capabilities: Union[str, int], required_skills: Union[str, int]) -> List[str]:
+        """Check if drone has required capabilities (strings or bitmasks)"""
         warnings = []
         
-        # For simplicity, map skills to drone capabilities
-        # e.g., "Thermal" skill needs "Thermal" capability
+        if isinstance(drone_capabilities, int) or isinstance(required_skills, int):
+            needed = required_capabilities(required_skills, SKILL_TO_CAPABILITY)
+            missing_caps = CAPABILITIES.missing(drone_capabilities, needed)
+            if missing_caps:
+                warnings.append(
+                    f"⚠️ Drone may lack required capabilities: {', '.join(missing_caps)}"
+                )
+            return warnings
+        
+        # For simplicity, map skills to drone capabilities (see SKILL_TO_CAPABILITY)
         drone_caps = [c.strip() for c in drone_capabilities.split(',')]
         required_skills_list = [s.strip() for s in required_skills.split(',')]
         
-        # Mapping of skills to required capabilities
-        skill_to_capability = {
-            'Thermal': 'Thermal',
-            'Mapping': 'LiDAR',
-            'Survey': 'RGB',
-            'Inspection': 'RGB'
-        }
-        
         missing_caps = []
         for skill in required_skills_list:
-            required_cap = skill_to_capability.get(skill)
+            required_cap = SKILL_TO_CAPABILITY.get(skill)
             if required_cap and required_cap not in drone_caps:
                 missing_caps.append(required_cap)
         
@@ -191,15 +258,47 @@ class ConflictDetector:
         
         return warnings
     
+    @staticmethod
+    def check_double_booking(calendar: BookingCalendar, entity: str, entity_id: str, mission_data: Dict) -> List[str]:
+        """
+        Check a pilot or drone's other mission bookings against the mission dates
+
+        Args:
+            calendar: Bookings built from the current assignments
+            entity: 'Pilot' or 'Drone', used in the message
+            entity_id: Pilot or drone ID
+            mission_data: Mission being checked
+        """
+        conflicts = []
+        overlapping = calendar.conflicting_bookings(
+            entity_id,
+            mission_data['start_date'],
+            mission_data['end_date'],
+            exclude=mission_data.get('project_id')
+        )
+        for booking in overlapping:
+            conflicts.append(
+                f"⚠️ {entity} {entity_id} is booked on {booking['label']} "
+                f"({booking['start']} to {booking['end']}), which overlaps this mission"
+            )
+        return conflicts
+
     @staticmethod
     def full_assignment_check(
         pilot_data: Dict,
         drone_data: Dict,
-        mission_data: Dict
+        mission_data: Dict,
+        calendar: Optional[BookingCalendar] = None
     ) -> Dict[str, Any]:
         """
         Run all conflict checks for a pilot-drone-mission assignment
         
+        Args:
+            pilot_data: Pilot record
+            drone_data: Drone record
+            mission_data: Mission record
+            calendar: Optional bookings; adds date-overlap conflicts with other missions
+        
         Returns:
             Dict with 'conflicts', 'warnings', and 'is_valid' keys
         """
@@ -255,6 +354,15 @@ class ConflictDetector:
             )
         )
         
+        # Date-range checks against the other missions they are booked on
+        if calendar is not None:
+            all_conflicts.extend(
+                ConflictDetector.check_double_booking(calendar, 'Pilot', pilot_data['pilot_id'], mission_data)
+            )
+            all_conflicts.extend(
+                ConflictDetector.check_double_booking(calendar, 'Drone', drone_data['drone_id'], mission_data)
+            )
+        
         return {
             'conflicts': all_conflicts,
             'warnings': all_warnings,
@@ -0,0 +1,229 @@
+"""
+Conflict State
+Keeps the fleet-wide conflict list up to date as SheetsManager writes
+happen, instead of rescanning every pilot and drone on each check
+"""
+
+import threading
+import time
+import weakref
+from typing import Dict, List, Any, Optional, Set, Tuple
+import pandas as pd
+
+from src.booking_calendar import BookingCalendar
+
+EntityKey = Tuple[str, str]  # (sheet title, pilot_id/drone_id)
+
+
+def _records(df: pd.DataFrame, key_column: str) -> Dict[str, Dict[str, Any]]:
+    """Turn a sheet frame into {key: record} with lower-cased column names"""
+    df = df.copy()
+    df.columns = df.columns.str.lower().str.strip()
+    if key_column not in df.columns:
+        return {}
+    return {str(record[key_column]).strip(): record for record in df.to_dict('records')}
+
+
+def _assigned_missions(record: Dict[str, Any]) -> Set[str]:
+    """Project IDs listed in a record's current_assignment"""
+    return {p.strip() for p in str(record.get('current_assignment', '')).split(',') if p.strip()}
+
+
+class ConflictState:
+    """
+    Materialized conflicts for every pilot and drone
+
+    Seeded once from a snapshot, then kept current by apply(), which is
+    registered as a SheetsManager listener. Each event re-evaluates only the
+    entity it touches; a mission added, edited or deleted re-evaluates only
+    the entities assigned to it. check() reads the stored results and
+    reports what changed since the previous check.
+
+    Conflicts match the 'check conflicts' report:
+        - Pilots that are Assigned
+        - Drones in Maintenance or Assigned
+        - Pilots/drones booked on missions with overlapping dates
+    """
+
+    def __init__(self):
+        self.pilots: Dict[str, Dict[str, Any]] = {}
+        self.drones: Dict[str, Dict[str, Any]] = {}
+        self.mission_dates: Dict[str, Tuple[Any, Any]] = {}
+
+        # Per entity: (status conflicts, double-booking conflicts)
+        self._conflicts: Dict[EntityKey, Tuple[List[str], List[str]]] = {}
+        # project_id -> entities whose current_assignment names it
+        self._by_mission: Dict[str, Set[EntityKey]] = {}
+        self._entity_missions: Dict[EntityKey, Set[str]] = {}
+        self._lock = threading.RLock()
+
+        self.seeded = False
+        self.seeded_at = 0.0
+        self.evaluations = 0
+
+    def seed(self, pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame):
+        """Evaluate every entity from a full snapshot"""
+        with self._lock:
+            self.pilots = _records(pilots, 'pilot_id')
+            self.drones = _records(drones, 'drone_id')
+            self.mission_dates = {
+                key: (record.get('start_date'), record.get('end_date'))
+                for key, record in _records(missions, 'project_id').items()
+            }
+            self._conflicts = {}
+            self._by_mission = {}
+            self._entity_missions = {}
+            for pilot_id in self.pilots:
+                self._evaluate(('pilot_roster', pilot_id))
+            for drone_id in self.drones:
+                self._evaluate(('drone_fleet', drone_id))
+            self.seeded = True
+            self.seeded_at = time.monotonic()
+
+    def _table(self, title: str) -> Dict[str, Dict[str, Any]]:
+        return self.pilots if title == 'pilot_roster' else self.drones
+
+    def _evaluate(self, key: EntityKey):
+        """Recompute the conflicts of one pilot or drone"""
+        title, entity_id = key
+        self.evaluations += 1
+
+        # Drop the old reverse-index entries; they are re-added below
+        for project_id in self._entity_missions.pop(key, ()):
+            self._by_mission[project_id].discard(key)
+
+        record = self._table(title).get(entity_id)
+        if record is None:
+            self._conflicts.pop(key, None)
+            return
+
+        missions = _assigned_missions(record)
+        self._entity_missions[key] = missions
+        for project_id in missions:
+            self._by_mission.setdefault(project_id, set()).add(key)
+
+        status = record.get('status', '')
+        assignment = record.get('current_assignment', 'Unknown')
+        status_conflicts = []
+        if title == 'pilot_roster':
+            if status == 'Assigned':
+                status_conflicts.append(f"⚠️ Pilot {record.get('name', 'Unknown')} is assigned to {assignment}")
+        else:
+            if status == 'Maintenance':
+                status_conflicts.append(f"🚨 Drone {entity_id} is in maintenance")
+            elif status == 'Assigned':
+                status_conflicts.append(f"⚠️ Drone {entity_id} is assigned to {assignment}")
+
+        # Double bookings only involve this entity's own missions
+        calendar = BookingCalendar()
+        calendar.book_assignment(entity_id, assignment, status, record.get('available_from'), self.mission_dates)
+        overlap_conflicts = [
+            f"🚨 {overlap['entity_id']} is double-booked: {overlap['first']} and {overlap['second']} "
+            f"overlap from {overlap['start']} to {overlap['end']}"
+            for overlap in calendar.find_overlaps()
+        ]
+        self._conflicts[key] = (status_conflicts, overlap_conflicts)
+
+    def apply(self, event: Dict[str, Any]):
+        """
+        Update the state from a SheetsManager change event
+
+        Args:
+            event: Dict with action, sheet, key and values (see SheetsManager.add_listener)
+        """
+        with self._lock:
+            action, title, key = event['action'], event['sheet'], event['key']
+            if action == 'reload':
+                # Anything may have changed; re-seed on the next check
+                self.seeded = False
+                return
+            if not self.seeded:
+                return
+
+            if title == 'missions':
+                values = event['values']
+                if action == 'delete':
+                    self.mission_dates.pop(key, None)
+                else:
+                    start, end = self.mission_dates.get(key, (None, None))
+                    self.mission_dates[key] = (values.get('start_date', start), values.get('end_date', end))
+                for entity in list(self._by_mission.get(key, ())):
+                    self._evaluate(entity)
+                return
+
+            table = self._table(title)
+            if action == 'update':
+                if key not in table:
+                    return
+                table[key] = {**table[key], **event['values']}
+            elif action == 'add':
+                table[key] = dict(event['values'])
+            elif action == 'delete':
+                table.pop(key, None)
+            self._evaluate((title, key))
+
+    def conflicts(self) -> List[str]:
+        """All current conflicts: pilots, then drones, then double bookings"""
+        with self._lock:
+            keys = [('pilot_roster', k) for k in self.pilots] + [('drone_fleet', k) for k in self.drones]
+            status = [c for key in keys for c in self._conflicts.get(key, ([], []))[0]]
+            overlaps = [c for key in keys for c in self._conflicts.get(key, ([], []))[1]]
+            return status + overlaps
+
+    def check(self, previous: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Read the current conflicts and what changed since a previous check
+
+        The state is shared by every session, so each caller keeps the
+        conflicts it was last shown and passes them back in.
+
+        Args:
+            previous: The 'conflicts' list of the caller's previous check
+
+        Returns:
+            Dict with 'conflicts', 'new' and 'resolved' lists; 'new' and
+            'resolved' are None when there is no previous check
+        """
+        current = self.conflicts()
+        if previous is None:
+            return {'conflicts': current, 'new': None, 'resolved': None}
+        previous_set, current_set = set(previous), set(current)
+        return {
+            'conflicts': current,
+            'new': [c for c in current if c not in previous_set],
+            'resolved': [c for c in previous if c not in current_set],
+        }
+
+
+# Keyed by the manager itself, so a state goes away with its manager
+_states: "weakref.WeakKeyDictionary[Any, ConflictState]" = weakref.WeakKeyDictionary()
+_states_lock = threading.Lock()
+
+
+def get_conflict_state(sheets_manager, max_age: Optional[float] = None) -> ConflictState:
+    """
+    Get the ConflictState attached to a SheetsManager, seeding it if needed
+
+    The state is created and registered as a listener on first use, and
+    re-seeded from a snapshot after a reload event (e.g. refresh_data()).
+    Like get_fleet_counters, a state older than max_age seconds (default:
+    the manager's cache TTL) is brought up to date so that edits made
+    directly in the sheet show up: by sheets_manager.sync() with delta
+    sync on, by re-seeding otherwise.
+    """
+    with _states_lock:
+        state = _states.get(sheets_manager)
+        if state is None:
+            state = ConflictState()
+            sheets_manager.add_listener(state.apply)
+            _states[sheets_manager] = state
+    if max_age is None:
+        max_age = sheets_manager.cache_ttl
+    stale = state.seeded and time.monotonic() - state.seeded_at >= max_age
+    if stale and getattr(sheets_manager, 'delta_sync', None) is not None:
+        sheets_manager.sync()  # row changes reach the state through state.apply
+        state.seeded_at = time.monotonic()
+        stale = False
+    if not state.seeded or stale:
+        state.seed(*sheets_manager.get_snapshot())
+    return state
@@ -0,0 +1,164 @@
+"""
+Delta Sync
+Change detection for the cached sheets: the spreadsheet's revision says
+whether anything changed since a sheet was downloaded, and comparing rows
+by key says which rows did, so listeners get row events instead of a reload
+"""
+
+import threading
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+
+def index_rows(df: pd.DataFrame, key_column: str) -> Optional[Dict[str, tuple]]:
+    """
+    A download's rows by primary key, each as (row as text, row as read)
+
+    Returns:
+        {key: (texts, values)}, or None if the key column is missing or a
+        key is duplicated (the rows can't be matched up by key)
+    """
+    columns = list(df.columns)
+    if key_column not in columns:
+        return None
+    position = columns.index(key_column)
+    rows = {}
+    # Column by column: much faster than iterating rows of Arrow-backed frames
+    for values in zip(*(df.iloc[:, i].tolist() for i in range(len(columns)))):
+        # Compared as text: the same cell reads as 7 or '7' depending on the API call
+        texts = tuple(map(str, values))
+        if texts[position] in rows:
+            return None
+        rows[texts[position]] = (texts, values)
+    return rows
+
+
+def diff_rows(columns: List[str], old: Dict[str, tuple], new: Dict[str, tuple]) -> Dict[str, Any]:
+    """
+    Rows added, updated and deleted between two downloads of a sheet
+
+    Args:
+        columns: The sheet's columns (the same in both downloads)
+        old: index_rows() of the previous download
+        new: index_rows() of the latest download
+
+    Returns:
+        {'added': {key: row}, 'updated': {key: {column: new value}},
+        'deleted': [keys]}
+    """
+    added, updated = {}, {}
+    for key, (texts, values) in new.items():
+        previous = old.get(key)
+        if previous is None:
+            added[key] = dict(zip(columns, values))
+        elif previous[0] != texts:
+            updated[key] = {
+                column: value
+                for column, value, text, old_text in zip(columns, values, texts, previous[0])
+                if text != old_text
+            }
+    return {
+        'added': added,
+        'updated': updated,
+        'deleted': [key for key in old if key not in new],
+    }
+
+
+class DeltaSync:
+    """
+    Per-sheet change tracking for a SheetsManager
+
+    For each sheet it keeps the spreadsheet revision (Drive modifiedTime)
+    read just before the sheet was last downloaded, and that download's
+    rows by key. A
+    cached sheet whose revision still matches has not changed and needn't
+    be downloaded again; when it has, the new download is diffed against
+    the old one to turn it into row-level change events. The revision is
+    read to check an expired download, and before any download that will
+    be saved to a snapshot. Otherwise a first download, or one after our
+    own write, is known to be needed and has no revision, so it is
+    downloaded again when it expires.
+    """
+
+    def __init__(self):
+        self.revisions: Dict[str, str] = {}
+        self._tables: Dict[str, tuple] = {}  # title -> (columns, index_rows())
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.unchanged = 0
+        self.downloads = 0
+        self.rows_changed = 0
+
+    def current(self, titles: List[str], revision: Optional[str]) -> List[str]:
+        """The sheets (of titles) not changed since they were downloaded at this revision"""
+        with self._lock:
+            self.checks += 1
+            if revision is None:
+                return []
+            current = [title for title in titles if self.revisions.get(title) == revision]
+            self.unchanged += len(current)
+            return current
+
+    def record(self, title: str, key_column: str, df: pd.DataFrame, revision: Optional[str],
+               started: float) -> List[Dict[str, Any]]:
+        """
+        Store a new download of a sheet and work out what changed
+
+        Args:
+            title: Sheet title
+            key_column: The sheet's primary key column
+            df: The downloaded sheet
+            revision: Spreadsheet revision read before the download, if known
+            started: When the download started (time.monotonic()); a
+                download that finishes after a newer one is ignored
+
+        Returns:
+            Change events in the SheetsManager.add_listener format: one per
+            deleted, updated and added row, a single 'reload' if the rows
+            couldn't be matched up, or none for the first download
+        """
+        table = (list(df.columns), index_rows(df, key_column))
+        with self._lock:
+            if started < self._started.get(title, float('-inf')):
+                return []
+            self._started[title] = started
+            previous = self._tables.get(title)
+            self._tables[title] = table
+            if revision is None:
+                self.revisions.pop(title, None)
+            else:
+                self.revisions[title] = revision
+            self.downloads += 1
+        if previous is None:
+            return []
+
+        if previous[1] is None or table[1] is None or previous[0] != table[0]:
+            # Columns changed, or keys missing or duplicated: rows can't be matched up
+            return [{'action': 'reload', 'sheet': None, 'key': None, 'values': {}}]
+        changes = diff_rows(table[0], previous[1], table[1])
+        events = (
+            [{'action': 'delete', 'sheet': title, 'key': key, 'values': {}} for key in changes['deleted']]
+            + [{'action': 'update', 'sheet': title, 'key': key, 'values': values}
+               for key, values in changes['updated'].items()]
+            + [{'action': 'add', 'sheet': title, 'key': key, 'values': row} for key, row in changes['added'].items()]
+        )
+        with self._lock:
+            self.rows_changed += len(events)
+        return events
+
+    def forget(self):
+        """Drop every stored revision, so the next read of each sheet downloads it"""
+        with self._lock:
+            self.revisions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Revision checks, downloads avoided and rows changed, for display"""
+        with self._lock:
+            return {
+                'checks': self.checks,
+                'unchanged': self.unchanged,
+                'downloads': self.downloads,
+                'rows_changed': self.rows_changed,
+            }
@@ -0,0 +1,253 @@
+"""
+Fake gspread Backend
+An in-memory stand-in for a gspread Spreadsheet that counts API calls and
+can simulate network latency and the Sheets API 429 quota, so SheetsManager
+can be exercised (and its API-call cost measured) without a live sheet
+"""
+
+import contextlib
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Any, Iterator, Optional
+
+from src.request_scheduler import READ_OPERATIONS
+from src.storage import LocalSpreadsheet, LocalWorksheet, DEFAULT_DATA_DIR
+
+# Sheets API default: 60 read and 60 write requests per minute per user
+DEFAULT_QUOTA_WINDOW = 60.0
+
+
+def quota_error(message: str = 'Quota exceeded for quota metric', status: int = 429) -> Exception:
+    """
+    The exception gspread raises for an API error response
+
+    Returns a gspread APIError when gspread is installed, so callers that
+    catch it (and read .response.status_code) behave as they would against
+    Google. Without gspread, a FakeAPIError with the same attributes.
+    """
+    import requests
+
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({
+        'error': {'code': status, 'message': message, 'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'UNAVAILABLE'}
+    }).encode('utf-8')
+    try:
+        from gspread.exceptions import APIError
+        return APIError(response)
+    except ImportError:
+        return FakeAPIError(response)
+
+
+class FakeAPIError(Exception):
+    """Stand-in for gspread.exceptions.APIError when gspread is not installed"""
+
+    def __init__(self, response):
+        super().__init__(response.json()['error'])
+        self.response = response
+        self.code = response.status_code
+
+
+class FakeWorksheet:
+    """Wraps a LocalWorksheet; every gspread method call goes through the spreadsheet's meter"""
+
+    def __init__(self, spreadsheet: 'FakeSpreadsheet', worksheet: LocalWorksheet):
+        self.spreadsheet = spreadsheet
+        self._worksheet = worksheet
+        self.title = worksheet.title
+
+    @property
+    def row_count(self) -> int:
+        """Grid size; gspread keeps this from the worksheet metadata, so no API call"""
+        return self._worksheet.row_count
+
+    def _call(self, operation: str, *args, **kwargs):
+        self.spreadsheet._call(operation, self.title)
+        return getattr(self._worksheet, operation)(*args, **kwargs)
+
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        return self._call('get_all_records')
+
+    def get_all_values(self) -> List[List[str]]:
+        return self._call('get_all_values')
+
+    def update_cell(self, row: int, col: int, value: Any):
+        return self._call('update_cell', row, col, value)
+
+    def append_row(self, values: List[Any], value_input_option: str = 'RAW'):
+        return self._call('append_row', values, value_input_option)
+
+    def append_rows(self, values: List[List[Any]], value_input_option: str = 'RAW'):
+        return self._call('append_rows', values, value_input_option)
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None):
+        return self._call('delete_rows', start_index, end_index)
+
+    def delete_row(self, index: int):
+        return self._call('delete_row', index)
+
+
+class FakeSpreadsheet:
+    """
+    gspread Spreadsheet stand-in with call counting, latency and quota
+
+    Every method that is a request against the real API (worksheet(),
+    values_batch_get/update, and the worksheet reads and writes) is counted
+    in `calls` by operation and in `sheet_calls` by (operation, sheet). A
+    call sleeps `latency` (+/- `jitter`) seconds first. When a quota is set,
+    the call that would exceed it raises the same APIError (HTTP 429)
+    gspread raises; a rejected call is counted in `rejected`, not `calls`.
+
+    Usage:
+        fake = FakeSpreadsheet(latency=0.05, read_quota=60)
+        manager = SheetsManager(fake)
+        with fake.track() as calls:
+            manager.delete_pilot('P001')
+        assert sum(calls.values()) <= 1
+    """
+
+    def __init__(
+        self,
+        spreadsheet: Optional[LocalSpreadsheet] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        read_quota: Optional[int] = None,
+        write_quota: Optional[int] = None,
+        quota_window: float = DEFAULT_QUOTA_WINDOW,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            spreadsheet: Data to serve; defaults to a LocalSpreadsheet seeded
+                from the CSV files in data/
+            latency: Seconds added to every API call
+            jitter: Up to this many seconds added or removed at random
+            read_quota: Max read calls per quota_window (None = unlimited)
+            write_quota: Max write calls per quota_window (None = unlimited)
+            quota_window: Length of the quota window in seconds
+            seed: Seed for the latency jitter
+        """
+        self._spreadsheet = spreadsheet if spreadsheet is not None else LocalSpreadsheet(DEFAULT_DATA_DIR)
+        self.latency = latency
+        self.jitter = jitter
+        self.read_quota = read_quota
+        self.write_quota = write_quota
+        self.quota_window = quota_window
+        self._random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._recent: Dict[str, deque] = {'read': deque(), 'write': deque()}
+        self._failures: deque = deque()
+        self._trackers: List[Counter] = []
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+
+        self.calls: Counter = Counter()
+        self.sheet_calls: Counter = Counter()
+        self.rejected: Counter = Counter()
+
+    @property
+    def total_calls(self) -> int:
+        """API calls made so far (rejected calls not included)"""
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        """Zero every counter"""
+        with self._lock:
+            self.calls.clear()
+            self.sheet_calls.clear()
+            self.rejected.clear()
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator[Counter]:
+        """Count the calls made inside a with-block: {operation: calls}"""
+        counter: Counter = Counter()
+        with self._lock:
+            self._trackers.append(counter)
+        try:
+            yield counter
+        finally:
+            with self._lock:
+                self._trackers.remove(counter)
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """Make the next `count` calls fail with an HTTP `status` APIError"""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _check_quota(self, kind: str, now: float) -> bool:
+        """Record a call against its quota; False if the quota is used up (lock held)"""
+        limit = self.read_quota if kind == 'read' else self.write_quota
+        if limit is None:
+            return True
+        recent = self._recent[kind]
+        while recent and now - recent[0] >= self.quota_window:
+            recent.popleft()
+        if len(recent) >= limit:
+            return False
+        recent.append(now)
+        return True
+
+    def _call(self, operation: str, title: Optional[str] = None):
+        """Meter one API call: latency, injected failures, quota, then count it"""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        kind = 'read' if operation in READ_OPERATIONS else 'write'
+        with self._lock:
+            if self._failures:
+                status = self._failures.popleft()
+                self.rejected[operation] += 1
+                raise quota_error(f'Simulated error on {operation}', status)
+            if not self._check_quota(kind, time.monotonic()):
+                self.rejected[operation] += 1
+                raise quota_error(f"Quota exceeded for quota metric '{kind.capitalize()} requests' "
+                                  f"(simulated: {operation})")
+            self.calls[operation] += 1
+            self.sheet_calls[(operation, title)] += 1
+            for counter in self._trackers:
+                counter[operation] += 1
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        """Get a worksheet by title (one metadata request, as in gspread)"""
+        self._call('worksheet', title)
+        worksheet = self._worksheets.get(title)
+        if worksheet is None:
+            worksheet = FakeWorksheet(self, self._spreadsheet.worksheet(title))
+            self._worksheets[title] = worksheet
+        return worksheet
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        """Get all worksheets (one metadata request)"""
+        self._call('worksheets')
+        return [FakeWorksheet(self, ws) for ws in self._spreadsheet.worksheets()]
+
+    def get_lastUpdateTime(self) -> str:
+        """The spreadsheet's revision (one Drive API request in gspread)"""
+        self._call('get_lastUpdateTime')
+        return self._spreadsheet.get_lastUpdateTime()
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._call('values_batch_get')
+        return self._spreadsheet.values_batch_get(ranges, params)
+
+    def values_batch_update(self, body: Dict[str, Any]):
+        self._call('values_batch_update')
+        return self._spreadsheet.values_batch_update(body)
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts for display"""
+        with self._lock:
+            return {
+                'total_calls': sum(self.calls.values()),
+                'calls': dict(self.calls),
+                'rejected': dict(self.rejected),
+                'latency': self.latency,
+                'read_quota': self.read_quota,
+                'write_quota': self.write_quota,
+            }
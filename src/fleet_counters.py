@@ -0,0 +1,275 @@
+"""
+Fleet Counters
+Pilot and drone counts by status x location x skill/capability, kept up
+to date by SheetsManager writes so the sidebar needs no sheet reads
+"""
+
+import itertools
+import re
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+import pandas as pd
+
+ANY = '*'
+
+# Per table: ID column and the comma-separated column used as tags
+TABLES = {
+    'pilots': ('pilot_roster', 'pilot_id', 'skills'),
+    'drones': ('drone_fleet', 'drone_id', 'capabilities'),
+}
+SHEET_TABLES = {sheet: table for table, (sheet, _, _) in TABLES.items()}
+
+STATUSES = {
+    'pilots': ['Available', 'Assigned', 'On Leave'],
+    'drones': ['Available', 'Maintenance', 'Assigned'],
+}
+
+Key = Tuple[str, str, str, str]  # (table, status, location, tag), any part may be ANY
+Entry = Tuple[str, str, Tuple[str, ...]]  # (status, location, tags)
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def _tags(value: Any) -> Tuple[str, ...]:
+    return tuple(sorted({_norm(t) for t in str(value).split(',') if t.strip()}))
+
+
+def _keys(table: str, entry: Entry) -> List[Key]:
+    """Every counter key an entity contributes to, wildcards included"""
+    status, location, tags = entry
+    keys = []
+    for s, l in itertools.product((status, ANY), (location, ANY)):
+        keys.append((table, s, l, ANY))
+        keys.extend((table, s, l, tag) for tag in tags)
+    return keys
+
+
+class FleetCounters:
+    """
+    Materialized counts for pilots and drones
+
+    Every entity adds 1 to the key (table, status, location, tag) for each
+    of its tags, plus the wildcard versions of those keys, so any
+    combination of filters is one dict lookup. Seeding is vectorized;
+    after that each add, delete or status change adjusts a fixed number of
+    keys (4 per tag + 4), independent of fleet size.
+
+    Example:
+        counters.count('drones', status='Available', location='Mumbai', tag='Thermal')
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._entries: Dict[str, Dict[str, Entry]] = {table: {} for table in TABLES}
+        self._lock = threading.RLock()
+        self.seeded = False
+        self.seeded_at = 0.0
+
+    def seed(self, pilots: pd.DataFrame, drones: pd.DataFrame, missions: Optional[pd.DataFrame] = None):
+        """Count every pilot and drone from a snapshot (missions are ignored)"""
+        counts: Counter = Counter()
+        entries: Dict[str, Dict[str, Entry]] = {}
+        for table, df in (('pilots', pilots), ('drones', drones)):
+            _, id_column, tag_column = TABLES[table]
+            df = df.copy()
+            df.columns = df.columns.str.lower().str.strip()
+            frame = pd.DataFrame({
+                column: df[column].fillna('').astype(str).str.strip().str.lower() if column in df.columns else ''
+                for column in ('status', 'location', tag_column)
+            }, index=df.index)
+            ids = df[id_column].astype(str).str.strip() if id_column in df.columns else pd.Series('', index=df.index)
+
+            # Entity counts per (status, location), then fanned out to wildcards
+            for (status, location), n in frame.groupby(['status', 'location']).size().items():
+                for s, l in itertools.product((status, ANY), (location, ANY)):
+                    counts[(table, s, l, ANY)] += int(n)
+
+            # Tag counts: one row per (entity, tag)
+            tags = frame[tag_column].str.split(',').explode().str.strip()
+            tagged = frame[['status', 'location']].loc[tags.index].assign(tag=tags.to_numpy())
+            # reset_index keeps the entity row, so only repeats within one entity are dropped
+            tagged = tagged[tagged['tag'] != ''].reset_index().drop_duplicates()
+            for (status, location, tag), n in tagged.groupby(['status', 'location', 'tag']).size().items():
+                for s, l in itertools.product((status, ANY), (location, ANY)):
+                    counts[(table, s, l, tag)] += int(n)
+
+            entries[table] = {
+                entity_id: (status, location, _tags(tag_value))
+                for entity_id, status, location, tag_value
+                in zip(ids, frame['status'], frame['location'], frame[tag_column])
+            }
+
+        with self._lock:
+            self._counts = counts
+            self._entries = entries
+            self.seeded = True
+            self.seeded_at = time.monotonic()
+
+    def _add(self, table: str, entry: Entry, sign: int):
+        for key in _keys(table, entry):
+            self._counts[key] += sign
+            if self._counts[key] <= 0:
+                del self._counts[key]
+
+    def apply(self, event: Dict[str, Any]):
+        """
+        Adjust the counts from a SheetsManager change event
+
+        Args:
+            event: Dict with action, sheet, key and values (see SheetsManager.add_listener)
+        """
+        with self._lock:
+            if event['action'] == 'reload':
+                self.seeded = False
+                return
+            table = SHEET_TABLES.get(event['sheet'])
+            if table is None or not self.seeded:
+                return
+            _, _, tag_column = TABLES[table]
+            key, values = event['key'], event['values']
+            entries = self._entries[table]
+            old = entries.get(key)
+
+            if event['action'] == 'delete':
+                if old is not None:
+                    self._add(table, old, -1)
+                    del entries[key]
+                return
+
+            if event['action'] == 'update':
+                if old is None:
+                    return
+                status, location, tags = old
+                new = (
+                    _norm(values['status']) if 'status' in values else status,
+                    _norm(values['location']) if 'location' in values else location,
+                    _tags(values[tag_column]) if tag_column in values else tags,
+                )
+            else:  # add
+                new = (_norm(values.get('status', '')), _norm(values.get('location', '')),
+                       _tags(values.get(tag_column, '')))
+
+            if new == old:
+                return  # e.g. an assignment change: nothing counted here moved
+            if old is not None:
+                self._add(table, old, -1)
+            self._add(table, new, 1)
+            entries[key] = new
+
+    def count(self, table: str, status: Optional[str] = None, location: Optional[str] = None,
+              tag: Optional[str] = None) -> int:
+        """
+        Count pilots or drones matching the given filters (None = any)
+
+        Args:
+            table: 'pilots' or 'drones'
+            status: e.g. 'Available'
+            location: e.g. 'Mumbai'
+            tag: A skill (pilots) or capability (drones), e.g. 'Thermal'
+        """
+        key = (
+            table,
+            _norm(status) if status else ANY,
+            _norm(location) if location else ANY,
+            _norm(tag) if tag else ANY,
+        )
+        with self._lock:
+            return self._counts.get(key, 0)
+
+    def values(self, table: str, part: str) -> List[str]:
+        """Distinct statuses, locations or tags currently counted ('status', 'location' or 'tag')"""
+        position = {'status': 1, 'location': 2, 'tag': 3}[part]
+        with self._lock:
+            return sorted({key[position] for key in self._counts if key[0] == table and key[position] != ANY})
+
+    def pilot_summary(self) -> Dict[str, int]:
+        """Sidebar pilot counts"""
+        return {
+            'total': self.count('pilots'),
+            'available': self.count('pilots', 'Available'),
+            'assigned': self.count('pilots', 'Assigned'),
+            'on_leave': self.count('pilots', 'On Leave'),
+        }
+
+    def drone_summary(self) -> Dict[str, int]:
+        """Sidebar drone counts"""
+        return {
+            'total': self.count('drones'),
+            'available': self.count('drones', 'Available'),
+            'maintenance': self.count('drones', 'Maintenance'),
+            'assigned': self.count('drones', 'Assigned'),
+        }
+
+    def breakdown(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer a count question such as "available thermal drones in Mumbai"
+
+        Returns:
+            Dict with table, status, location, tag (None where not given)
+            and count; None if the query names neither pilots nor drones
+        """
+        text = ' ' + re.sub(r'[^a-z0-9 ]+', ' ', query.lower()) + ' '
+        if re.search(r'\bdrones?\b', text):
+            table = 'drones'
+        elif re.search(r'\bpilots?\b', text):
+            table = 'pilots'
+        else:
+            return None
+
+        def find(options):
+            for option in sorted(options, key=len, reverse=True):
+                if f' {option} ' in text:
+                    return option
+            return None
+
+        status = find([_norm(s) for s in STATUSES[table]])
+        if status is None and re.search(r'\b(free|idle)\b', text):
+            status = 'available'
+        location = find(self.values(table, 'location'))
+        tag = find(self.values(table, 'tag'))
+        return {
+            'table': table,
+            'status': status,
+            'location': location,
+            'tag': tag,
+            'count': self.count(table, status, location, tag),
+        }
+
+
+# Keyed by the manager itself, so the counts go away with their manager
+_counters: "weakref.WeakKeyDictionary[Any, FleetCounters]" = weakref.WeakKeyDictionary()
+_counters_lock = threading.Lock()
+
+
+def get_fleet_counters(sheets_manager, max_age: Optional[float] = None) -> FleetCounters:
+    """
+    Get the FleetCounters attached to a SheetsManager, seeding it if needed
+
+    Writes through the manager keep the counts current. They are re-seeded
+    from a snapshot after a reload event, or once they are older than
+    max_age seconds (default: the manager's cache TTL) so that edits made
+    directly in the sheet still show up. With delta sync on, stale counts
+    are brought up to date by sheets_manager.sync() instead, which only
+    downloads changed sheets and applies their row changes as events.
+    """
+    with _counters_lock:
+        counters = _counters.get(sheets_manager)
+        if counters is None:
+            counters = FleetCounters()
+            sheets_manager.add_listener(counters.apply)
+            _counters[sheets_manager] = counters
+    if max_age is None:
+        max_age = sheets_manager.cache_ttl
+    stale = counters.seeded and time.monotonic() - counters.seeded_at >= max_age
+    if stale and getattr(sheets_manager, 'delta_sync', None) is not None:
+        sheets_manager.sync()  # row changes reach the counts through counters.apply
+        counters.seeded_at = time.monotonic()
+        stale = False
+    if not counters.seeded or stale:
+        counters.seed(*sheets_manager.get_snapshot())
+    return counters
@@ -0,0 +1,207 @@
+"""
+LLM Response Cache
+Remembers AI answers per question and data snapshot, so repeated
+questions are answered without calling the LLM API again
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import pandas as pd
+
+from src.config import get_setting, get_float_setting
+from src.metrics import get_metrics
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case a query and collapse whitespace and trailing punctuation"""
+    query = re.sub(r'\s+', ' ', query.strip().lower())
+    return query.rstrip('?!. ')
+
+
+def data_hash(*frames: pd.DataFrame) -> str:
+    """
+    Content hash of one or more DataFrames
+
+    Hashes values and column names, so any edited cell, added row or
+    renamed column gives a different hash.
+    """
+    digest = hashlib.sha256()
+    for df in frames:
+        digest.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU cache of LLM responses, optionally persisted to SQLite
+
+    Entries are keyed on sha256(model, normalized query, data hash). When a
+    lookup arrives with a new data hash, entries made for older data can
+    never be hit again and are dropped, from memory and from disk.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Max responses kept; defaults to the LLM_CACHE_SIZE
+                setting (256). 0 disables the cache.
+            path: SQLite file for persistence; defaults to the LLM_CACHE_PATH
+                setting. Empty keeps the cache in memory only.
+        """
+        if max_entries is None:
+            max_entries = int(get_float_setting('LLM_CACHE_SIZE', 256))
+        if path is None:
+            path = get_setting('LLM_CACHE_PATH', '')
+
+        self.max_entries = max(int(max_entries), 0)
+        self.path = path or None
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (data_hash, response)
+        self._data_hash: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # The connection is shared by every session's thread; one write at a time
+        self._db = None
+        self._db_lock = threading.Lock()
+        if self.path and self.max_entries:
+            self._open_db()
+
+    def _open_db(self):
+        """Open the SQLite file and load the most recently used entries"""
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, data_hash TEXT, response TEXT, last_used REAL)'
+            )
+            self._db.commit()
+            rows = self._db.execute(
+                'SELECT key, data_hash, response FROM responses ORDER BY last_used DESC LIMIT ?',
+                (self.max_entries,)
+            ).fetchall()
+            for key, entry_hash, response in reversed(rows):
+                self._entries[key] = (entry_hash, response)
+        except sqlite3.Error as e:
+            print(f"Error opening LLM cache at {self.path}: {e}")
+            self._db = None
+
+    def _persist(self, sql: str, params: tuple = ()):
+        """Run a write against the SQLite file; failures only disable persistence"""
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(sql, params)
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing LLM cache: {e}")
+
+    @staticmethod
+    def make_key(query: str, snapshot_hash: str, model: str = '') -> str:
+        """Cache key for a query against a data snapshot"""
+        raw = '\x1f'.join((model, normalize_query(query), snapshot_hash))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _check_data(self, snapshot_hash: str):
+        """Drop entries made for older data (called with the lock held)"""
+        if snapshot_hash == self._data_hash:
+            return
+        self._data_hash = snapshot_hash
+        stale = [key for key, (entry_hash, _) in self._entries.items() if entry_hash != snapshot_hash]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        self._persist('DELETE FROM responses WHERE data_hash != ?', (snapshot_hash,))
+
+    def get(self, query: str, snapshot_hash: str, model: str = '') -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            query: The user's question
+            snapshot_hash: data_hash() of the data used in the prompt
+            model: LLM model name
+
+        Returns:
+            The cached response, or None
+        """
+        if not self.max_entries:
+            return None
+        key = self.make_key(query, snapshot_hash, model)
+        with self._lock:
+            self._check_data(snapshot_hash)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        get_metrics().inc('llm_cache', result='hit' if entry is not None else 'miss')
+        if entry is None:
+            return None
+        self._persist('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+        return entry[1]
+
+    def put(self, query: str, snapshot_hash: str, response: str, model: str = ''):
+        """Store a response, evicting the least recently used ones beyond max_entries"""
+        if not self.max_entries:
+            return
+        key = self.make_key(query, snapshot_hash, model)
+        with self._lock:
+            self._check_data(snapshot_hash)
+            self._entries[key] = (snapshot_hash, response)
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self.evictions += len(evicted)
+        self._persist(
+            'INSERT OR REPLACE INTO responses (key, data_hash, response, last_used) VALUES (?, ?, ?, ?)',
+            (key, snapshot_hash, response, time.time())
+        )
+        for old_key in evicted:
+            self._persist('DELETE FROM responses WHERE key = ?', (old_key,))
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+        self._persist('DELETE FROM responses')
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'persistent': self._db is not None,
+            }
+
+
+# Singleton instance
+_response_cache_instance = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create ResponseCache singleton instance"""
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        _response_cache_instance = ResponseCache()
+    return _response_cache_instance
@@ -0,0 +1,212 @@
+"""
+LLM Client
+Calls the Groq (OpenAI-compatible) chat completions API over a pooled
+keep-alive session, with timeouts, retries and token streaming
+"""
+
+import json
+import random
+import time
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import get_setting, get_float_setting
+from src.metrics import get_metrics, count_session_bytes
+
+DEFAULT_BASE_URL = 'https://api.groq.com/openai/v1'
+DEFAULT_MODEL = 'llama-3.1-8b-instant'
+
+# Responses worth retrying: rate limited or a temporary server problem
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Keep-alive connections kept per host (Streamlit serves sessions on threads)
+POOL_SIZE = 10
+
+
+class LLMError(Exception):
+    """Raised when the LLM API call fails after all retries"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GroqClient:
+    """
+    Chat completions client with one reusable HTTP session
+
+    The session keeps TLS connections open between queries, so only the
+    first call pays for the handshake. Every request has a connect and a
+    read timeout. Connection errors, timeouts, 429 and 5xx responses are
+    retried up to max_retries times with jittered exponential backoff
+    (a Retry-After header is honoured when present).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff: float = 0.5
+    ):
+        """
+        Args:
+            api_key: Groq API key
+            base_url: API root; defaults to the GROQ_BASE_URL setting, then Groq
+            model: Model name sent with each request
+            connect_timeout: Seconds to wait for a connection (LLM_CONNECT_TIMEOUT, default 5)
+            read_timeout: Seconds to wait between bytes of the response (LLM_READ_TIMEOUT, default 30)
+            max_retries: Retries after the first attempt (LLM_MAX_RETRIES, default 2)
+            backoff: Base delay in seconds; doubles on each retry
+        """
+        self.base_url = (base_url or get_setting('GROQ_BASE_URL', DEFAULT_BASE_URL)).rstrip('/')
+        self.model = model
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else get_float_setting('LLM_CONNECT_TIMEOUT', 5.0),
+            read_timeout if read_timeout is not None else get_float_setting('LLM_READ_TIMEOUT', 30.0),
+        )
+        self.max_retries = int(max_retries if max_retries is not None else get_float_setting('LLM_MAX_RETRIES', 2))
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        })
+        count_session_bytes(self.session, 'llm')
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    def _delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            try:
+                if retry_after is not None:
+                    return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _post(self, payload: Dict, stream: bool = False) -> requests.Response:
+        """POST with retries; returns a 200 response or raises LLMError"""
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout, stream=stream)
+                if response.status_code == 200:
+                    return response
+                last_error = LLMError(f"{response.status_code} - {response.text[:200]}", response.status_code)
+                # Give the connection back to the pool either way (headers stay readable for _delay)
+                response.close()
+                if response.status_code not in RETRY_STATUSES:
+                    raise last_error
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = LLMError(f"{type(e).__name__}: {e}")
+            if attempt < self.max_retries:
+                get_metrics().inc('llm_retries')
+                time.sleep(self._delay(attempt, response))
+        raise last_error
+
+    def _payload(self, messages: List[Dict[str, str]], max_tokens: int, stream: bool) -> Dict:
+        return {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'stream': stream,
+        }
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 500) -> str:
+        """
+        Get a complete chat response
+
+        Args:
+            messages: OpenAI-style [{'role': ..., 'content': ...}]
+            max_tokens: Max tokens to generate
+
+        Returns:
+            The assistant message text
+        """
+        metrics = get_metrics()
+        try:
+            with metrics.span('llm_request', mode='chat'):
+                response = self._post(self._payload(messages, max_tokens, stream=False))
+                try:
+                    content = response.json()['choices'][0]['message']['content']
+                except (ValueError, KeyError, IndexError) as e:
+                    raise LLMError(f"Unexpected response: {e}")
+        except LLMError:
+            metrics.inc('llm_calls', mode='chat', outcome='error')
+            raise
+        metrics.inc('llm_calls', mode='chat', outcome='ok')
+        return content
+
+    def stream_chat(self, messages: List[Dict[str, str]], max_tokens: int = 500) -> Iterator[str]:
+        """
+        Stream a chat response as it is generated
+
+        Retries only happen before the first token; once text has been
+        yielded, a failure is raised to the caller.
+
+        Yields:
+            Pieces of the assistant message text
+        """
+        # Timed by hand: a span must not stay open across yields to the caller
+        metrics = get_metrics()
+        started = time.perf_counter()
+        first_token = None
+        outcome = 'error'
+        received = 0
+        try:
+            response = self._post(self._payload(messages, max_tokens, stream=True), stream=True)
+        except LLMError:
+            metrics.inc('llm_calls', mode='stream', outcome='error')
+            raise
+        # text/event-stream often has no charset, and requests would assume Latin-1
+        response.encoding = 'utf-8'
+        try:
+            # Server-sent events: 'data: {json}' lines, ending with 'data: [DONE]'
+            for line in response.iter_lines(decode_unicode=True):
+                received += len(line.encode('utf-8')) + 1 if line else 1
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    outcome = 'ok'
+                    break
+                try:
+                    delta = json.loads(data)['choices'][0].get('delta', {})
+                except (ValueError, KeyError, IndexError):
+                    continue
+                if delta.get('content'):
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                        metrics.observe('llm_first_token', first_token)
+                    yield delta['content']
+            else:
+                outcome = 'ok'  # stream ended without [DONE]
+        except GeneratorExit:
+            outcome = 'cancelled'  # the caller stopped reading
+            raise
+        except requests.RequestException as e:
+            raise LLMError(f"Stream interrupted: {e}")
+        finally:
+            response.close()
+            metrics.observe('llm_request', time.perf_counter() - started, mode='stream', outcome=outcome)
+            metrics.inc('llm_calls', mode='stream', outcome=outcome)
+            metrics.inc('llm_bytes_received', received)
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -0,0 +1,239 @@
+"""
+LLM Context Builder
+Picks the pilot, drone and mission rows relevant to a query and renders
+them compactly within a token budget, instead of sending whole tables
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+
+from src.config import get_float_setting
+
+# Rough size of a token for English text and IDs
+CHARS_PER_TOKEN = 4
+
+# Columns searched by the inverted index, per table
+INDEXED_COLUMNS = {
+    'pilots': ['pilot_id', 'name', 'location', 'status', 'skills', 'certifications', 'current_assignment'],
+    'drones': ['drone_id', 'model', 'location', 'status', 'capabilities', 'current_assignment'],
+    'missions': ['project_id', 'client', 'location', 'priority', 'required_skills', 'required_certs'],
+}
+
+# Query words that point at a whole table
+TABLE_WORDS = {
+    'pilots': {'pilot', 'pilots', 'crew'},
+    'drones': {'drone', 'drones', 'fleet', 'aircraft'},
+    'missions': {'mission', 'missions', 'project', 'projects', 'client', 'clients'},
+}
+
+# A row named by its ID outranks rows that only share words with the query
+ID_WEIGHT = 10
+
+# Values listed per aggregate (e.g. the 10 busiest locations)
+AGGREGATE_TOP = 10
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a string"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _words(value: Any) -> List[str]:
+    return WORD_PATTERN.findall(str(value).lower())
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.str.lower().str.strip()
+    return df.reset_index(drop=True)
+
+
+class ContextBuilder:
+    """
+    Builds the data section of the LLM prompt
+
+    An inverted index maps each word in the indexed columns (IDs, names,
+    locations, statuses, skills, ...) to the rows containing it. A query is
+    scored against the index and the best rows are rendered as compact
+    pipe-separated lines until the token budget is used up. Fleet-wide
+    aggregates (counts by status, location and priority) are always
+    included, so the model still sees the overall picture when rows are
+    left out. If every row fits in the budget, everything is sent.
+    """
+
+    def __init__(self, pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame,
+                 token_budget: Optional[int] = None):
+        """
+        Args:
+            pilots: Pilot roster
+            drones: Drone fleet
+            missions: Missions
+            token_budget: Max tokens for the data section; defaults to the
+                LLM_CONTEXT_TOKENS setting (1500)
+        """
+        self.tables = {
+            'pilots': _normalize(pilots),
+            'drones': _normalize(drones),
+            'missions': _normalize(missions),
+        }
+        self.token_budget = int(token_budget or get_float_setting('LLM_CONTEXT_TOKENS', 1500))
+        self.last_stats: Dict[str, int] = {}
+
+        # word -> [(table, column, code)]: the index is over distinct cell
+        # values, and a value's rows are found with one vectorized compare
+        self._index: Dict[str, List[Tuple[str, str, int]]] = {}
+        self._codes: Dict[Tuple[str, str], np.ndarray] = {}
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._values: Dict[str, np.ndarray] = {}
+        self._build_index()
+
+    def _build_index(self):
+        """Index every word of every distinct searchable value"""
+        for table, df in self.tables.items():
+            columns = [c for c in INDEXED_COLUMNS[table] if c in df.columns]
+            for column in columns:
+                codes, uniques = pd.factorize(df[column].fillna('').astype(str))
+                self._codes[(table, column)] = codes
+                for code, value in enumerate(uniques):
+                    for word in set(_words(value)):
+                        self._index.setdefault(word, []).append((table, column, code))
+
+            id_column = INDEXED_COLUMNS[table][0]
+            if id_column in df.columns:
+                self._ids[table] = {str(v).strip().lower(): i for i, v in enumerate(df[id_column])}
+
+            # Rows are rendered on demand from this array
+            self._values[table] = df.fillna('').astype(str).to_numpy()
+
+    def _line(self, table: str, position: int) -> str:
+        """One row as values joined with '|' (column names go in the table header)"""
+        return '|'.join(self._values[table][position])
+
+    def _score(self, query: str) -> Dict[str, np.ndarray]:
+        """Score every row by the query words it matches; {table: scores}"""
+        scores = {table: np.zeros(len(df), dtype=np.int64) for table, df in self.tables.items()}
+        words = set(_words(query))
+        for word in words:
+            matched = {table: np.zeros(len(df), dtype=bool) for table, df in self.tables.items()}
+            for table, column, code in self._index.get(word, ()):
+                matched[table] |= self._codes[(table, column)] == code
+            for table, mask in matched.items():
+                weight = ID_WEIGHT if word in self._ids.get(table, {}) else 1
+                scores[table] += mask * weight
+
+        # A table named in the query ("which drones ...") gets a small boost
+        for table, table_words in TABLE_WORDS.items():
+            if words & table_words:
+                scores[table] += 1
+
+        # Pull in the missions that matched pilots and drones are assigned to
+        missions = self._ids.get('missions', {})
+        for table in ('pilots', 'drones'):
+            df = self.tables[table]
+            if 'current_assignment' not in df.columns or not missions:
+                continue
+            matched = np.flatnonzero(scores[table] > 0)
+            best = {}
+            for assignment, score in zip(df['current_assignment'].to_numpy()[matched], scores[table][matched]):
+                for project_id in _words(assignment):
+                    if project_id in missions:
+                        best[project_id] = max(best.get(project_id, 0), score - 1, 1)
+            for project_id, score in best.items():
+                position = missions[project_id]
+                scores['missions'][position] = max(scores['missions'][position], score)
+        return scores
+
+    def aggregates(self) -> str:
+        """Fleet-wide counts, always small regardless of fleet size"""
+        lines = []
+        for table, df in self.tables.items():
+            parts = [f"{len(df)} total"]
+            for column in ('status', 'location', 'priority'):
+                if column in df.columns and len(df):
+                    counts = df[column].fillna('').astype(str).value_counts()
+                    shown = ', '.join(f"{k} {v}" for k, v in counts.head(AGGREGATE_TOP).items())
+                    if len(counts) > AGGREGATE_TOP:
+                        shown += f", {len(counts) - AGGREGATE_TOP} more"
+                    parts.append(f"by {column}: {shown}")
+            lines.append(f"- {table.capitalize()}: " + '; '.join(parts))
+        return '\n'.join(lines)
+
+    def _render(self, rows: List[Tuple[str, int]]) -> str:
+        """Render rows grouped by table, with a header line per table"""
+        sections = []
+        for table in self.tables:
+            positions = sorted(p for t, p in rows if t == table)
+            if not positions:
+                continue
+            header = '|'.join(self.tables[table].columns)
+            body = '\n'.join(self._line(table, p) for p in positions)
+            sections.append(f"{table.capitalize()} ({header}):\n{body}")
+        return '\n\n'.join(sections)
+
+    def build(self, query: str) -> str:
+        """
+        Build the data section for a query
+
+        Args:
+            query: The user's question
+
+        Returns:
+            Aggregates plus the most relevant rows, within the token budget
+        """
+        summary = "Fleet summary:\n" + self.aggregates()
+        budget = self.token_budget - estimate_tokens(summary)
+
+        # Small fleets: send everything
+        full_chars = sum(
+            int(np.char.str_len(values.astype(str)).sum()) + values.size
+            for values in self._values.values()
+        )
+        if full_chars // CHARS_PER_TOKEN <= budget:
+            all_rows = [(t, p) for t in self.tables for p in range(len(self.tables[t]))]
+            everything = self._render(all_rows)
+            if estimate_tokens(everything) <= budget:
+                self.last_stats = {'rows_matched': len(all_rows), 'rows_included': len(all_rows),
+                                   'tokens': estimate_tokens(summary) + estimate_tokens(everything)}
+                return f"{summary}\n\n{everything}"
+
+        # Rank matching rows: highest score first, then table and row order
+        scores = self._score(query)
+        table_order = {table: i for i, table in enumerate(self.tables)}
+        candidates = [
+            (-int(score), table_order[table], int(position), table)
+            for table, table_scores in scores.items()
+            for position, score in zip(np.flatnonzero(table_scores), table_scores[table_scores > 0])
+        ]
+        candidates.sort()
+        ranked = [(table, position) for _, _, position, table in candidates]
+
+        # Greedily add rows while the rendered text fits
+        included: List[Tuple[str, int]] = []
+        used = 0
+        headers_seen: Set[str] = set()
+        for table, position in ranked:
+            cost = estimate_tokens(self._line(table, position)) + 1
+            if table not in headers_seen:
+                cost += estimate_tokens('|'.join(self.tables[table].columns)) + 4
+            if used + cost > budget:
+                break
+            included.append((table, position))
+            headers_seen.add(table)
+            used += cost
+
+        omitted = len(ranked) - len(included)
+        text = summary
+        if included:
+            text += "\n\nRelevant rows:\n" + self._render(included)
+        if omitted:
+            text += f"\n\n({omitted} more matching row(s) omitted; use the summary counts for them)"
+        elif not included:
+            text += "\n\n(No rows matched the query; answer from the summary counts)"
+
+        self.last_stats = {'rows_matched': len(ranked), 'rows_included': len(included),
+                           'tokens': estimate_tokens(text)}
+        return text
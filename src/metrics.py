@@ -0,0 +1,397 @@
+"""
+Metrics
+Latency spans, counters and a Prometheus text export for queries, sheet
+reads/writes and LLM calls
+"""
+
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+from src.config import get_setting
+
+PREFIX = 'skylark'
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Recent durations kept per series for the percentiles in the UI panel
+SAMPLES_PER_SERIES = 200
+
+# Finished top-level spans kept for the UI panel, and children kept per span
+RECENT_TRACES = 20
+MAX_CHILDREN = 50
+
+METRIC_HELP = {
+    'query_seconds': 'process_query latency by detected intent',
+    'sheets_method_seconds': 'SheetsManager public method latency',
+    'sheets_api_seconds': 'Latency of individual spreadsheet API calls',
+    'sheets_api_calls_total': 'Spreadsheet API calls by operation and outcome',
+    'sheets_cache_total': 'Sheet read cache lookups by result (revalidated: expired but unchanged; stale: from the snapshot while offline)',
+    'sheets_sync_total': 'Delta sync outcomes: expired sheets kept unchanged, or downloads that found changes',
+    'sheets_sync_rows_total': 'Rows changed outside the app, found by delta sync',
+    'sheets_bytes_received_total': 'Bytes received from the Sheets API',
+    'sheets_bytes_sent_total': 'Bytes sent to the Sheets API',
+    'conflicts_seconds': 'Conflict detection and assignment solving latency',
+    'llm_context_seconds': 'Building the data section of the LLM prompt',
+    'llm_request_seconds': 'LLM API call latency (streams: until the last token)',
+    'llm_first_token_seconds': 'Time until the first streamed LLM token',
+    'llm_calls_total': 'LLM API calls by mode and outcome',
+    'llm_retries_total': 'LLM API requests retried after a timeout, 429 or 5xx',
+    'llm_bytes_received_total': 'Bytes received from the LLM API',
+    'llm_bytes_sent_total': 'Bytes sent to the LLM API',
+    'llm_cache_total': 'AI response cache lookups by result',
+    'sheets_queue_wait_seconds': 'Time Sheets API calls waited for quota',
+    'sheets_queue_depth': 'Sheets API calls waiting for quota or a retry',
+    'sheets_api_retries_total': 'Sheets API calls retried after a 429, 5xx or connection error',
+    'sheets_coalesced_reads_total': 'Sheet reads answered by an identical read already in flight',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+class Span:
+    """One timed operation; nested spans become its children"""
+
+    __slots__ = ('metric', 'labels', 'started', 'duration', 'children', 'parent', 'clock')
+
+    def __init__(self, metric: str, labels: Dict[str, Any], parent: Optional['Span'] = None):
+        self.metric = metric
+        self.labels = labels
+        self.started = time.time()
+        self.duration = 0.0
+        self.children: List['Span'] = []
+        self.parent = parent
+        self.clock = time.perf_counter()
+
+    @property
+    def name(self) -> str:
+        shown = ','.join(f"{k}={v}" for k, v in self.labels.items() if k != 'outcome')
+        return f"{self.metric}[{shown}]" if shown else self.metric
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'metric': self.metric,
+            'name': self.name,
+            'ms': round(self.duration * 1000, 3),
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'count', 'total', 'samples')
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque = deque(maxlen=SAMPLES_PER_SERIES)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class Metrics:
+    """
+    Thread-safe registry of latency histograms, counters and gauges
+
+    span() times a block and records it in the '<metric>_seconds'
+    histogram; spans opened inside another span on the same thread are
+    kept as its children, so a finished query carries a breakdown of where
+    its time went (sheet reads, conflict checks, the LLM call). Work handed
+    to another thread joins the span with attach(). inc() adds
+    to the '<metric>_total' counter and set_gauge() sets a current value.
+    to_prometheus() renders everything in the Prometheus text exposition
+    format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._local = threading.local()
+        self.recent: deque = deque(maxlen=RECENT_TRACES)
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def observe(self, metric: str, seconds: float, **labels):
+        """Record a duration in the '<metric>_seconds' histogram"""
+        name = f"{metric}_seconds"
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, metric: str, amount: float = 1, **labels):
+        """Add to the '<metric>_total' counter"""
+        name = f"{metric}_total"
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, metric: str, value: float, **labels):
+        """Set the current value of the '<metric>' gauge"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(metric, {})[key] = value
+
+    @contextlib.contextmanager
+    def span(self, metric: str, **labels) -> Iterator[Span]:
+        """
+        Time a block as '<metric>_seconds'
+
+        The span is recorded with outcome="ok", or outcome="error" if an
+        exception leaves the block (the exception is re-raised). Labels can
+        be added while the block runs with tag().
+        """
+        span = self.start_span(metric, **labels)
+        try:
+            with self.attach(span):
+                yield span
+        except BaseException:
+            self.end_span(span, error=True)
+            raise
+        self.end_span(span)
+
+    def current_span(self) -> Optional[Span]:
+        """The innermost open span on this thread, or None"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start_span(self, metric: str, **labels) -> Span:
+        """
+        Open a span to be finished later with end_span(), for work that
+        outlives one block (e.g. a streamed response). It is a child of the
+        current span; spans opened inside attach(span) become its children.
+        """
+        return Span(metric, labels, self.current_span())
+
+    def end_span(self, span: Span, error: bool = False):
+        """Finish a span from start_span() and record it"""
+        span.duration = time.perf_counter() - span.clock
+        span.labels['outcome'] = 'error' if error else span.labels.get('outcome', 'ok')
+        self.observe(span.metric, span.duration, **span.labels)
+        if span.parent is not None:
+            if len(span.parent.children) < MAX_CHILDREN:
+                span.parent.children.append(span)
+        else:
+            with self._lock:
+                self.recent.append(span)
+
+    @contextlib.contextmanager
+    def attach(self, span: Optional[Span]) -> Iterator[None]:
+        """
+        Make spans opened in the block children of `span`, which may have
+        been opened on another thread (pass current_span() to a pool
+        worker); no-op if span is None
+        """
+        if span is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def tag(self, **labels):
+        """Add labels to the innermost open span on this thread (no-op outside a span)"""
+        stack = self._stack()
+        if stack:
+            stack[-1].labels.update(labels)
+
+    def counter_value(self, metric: str, **labels) -> float:
+        """Sum of a counter over every series matching the given labels"""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(
+                value for key, value in self._counters.get(f"{metric}_total", {}).items()
+                if wanted <= set(key)
+            )
+
+    def summary(self, metric: str) -> List[Dict[str, Any]]:
+        """Per-series count, mean, p50 and p95 (from recent samples) of a histogram"""
+        rows = []
+        with self._lock:
+            for key, histogram in self._histograms.get(f"{metric}_seconds", {}).items():
+                samples = sorted(histogram.samples)
+                rows.append({
+                    **dict(key),
+                    'count': histogram.count,
+                    'mean_ms': histogram.total / histogram.count * 1000,
+                    'p50_ms': samples[len(samples) // 2] * 1000,
+                    'p95_ms': samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000,
+                })
+        return sorted(rows, key=lambda row: -row['count'])
+
+    def traces(self, metric: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent top-level spans (optionally only one metric) with their children, newest first"""
+        with self._lock:
+            return [span.to_dict() for span in reversed(self.recent) if metric is None or span.metric == metric]
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                full = f"{PREFIX}_{name}"
+                lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    # Bucket counts are already cumulative (see _Histogram.observe)
+                    for bound, count in zip(BUCKETS, histogram.buckets):
+                        lines.append(f"{full}_bucket{_format_labels(key, ('le', repr(bound)))} {count}")
+                    lines.append(f"{full}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {histogram.total:.6f}")
+                    lines.append(f"{full}_count{_format_labels(key)} {histogram.count}")
+            for name in sorted(self._counters):
+                full = f"{PREFIX}_{name}"
+                lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+            for name in sorted(self._gauges):
+                full = f"{PREFIX}_{name}"
+                lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} gauge")
+                for key, value in sorted(self._gauges[name].items()):
+                    lines.append(f"{full}{_format_labels(key)} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Write the Prometheus text to a file (atomically, for node_exporter's textfile collector)"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def reset(self):
+        """Drop every recorded value"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self.recent.clear()
+
+
+def traced(metric: str, **labels) -> Callable:
+    """Decorator: time every call of a function as a span labelled method=<function name>"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics().span(metric, method=func.__name__, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_session_bytes(session, metric: str):
+    """
+    Count the bytes a requests Session sends and receives
+
+    Adds a response hook, so every request made through the session adds
+    its body size to '<metric>_bytes_sent_total' and the response body size
+    to '<metric>_bytes_received_total'.
+
+    Streamed responses are not read here; their caller counts what it
+    consumes.
+    """
+    if getattr(session, '_metrics_counted', False):
+        return
+
+    def hook(response, *args, **kwargs):
+        metrics = get_metrics()
+        body = response.request.body if response.request is not None else None
+        if body:
+            metrics.inc(f"{metric}_bytes_sent", len(body))
+        if not kwargs.get('stream'):
+            metrics.inc(f"{metric}_bytes_received", len(response.content))
+        return response
+
+    session.hooks['response'].append(hook)
+    session._metrics_counted = True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') not in ('', '/metrics'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = get_metrics().to_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve GET /metrics on a background thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-server').start()
+    return server
+
+
+def export_metrics():
+    """Write the METRICS_FILE setting's file, if configured"""
+    path = get_setting('METRICS_FILE', '')
+    if not path:
+        return
+    try:
+        get_metrics().write_prometheus(path)
+    except OSError as e:
+        print(f"Error writing metrics to {path}: {e}")
+
+
+# Singleton instance
+_metrics_instance = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Get or create Metrics singleton instance"""
+    global _metrics_instance
+    if _metrics_instance is None:
+        with _metrics_lock:
+            if _metrics_instance is None:
+                _metrics_instance = Metrics()
+    return _metrics_instance
@@ -0,0 +1,158 @@
+"""
+Result Rendering
+Structured table results for list queries, shown with st.dataframe and
+turned into markdown in one vectorized pass
+"""
+
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+from src.config import get_float_setting
+
+# Columns shown per result kind, with their display labels
+DISPLAY_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    'pilots': [
+        ('pilot_id', 'ID'), ('name', 'Name'), ('skills', 'Skills'),
+        ('certifications', 'Certifications'), ('location', 'Location'), ('status', 'Status'),
+        ('current_assignment', 'Current Assignment'), ('available_from', 'Available From'),
+    ],
+    'drones': [
+        ('drone_id', 'ID'), ('model', 'Model'), ('capabilities', 'Capabilities'),
+        ('location', 'Location'), ('status', 'Status'),
+        ('current_assignment', 'Current Assignment'), ('maintenance_due', 'Maintenance Due'),
+    ],
+    'missions': [
+        ('project_id', 'ID'), ('client', 'Client'), ('location', 'Location'),
+        ('required_skills', 'Required Skills'), ('required_certs', 'Required Certifications'),
+        ('start_date', 'Start'), ('end_date', 'End'), ('priority', 'Priority'),
+    ],
+}
+
+# Markdown card per row: literal text and {column} placeholders, the same
+# layout as format_pilot_info / format_drone_info / format_mission_info
+CARD_TEMPLATES: Dict[str, str] = {
+    'pilots': (
+        "**{name}** (ID: {pilot_id})\n"
+        "- **Skills**: {skills}\n"
+        "- **Certifications**: {certifications}\n"
+        "- **Location**: {location}\n"
+        "- **Status**: {status}\n"
+        "- **Current Assignment**: {current_assignment}\n"
+        "- **Available From**: {available_from}\n"
+    ),
+    'drones': (
+        "**{model}** (ID: {drone_id})\n"
+        "- **Capabilities**: {capabilities}\n"
+        "- **Location**: {location}\n"
+        "- **Status**: {status}\n"
+        "- **Current Assignment**: {current_assignment}\n"
+        "- **Maintenance Due**: {maintenance_due}\n"
+    ),
+    'missions': (
+        "**{project_id}** - {client}\n"
+        "- **Location**: {location}\n"
+        "- **Required Skills**: {required_skills}\n"
+        "- **Required Certifications**: {required_certs}\n"
+        "- **Duration**: {start_date} to {end_date}\n"
+        "- **Priority**: {priority}\n"
+    ),
+}
+
+# Rows kept in a result; the rest are counted but not stored or shown
+DEFAULT_MAX_ROWS = 500
+
+
+def _display_text(series: pd.Series) -> pd.Series:
+    """Cell values as display strings ('N/A' for missing, dates as YYYY-MM-DD)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%Y-%m-%d').fillna('–')
+    return series.fillna('N/A').astype(str)
+
+
+def _template_parts(template: str) -> List[Tuple[bool, str]]:
+    """Split a card template into (is_column, text) pieces"""
+    parts = []
+    for i, piece in enumerate(template.replace('}', '{').split('{')):
+        if piece:
+            parts.append((i % 2 == 1, piece))
+    return parts
+
+
+class TableResult:
+    """
+    A list-query answer: a heading plus up to max_rows table rows
+
+    Only the first max_rows matching rows are kept, so the object stored in
+    the chat history (and the work to show it) stays the same size however
+    large the roster is. `total` still reports every match.
+    """
+
+    def __init__(self, kind: str, df: pd.DataFrame, noun: Optional[str] = None,
+                 max_rows: Optional[int] = None):
+        """
+        Args:
+            kind: 'pilots', 'drones' or 'missions' (picks columns and card layout)
+            df: Matching rows, with lower-case column names
+            noun: Word used in the heading; defaults to the singular of kind
+            max_rows: Rows kept; defaults to the RESULT_MAX_ROWS setting (500)
+        """
+        if max_rows is None:
+            max_rows = int(get_float_setting('RESULT_MAX_ROWS', DEFAULT_MAX_ROWS))
+        self.kind = kind
+        self.noun = noun or kind.rstrip('s')
+        self.total = len(df)
+        self.max_rows = max(int(max_rows), 1)
+
+        rows = df.head(self.max_rows)
+        columns = [(c, label) for c, label in DISPLAY_COLUMNS[kind] if c in rows.columns]
+        self.frame = pd.DataFrame(
+            {label: _display_text(rows[c]).to_numpy() for c, label in columns},
+            index=range(len(rows)),
+        )
+        self._columns = dict(columns)
+
+    @property
+    def shown(self) -> int:
+        return len(self.frame)
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.shown
+
+    def heading(self) -> str:
+        return f"Found **{self.total}** {self.noun}(s):"
+
+    def footer(self) -> str:
+        """Note about rows left out, or '' when every match is shown"""
+        if not self.truncated:
+            return ''
+        return f"_Showing the first {self.shown} of {self.total}. Add a filter (status, location, ...) to narrow the list._"
+
+    def to_markdown(self, limit: Optional[int] = None) -> str:
+        """
+        Render the rows as markdown cards, built column-wise in one pass
+
+        Args:
+            limit: Max cards to render (default: every stored row)
+        """
+        frame = self.frame if limit is None else self.frame.head(limit)
+        labels = self._columns
+        cards = pd.Series('\n', index=frame.index, dtype=object)
+        for is_column, text in _template_parts(CARD_TEMPLATES[self.kind]):
+            if not is_column:
+                cards = cards + text
+            elif text in labels:
+                cards = cards + frame[labels[text]]
+            else:
+                cards = cards + 'N/A'
+
+        parts = [self.heading(), '']
+        if len(cards):
+            parts.append('\n---\n'.join(cards.tolist()) + '\n---\n')
+        shown = len(frame)
+        if self.total > shown:
+            parts.append(f"_Showing the first {shown} of {self.total}._")
+        return '\n'.join(parts)
+
+    def __str__(self) -> str:
+        return self.to_markdown()
@@ -0,0 +1,287 @@
+"""
+Request Scheduler
+Paces Sheets API calls to stay inside the per-minute read and write
+quotas, retries rate-limited and failed calls with exponential backoff,
+and lets identical concurrent reads share one request
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Hashable, Optional
+
+import requests
+
+from src.config import get_float_setting
+from src.metrics import get_metrics
+
+# Operations that read data (the rest write); the Sheets API meters the two separately.
+# get_lastUpdateTime is a Drive API request, counted with the reads to be safe.
+READ_OPERATIONS = {'worksheet', 'worksheets', 'get_all_records', 'get_all_values', 'values_batch_get',
+                   'get_lastUpdateTime'}
+
+# Writes that leave the sheet the same if applied twice. Appends and row
+# deletes are only retried after a 429, when the API has not applied them.
+IDEMPOTENT_WRITES = {'update_cell', 'values_batch_update'}
+
+# Responses worth retrying: rate limited or a temporary server problem
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status of a gspread APIError (or anything with a .response)"""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+class TokenBucket:
+    """
+    Allows `rate` calls per second on average, with bursts of up to `capacity`
+
+    reserve() always succeeds: it takes a token and returns how long the
+    caller must wait before using it. Waiting callers push the balance
+    below zero, so they are spaced out at `rate` in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before making the call"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def drain(self):
+        """Drop any saved-up burst (after a 429), so calls go at the steady rate"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+
+class RequestScheduler:
+    """
+    Runs spreadsheet API calls within the read and write quotas
+
+    Every call takes a token from the read or write bucket first, so a
+    burst of requests from several sessions is slowed down instead of
+    being answered with HTTP 429. A call that still fails with 429, 5xx
+    or a connection error is retried with jittered exponential backoff
+    (honouring Retry-After). Reads made while an identical read is in
+    flight wait for it and share its result; any write in between starts
+    a new read, so a session always sees its own writes.
+
+    One scheduler should be shared by everything using the same
+    credentials, since that is what Google's quota is counted against.
+    """
+
+    def __init__(
+        self,
+        read_rate: Optional[float] = None,
+        write_rate: Optional[float] = None,
+        burst: float = 10,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 32.0
+    ):
+        """
+        Args:
+            read_rate: Read calls per second (None or 0 = unlimited)
+            write_rate: Write calls per second (None or 0 = unlimited)
+            burst: Calls of each kind allowed back to back before pacing starts
+            max_retries: Retries after the first attempt
+            backoff: Delay before the first retry in seconds; doubles on each retry
+            max_backoff: Longest delay between retries
+        """
+        self.buckets: Dict[str, Optional[TokenBucket]] = {
+            'read': TokenBucket(read_rate, burst) if read_rate else None,
+            'write': TokenBucket(write_rate, burst) if write_rate else None,
+        }
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, Future] = {}
+        # Bumped when a write starts and ends; reads only join reads of the same generation
+        self._generation = 0
+        self.waiting = {'read': 0, 'write': 0}
+        self.in_flight = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.throttled_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls currently waiting for a token or a retry"""
+        with self._lock:
+            return sum(self.waiting.values())
+
+    def _wait(self, kind: str, seconds: float):
+        """Sleep while counted in the queue depth"""
+        with self._lock:
+            self.waiting[kind] += 1
+            self.throttled_seconds += seconds
+            depth = self.waiting[kind]
+        get_metrics().set_gauge('sheets_queue_depth', depth, kind=kind)
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self.waiting[kind] -= 1
+                depth = self.waiting[kind]
+            get_metrics().set_gauge('sheets_queue_depth', depth, kind=kind)
+
+    def _retry_delay(self, operation: str, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a failed call, or None to give up"""
+        if attempt >= self.max_retries:
+            return None
+        status = _status_code(error)
+        if status is None:
+            retryable = isinstance(error, (requests.ConnectionError, requests.Timeout))
+        else:
+            retryable = status in RETRY_STATUSES
+        # A write that may have been applied is only safe to repeat if it is idempotent
+        if operation not in READ_OPERATIONS and operation not in IDEMPOTENT_WRITES:
+            retryable = status == 429
+        if not retryable:
+            return None
+
+        retry_after = getattr(getattr(error, 'response', None), 'headers', {}).get('Retry-After')
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return min(self.backoff * (2 ** attempt), self.max_backoff) * random.uniform(0.5, 1.5)
+
+    def _run(self, kind: str, operation: str, func: Callable[[], Any]) -> Any:
+        """Make the call once a token is free, retrying on retryable failures"""
+        metrics = get_metrics()
+        bucket = self.buckets[kind]
+        attempt = 0
+        while True:
+            wait = bucket.reserve() if bucket is not None else 0.0
+            if wait > 0:
+                metrics.observe('sheets_queue_wait', wait, kind=kind)
+                self._wait(kind, wait)
+            with self._lock:
+                self.in_flight += 1
+            try:
+                return func()
+            except Exception as e:
+                delay = self._retry_delay(operation, e, attempt)
+                if delay is None:
+                    raise
+                status = _status_code(e)
+                if status == 429 and bucket is not None:
+                    bucket.drain()
+                with self._lock:
+                    self.retries += 1
+                metrics.inc('sheets_api_retries', operation=operation, reason=str(status or type(e).__name__))
+                print(f"Sheets {operation} failed ({status or type(e).__name__}), retrying in {delay:.1f}s")
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+            attempt += 1
+            self._wait(kind, delay)
+
+    def call(self, operation: str, func: Callable[[], Any], coalesce_key: Optional[Hashable] = None) -> Any:
+        """
+        Run one API call through the scheduler
+
+        Args:
+            operation: API method name (e.g., 'get_all_records'); decides
+                the quota bucket and whether failures are retried
+            func: Makes the call; may be run more than once
+            coalesce_key: For reads, identifies the request (same key =
+                same result), so concurrent duplicates share one call
+
+        Returns:
+            func's result (shared with any coalesced callers; do not modify it)
+        """
+        kind = 'read' if operation in READ_OPERATIONS else 'write'
+
+        if kind == 'write':
+            with self._lock:
+                self._generation += 1
+            try:
+                return self._run(kind, operation, func)
+            finally:
+                with self._lock:
+                    self._generation += 1
+
+        if coalesce_key is None:
+            return self._run(kind, operation, func)
+
+        with self._lock:
+            key = (self._generation, coalesce_key)
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = self._pending[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            get_metrics().inc('sheets_coalesced_reads', operation=operation)
+            return future.result()
+
+        try:
+            result = self._run(kind, operation, func)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and retry counts for display"""
+        with self._lock:
+            return {
+                'queued': sum(self.waiting.values()),
+                'in_flight': self.in_flight,
+                'retries': self.retries,
+                'coalesced': self.coalesced,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+            }
+
+
+def scheduler_from_settings() -> RequestScheduler:
+    """Build a scheduler from the SHEETS_READ_QUOTA / SHEETS_WRITE_QUOTA (per minute) and retry settings"""
+    return RequestScheduler(
+        read_rate=get_float_setting('SHEETS_READ_QUOTA', 60.0) / 60.0,
+        write_rate=get_float_setting('SHEETS_WRITE_QUOTA', 60.0) / 60.0,
+        burst=get_float_setting('SHEETS_BURST', 10.0),
+        max_retries=int(get_float_setting('SHEETS_MAX_RETRIES', 5)),
+        backoff=get_float_setting('SHEETS_BACKOFF', 1.0),
+        max_backoff=get_float_setting('SHEETS_MAX_BACKOFF', 32.0),
+    )
+
+
+# Singleton instance
+_scheduler_instance = None
+_scheduler_lock = threading.Lock()
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """Get or create the RequestScheduler shared by every SheetsManager on the Sheets API"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        with _scheduler_lock:
+            if _scheduler_instance is None:
+                _scheduler_instance = scheduler_from_settings()
+    return _scheduler_instance
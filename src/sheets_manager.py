@@ -3,68 +3,989 @@ Google Sheets Manager
 Handles all read/write operations with Google Sheets
 """
 
-import gspread
-from google.oauth2.service_account import Credentials
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
-import os
-from dotenv import load_dotenv
+from typing import Callable, Dict, List, Any, Optional, Union
+from src.config import get_setting, get_bool_setting, get_float_setting
+from src.delta_sync import DeltaSync
+from src.metrics import get_metrics, traced, count_session_bytes
+from src.request_scheduler import RequestScheduler, READ_OPERATIONS, get_request_scheduler
+from src.snapshot_store import SnapshotStore, snapshot_store_from_settings
+from src.storage import A1_PATTERN, LocalSpreadsheet, open_spreadsheet, rowcol_to_a1
 
-load_dotenv()
+
+SHEET_TITLES = ('pilot_roster', 'drone_fleet', 'missions')
+
+# Primary key column of each sheet
+KEY_COLUMNS = {
+    'pilot_roster': 'pilot_id',
+    'drone_fleet': 'drone_id',
+    'missions': 'project_id',
+}
+
+# Column order of each sheet
+SHEET_COLUMNS = {
+    'pilot_roster': ['pilot_id', 'name', 'skills', 'certifications', 'location',
+                     'status', 'current_assignment', 'available_from'],
+    'drone_fleet': ['drone_id', 'model', 'capabilities', 'status', 'location',
+                    'current_assignment', 'maintenance_due'],
+    'missions': ['project_id', 'client', 'location', 'required_skills', 'required_certs',
+                 'start_date', 'end_date', 'priority'],
+}
+
+# Values used for optional columns that are missing or blank on import
+COLUMN_DEFAULTS = {
+    'pilot_roster': {'status': 'Available', 'current_assignment': '–', 'available_from': '–'},
+    'drone_fleet': {'status': 'Available', 'current_assignment': '–', 'maintenance_due': '2026-12-31'},
+    'missions': {'priority': 'Standard'},
+}
+
+VALID_STATUSES = {
+    'pilot_roster': ['Available', 'Assigned', 'On Leave'],
+    'drone_fleet': ['Available', 'Maintenance', 'Assigned'],
+}
+
+# Date columns ('–' means no date)
+DATE_COLUMNS = {
+    'pilot_roster': ['available_from'],
+    'drone_fleet': ['maintenance_due'],
+    'missions': ['start_date', 'end_date'],
+}
+
+DATE_FORMAT = '%Y-%m-%d'
+
+# Cell values that mean "no date" rather than a malformed one
+NO_DATE = ('–', '-', '')
+
+# How written values are interpreted, for every write path (as update_cell does)
+VALUE_INPUT_OPTION = 'USER_ENTERED'
+
+
+def appended_first_row(response: Any) -> Optional[int]:
+    """The first row number in an append response's updates.updatedRange, or None if missing"""
+    updated = response.get('updates', {}).get('updatedRange') if isinstance(response, dict) else None
+    match = A1_PATTERN.match(updated) if isinstance(updated, str) else None
+    return int(match.group('row')) if match else None
+
+
+def format_date(value: Any) -> str:
+    """Format a typed or string date for display ('–' for missing dates)"""
+    if value is None or value is pd.NaT:
+        return '–'
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime(DATE_FORMAT)
+    return str(value)
+
+
+class WriteBatch:
+    """
+    Buffers SheetsManager writes and sends them together on exit
+    
+    Cell edits across all three sheets are flushed as one values_batch_update
+    call. Appended rows are flushed as one append_rows call per sheet, since a
+    values batch update cannot grow the grid. Deletes are not buffered: a
+    delete inside the batch flushes what is pending, then runs immediately.
+    If the with-block raises, buffered writes are discarded. Change events
+    are held with the writes and sent to listeners once the flush succeeds.
+    Reads inside the batch see the sheet as it will be after the flush
+    (the cached rows plus the buffered writes). Buffered rows stay out of
+    the manager's shared row index until they are sent: inside the batch
+    they are addressed by negative row numbers (see pending_row), and
+    edits to them are made to the buffered row itself.
+    
+    Usage:
+        with sheets_manager.batch() as batch:
+            sheets_manager.update_pilot_assignment('P001', 'PRJ001', '2026-02-08')
+            sheets_manager.update_drone_assignment('D001', 'PRJ001')
+        print(batch.report())
+    """
+    
+    def __init__(self, manager: 'SheetsManager'):
+        self.manager = manager
+        self.cells: List[tuple] = []  # (title, row, col, value)
+        self.appends: Dict[str, List[List[Any]]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.cell_updates = 0
+        self.rows_appended = 0
+        self.requests_made = 0
+        self._owner = False
+    
+    def __enter__(self) -> 'WriteBatch':
+        # Nested batches join the outer one
+        outer = self.manager._active_batch()
+        if outer is not None:
+            return outer
+        self._owner = True
+        self.manager._local.batch = self
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if not self._owner:
+            return False
+        self.manager._local.batch = None
+        if exc_type is not None:
+            self.discard()
+            return False
+        self.flush()
+        return False
+    
+    def add_cell(self, title: str, row: int, col: int, value: Any):
+        """Buffer a single cell edit (a negative row is a buffered row, see pending_row)"""
+        if row < 0:
+            buffered = self.appends[title][-row - 1]
+            buffered.extend([''] * (col - len(buffered)))
+            buffered[col - 1] = value
+        else:
+            self.cells.append((title, row, col, value))
+        self.cell_updates += 1
+    
+    def add_row(self, title: str, row: List[Any]):
+        """Buffer a row to append"""
+        self.appends.setdefault(title, []).append(list(row))
+        self.rows_appended += 1
+    
+    def pending_row(self, title: str, key: Any) -> Optional[int]:
+        """
+        Look up a row buffered in this batch by primary key
+        
+        Returns:
+            -1 for the first buffered row of the sheet, -2 for the second,
+            and so on; None if the key is not buffered
+        """
+        for position, row in enumerate(self.appends.get(title, [])):
+            if row and str(row[0]) == str(key):
+                return -(position + 1)
+        return None
+    
+    def pending_keys(self, title: str) -> set:
+        """Get the primary keys of the rows buffered for a sheet"""
+        return {str(row[0]) for row in self.appends.get(title, []) if row}
+    
+    def overlay(self, title: str, df: pd.DataFrame) -> pd.DataFrame:
+        """A sheet's rows as they will be once the buffered writes to it are sent"""
+        rows = self.appends.get(title, [])
+        cells = [(row, col, value) for t, row, col, value in self.cells if t == title]
+        if not rows and not cells:
+            return df
+        width = len(df.columns)
+        if rows:
+            appended = pd.DataFrame([(list(row) + [''] * width)[:width] for row in rows], columns=df.columns)
+            df = pd.concat([df, appended], ignore_index=True)
+        else:
+            df = df.copy()
+        for row, col, value in cells:
+            if 0 <= row - 2 < len(df) and 0 <= col - 1 < width:
+                df.iat[row - 2, col - 1] = value
+        return df
+    
+    def add_event(self, event: Dict[str, Any]):
+        """Hold a change event until the writes it describes are sent"""
+        self.events.append(event)
+    
+    def flush(self):
+        """Send all buffered writes"""
+        if not self.cells and not self.appends:
+            self.events = []
+            return
+        cells, appends, events = self.cells, self.appends, self.events
+        self.cells, self.appends, self.events = [], {}, []
+        
+        sent = False
+        try:
+            # Appends go first so cell edits can target rows added in this batch
+            for title, rows in appends.items():
+                self.manager._call('append_rows', title, self.manager._worksheet(title).append_rows,
+                                   rows, value_input_option=VALUE_INPUT_OPTION)
+                self.requests_made += 1
+            
+            if cells:
+                # Later edits to the same cell win
+                latest = {}
+                for title, row, col, value in cells:
+                    latest[(title, row, col)] = value
+                data = [
+                    {'range': f"'{title}'!{rowcol_to_a1(row, col)}", 'values': [[value]]}
+                    for (title, row, col), value in latest.items()
+                ]
+                self.manager._call('values_batch_update', None, self.manager.spreadsheet.values_batch_update, {
+                    'valueInputOption': VALUE_INPUT_OPTION,
+                    'data': data
+                })
+                self.requests_made += 1
+            sent = True
+        except Exception:
+            # Rows we expected to append may not exist; re-read before trusting the index
+            self.manager._drop_index()
+            self.manager._notify({'action': 'reload', 'sheet': None, 'key': None, 'values': {}})
+            raise
+        finally:
+            for title in {c[0] for c in cells} | set(appends):
+                self.manager.invalidate_cache(title)
+        if sent:
+            # Where the rows landed isn't reported per row: re-read the sheets that grew
+            for title in appends:
+                self.manager._drop_index(title)
+        for event in events:
+            self.manager._notify(event)
+    
+    def discard(self):
+        """Drop buffered writes without sending them"""
+        self.cells, self.appends, self.events = [], {}, []
+    
+    def report(self) -> Dict[str, int]:
+        """Get how many API requests the batch made and saved"""
+        unbatched = self.cell_updates + self.rows_appended
+        return {
+            'cell_updates': self.cell_updates,
+            'rows_appended': self.rows_appended,
+            'requests_made': self.requests_made,
+            'requests_unbatched': unbatched,
+            'requests_saved': max(unbatched - self.requests_made, 0),
+        }
 
 
 class SheetsManager:
     """Manages Google Sheets data operations"""
     
-    def __init__(self):
-        """Initialize Google Sheets connection"""
-        self.scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
+    def __init__(self, spreadsheet=None, concurrent: Optional[bool] = None,
+                 scheduler: Optional[RequestScheduler] = None, lazy: Optional[bool] = None,
+                 delta_sync: Optional[bool] = None, snapshot: Optional[SnapshotStore] = None):
+        """
+        Initialize Google Sheets connection
         
-        # Try to load from Streamlit secrets first (for cloud deployment)
-        try:
-            import streamlit as st
-            if hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
-                # Use Streamlit secrets
-                self.creds = Credentials.from_service_account_info(
-                    st.secrets['gcp_service_account'],
-                    scopes=self.scopes
-                )
-            else:
-                # Fall back to local file
-                credentials_file = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE', 'credentials.json')
-                self.creds = Credentials.from_service_account_file(
-                    credentials_file,
-                    scopes=self.scopes
-                )
-        except ImportError:
-            # Running without Streamlit, use local file
-            credentials_file = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE', 'credentials.json')
-            self.creds = Credentials.from_service_account_file(
-                credentials_file,
-                scopes=self.scopes
-            )
+        Args:
+            spreadsheet: Storage backend to use (a gspread Spreadsheet or a
+                LocalSpreadsheet). Defaults to the STORAGE_BACKEND setting.
+            concurrent: Open and fetch the sheets in parallel on a thread
+                pool. Defaults to the SHEETS_CONCURRENT_FETCH setting (off).
+            scheduler: Paces and retries the API calls. Defaults to the
+                shared quota-aware scheduler, or an unthrottled one for a
+                LocalSpreadsheet (which has no quota).
+            lazy: Open each worksheet on first use instead of all three
+                here. Defaults to the FAST_START setting (on).
+            delta_sync: Check the spreadsheet's revision before downloading
+                an expired sheet again, and report changed rows to the
+                listeners. Defaults to the SHEETS_DELTA_SYNC setting (on).
+            snapshot: On-disk copy of the sheets, loaded before the first API
+                call and read from while the spreadsheet can't be reached.
+                Defaults to the SNAPSHOT_FILE setting when the manager opens
+                a non-local backend itself; none otherwise.
+        """
+        if snapshot is None and spreadsheet is None and get_setting('STORAGE_BACKEND', 'google').lower() != 'local':
+            snapshot = snapshot_store_from_settings()
+        self.snapshot = snapshot
+        
+        # With a snapshot, opening the spreadsheet (a network request for
+        # Google Sheets) waits until the first read needs it; until it
+        # succeeds, reads fall back to the snapshot and it is retried later
+        self._spreadsheet = spreadsheet
+        self._connect_error: Optional[Exception] = None
+        self._next_connect = 0.0
+        self._connect_lock = threading.Lock()
+        if spreadsheet is None and self.snapshot is None:
+            self._spreadsheet = open_spreadsheet()
+        
+        # Every API call goes through the scheduler: quota pacing, retries on
+        # 429/5xx and sharing of identical in-flight reads
+        if scheduler is None:
+            scheduler = RequestScheduler() if isinstance(self._spreadsheet, LocalSpreadsheet) else get_request_scheduler()
+        self.scheduler = scheduler
+        
+        # Count bytes on the wire when the backend talks HTTP (gspread)
+        self._count_bytes()
+        
+        # Concurrent mode: sheet requests run on a small shared thread pool,
+        # so loading several sheets takes about as long as the slowest one
+        self.concurrent = concurrent if concurrent is not None else get_bool_setting('SHEETS_CONCURRENT_FETCH', False)
+        self.fetch_workers = max(int(get_float_setting('SHEETS_FETCH_WORKERS', 3)), 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Seconds taken by the most recent fetch of each sheet ('snapshot'
+        # for batched snapshot reads, 'open' for opening the worksheets)
+        self.last_fetch_timings: Dict[str, float] = {}
+        
+        # Change detection: expired cache entries are only downloaded again if
+        # the spreadsheet's revision moved, and then diffed row by row
+        use_delta = delta_sync if delta_sync is not None else get_bool_setting('SHEETS_DELTA_SYNC', True)
+        self.delta_sync: Optional[DeltaSync] = DeltaSync() if use_delta else None
+        
+        # Worksheet handles, opened on first use in lazy mode. Snapshot reads
+        # go through the spreadsheet, so a read-only session never opens them.
+        self._handles: Dict[str, Any] = {}
+        self.lazy = lazy if lazy is not None else get_bool_setting('FAST_START', True)
+        if not self.lazy and self._spreadsheet is not None:
+            self._open_worksheets()
+        
+        # Read cache: sheet title -> (fetched_at, version, DataFrame, typed DataFrame)
+        # Entries expire after cache_ttl seconds, or as soon as one of our own
+        # writes bumps the sheet's version. A TTL of 0 disables caching.
+        self.cache_ttl = get_float_setting('SHEETS_CACHE_TTL', 30.0)
+        self._cache: Dict[str, tuple] = {}
+        self._versions: Dict[str, int] = {title: 0 for title in SHEET_TITLES}
+        self._cache_lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Malformed dates found by the last load of each sheet
+        self.load_errors: Dict[str, List[Dict[str, str]]] = {title: [] for title in SHEET_TITLES}
+        self._reported_errors: set = set()
+        
+        # Primary key index: sheet title -> {pilot_id/drone_id/project_id: row number}
+        self._row_index: Dict[str, Dict[str, int]] = {}
+        self._row_counts: Dict[str, int] = {}
+        # Held around each append or delete together with its index update,
+        # so the index sees them in the order the sheet did
+        self._structure_locks: Dict[str, threading.Lock] = {title: threading.Lock() for title in SHEET_TITLES}
+        
+        # Per-thread active WriteBatch (the manager is shared across sessions)
+        self._local = threading.local()
+        
+        # Callbacks told about every successful write (see add_listener)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        
+        # Sheets currently served from the snapshot -> when it was last in sync (Unix time)
+        self._stale: Dict[str, float] = {}
+        if self.snapshot is not None:
+            # Writes (and edits found by delta sync) go through to the snapshot
+            self.add_listener(self.snapshot.apply)
+            if not self._load_snapshot() and self._spreadsheet is None:
+                # Nothing to fall back on: connect now, failing as without a snapshot
+                self._spreadsheet = open_spreadsheet()
+                self._count_bytes()
+                if not self.lazy:
+                    self._open_worksheets()
+    
+    @property
+    def spreadsheet(self):
+        """The storage backend, reconnecting first if the manager is offline"""
+        if self._spreadsheet is None:
+            self._reconnect()
+        return self._spreadsheet
+    
+    def _reconnect(self):
+        """
+        Try to open the spreadsheet again, at most once per cache TTL
+        
+        Raises:
+            ConnectionError: While the spreadsheet can't be reached
+        """
+        with self._connect_lock:
+            if self._spreadsheet is not None:
+                return
+            now = time.monotonic()
+            if now >= self._next_connect:
+                try:
+                    self._spreadsheet = open_spreadsheet()
+                except Exception as e:
+                    self._connect_error = e
+                else:
+                    self._connect_error = None
+                    self._count_bytes()
+                    return
+                self._next_connect = now + max(self.cache_ttl, 1.0)
+            raise ConnectionError(f"Google Sheets unreachable: {self._connect_error}")
+    
+    def _count_bytes(self):
+        """Count bytes on the wire when the backend talks HTTP (gspread)"""
+        session = getattr(getattr(self._spreadsheet, 'client', None), 'session', None)
+        if session is not None:
+            count_session_bytes(session, 'sheets')
+    
+    def _load_snapshot(self) -> bool:
+        """
+        Seed the cache from the snapshot file, before any API call
+        
+        The entries start out expired: the first read checks the revision
+        (with delta sync) and only downloads sheets that changed since the
+        snapshot was saved.
+        
+        Returns:
+            True if all three sheets were in the snapshot
+        """
+        saved = self.snapshot.load()
+        if not all(title in saved for title in SHEET_TITLES):
+            return False
+        for title in SHEET_TITLES:
+            df, _, revision = saved[title]
+            df = self._fix_dataframe_columns(df)
+            typed_df = self._type_dates(title, df)
+            with self._cache_lock:
+                if self.cache_ttl > 0:
+                    self._cache[title] = (float('-inf'), self._versions[title], df, typed_df)
+            if self.delta_sync is not None:
+                self.delta_sync.record(title, KEY_COLUMNS[title], df, revision, float('-inf'))
+        return True
+    
+    def _stale_frames(self, titles: List[str], error: Exception) -> Optional[List[tuple]]:
+        """
+        (df, typed_df) from the snapshot for sheets that couldn't be downloaded
+        
+        They are cached like a download, so reads stay fast while offline and
+        the download is retried after cache_ttl seconds; staleness() reports
+        their age until then.
+        
+        Returns:
+            One pair per title, or None if the snapshot doesn't have them all
+        """
+        if self.snapshot is None:
+            return None
+        saved = self.snapshot.load()
+        if not all(title in saved for title in titles):
+            return None
+        now = time.monotonic()
+        frames = []
+        for title in titles:
+            df, synced_at, _ = saved[title]
+            df = self._fix_dataframe_columns(df)
+            typed_df = self._type_dates(title, df)
+            with self._cache_lock:
+                if self.cache_ttl > 0:
+                    self._cache[title] = (now, self._versions[title], df, typed_df)
+                self._stale[title] = synced_at
+            frames.append((df, typed_df))
+        get_metrics().inc('sheets_cache', len(titles), sheet=titles[0] if len(titles) == 1 else 'snapshot', result='stale')
+        synced_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(min(saved[title][1] for title in titles)))
+        print(f"Error reading Google Sheets ({error}); showing the snapshot from {synced_at}")
+        return frames
+    
+    def staleness(self) -> Optional[float]:
+        """
+        How old the data is, when it comes from the snapshot
+        
+        Returns:
+            Unix time the oldest sheet served from the snapshot (because
+            Google Sheets couldn't be reached) was last in sync with the
+            spreadsheet, or None when everything is live
+        """
+        with self._cache_lock:
+            return min(self._stale.values()) if self._stale else None
+    
+    def is_offline(self) -> bool:
+        """True while reads come from the snapshot; writes can't reach the sheet until it is back"""
+        return self.staleness() is not None
+    
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for changes made through this manager
+        
+        The callback receives one event dict per change:
+            - action: 'update', 'add', 'delete', or 'reload' (anything may have changed)
+            - sheet: Sheet title (None for 'reload')
+            - key: pilot_id/drone_id/project_id of the row
+            - values: Changed columns for 'update', the full row for 'add'
         
-        self.client = gspread.authorize(self.creds)
+        Events for writes inside a batch are sent after the batch is flushed.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Unregister a change callback"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _emit(self, action: str, title: Optional[str], key: Optional[str] = None, values: Optional[Dict[str, Any]] = None):
+        """Report a change now, or when the open batch is flushed"""
+        event = {'action': action, 'sheet': title, 'key': key, 'values': values or {}}
+        batch = self._active_batch()
+        if batch is not None:
+            batch.add_event(event)
+        else:
+            self._notify(event)
+    
+    def _notify(self, event: Dict[str, Any]):
+        """Call every listener; a failing listener never fails the write"""
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in change listener: {e}")
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """Get the fetch thread pool, creating it on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='sheets-fetch')
+            return self._executor
+    
+    def _run_per_sheet(self, func: Callable[[str], Any], titles: List[str]) -> Dict[str, Any]:
+        """
+        Call func(title) for each sheet, in parallel when concurrent mode is on
+        
+        Every call runs to completion; if any failed, the exception from the
+        first failing sheet (in title order) is raised, as in a serial loop.
+        """
+        if not self.concurrent or len(titles) < 2:
+            return {title: func(title) for title in titles}
+        
+        # Spans opened by the workers belong to the caller's span (e.g. the query)
+        metrics = get_metrics()
+        parent = metrics.current_span()
+        
+        def run(title: str):
+            with metrics.attach(parent):
+                return func(title)
+        
+        futures = {title: self._pool().submit(run, title) for title in titles}
+        results, first_error = {}, None
+        for title in titles:
+            try:
+                results[title] = futures[title].result()
+            except Exception as e:
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+        return results
+    
+    def _open_worksheets(self):
+        """Get the three worksheet handles"""
+        started = time.perf_counter()
+        sheets = self._run_per_sheet(
+            lambda title: self._call('worksheet', title, self.spreadsheet.worksheet, title),
+            list(SHEET_TITLES)
+        )
+        self._handles.update(sheets)
+        self.last_fetch_timings['open'] = time.perf_counter() - started
+    
+    @traced('sheets_method')
+    def prefetch(self, titles: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Fetch every stale sheet now, in parallel in concurrent mode
+        
+        Args:
+            titles: Sheets to load; all three if None
         
-        # Get Sheets ID from Streamlit secrets or environment variable
+        Returns:
+            {title: seconds} for the sheets that were fetched
+        """
+        titles = list(titles or SHEET_TITLES)
+        with self._cache_lock:
+            now = time.monotonic()
+            stale = [
+                title for title in titles
+                if title not in self._cache
+                or self._cache[title][1] != self._versions[title]
+                or now - self._cache[title][0] >= self.cache_ttl
+            ]
+            # Only expired by age: with delta sync, one revision check tells if they changed
+            expired = [title for title in stale if title in self._cache and self._cache[title][1] == self._versions[title]]
+        revision = None
+        if self.delta_sync is not None and self.cache_ttl > 0 and expired:
+            changed, revision = self._revalidate(expired)
+            stale = [title for title in stale if title not in expired or title in changed]
+        self._run_per_sheet(lambda title: self._fetch_sheet(title, revision), stale)
+        return {title: self.last_fetch_timings[title] for title in stale}
+    
+    def batch(self) -> WriteBatch:
+        """Start a write batch; use as a context manager"""
+        return WriteBatch(self)
+    
+    def _call(self, operation: str, title: Optional[str], func: Callable, *args, **kwargs):
+        """
+        Make one spreadsheet API call through the scheduler
+        
+        The call waits for quota, is retried on 429/5xx, and (for reads)
+        shares the result of an identical read already in flight. Each
+        attempt is timed and counted in the metrics.
+        """
+        def attempt():
+            metrics = get_metrics()
+            try:
+                with metrics.span('sheets_api', operation=operation, sheet=title or 'all'):
+                    result = func(*args, **kwargs)
+            except Exception:
+                metrics.inc('sheets_api_calls', operation=operation, outcome='error')
+                raise
+            metrics.inc('sheets_api_calls', operation=operation, outcome='ok')
+            return result
+        
+        coalesce_key = (id(self.spreadsheet), operation, title, repr(args)) if operation in READ_OPERATIONS else None
+        return self.scheduler.call(operation, attempt, coalesce_key=coalesce_key)
+    
+    def _active_batch(self) -> Optional[WriteBatch]:
+        """Get the write batch open on this thread, if any"""
+        return getattr(self._local, 'batch', None)
+    
+    def _write_cell(self, title: str, row: int, col: int, value: Any):
+        """Update one cell, or buffer it if a batch is open"""
+        batch = self._active_batch()
+        if batch is not None:
+            batch.add_cell(title, row, col, value)
+        else:
+            self._call('update_cell', title, self._worksheet(title).update_cell, row, col, value)
+    
+    def _append_row(self, title: str, row: List[Any]):
+        """Append one row and index it, or buffer it if a batch is open"""
+        batch = self._active_batch()
+        if batch is not None:
+            batch.add_row(title, row)
+        else:
+            with self._structure_locks[title]:
+                response = self._call('append_row', title, self._worksheet(title).append_row, row,
+                                      value_input_option=VALUE_INPUT_OPTION)
+                self._index_appended(title, [row[0]], response)
+    
+    def _append_rows(self, title: str, rows: List[List[Any]]):
+        """Append many rows with one call, or buffer them if a batch is open"""
+        batch = self._active_batch()
+        if batch is not None:
+            for row in rows:
+                batch.add_row(title, row)
+        else:
+            with self._structure_locks[title]:
+                response = self._call('append_rows', title, self._worksheet(title).append_rows, rows,
+                                      value_input_option=VALUE_INPUT_OPTION)
+                self._index_appended(title, [row[0] for row in rows], response)
+    
+    def _delete_row(self, title: str, key: str) -> bool:
+        """
+        Delete the row holding a primary key; pending batched writes are flushed first
+        
+        Returns:
+            False if the key does not exist
+        """
+        batch = self._active_batch()
+        if batch is not None:
+            batch.flush()
+        row_number = self._row_number(title, key)
+        if row_number is None:
+            return False
+        with self._structure_locks[title]:
+            # delete_rows exists in both gspread 5 and 6 (delete_row was removed in 6)
+            self._call('delete_rows', title, self._worksheet(title).delete_rows, row_number)
+            self._index_deleted(title, row_number)
+        return True
+    
+    def _worksheet(self, title: str):
+        """Get the worksheet handle for a sheet title, opening it if needed"""
+        handle = self._handles.get(title)
+        if handle is None:
+            if title not in SHEET_TITLES:
+                raise KeyError(title)
+            # Threads opening the same sheet at once share one request (see RequestScheduler)
+            handle = self._handles[title] = self._call('worksheet', title, self.spreadsheet.worksheet, title)
+        return handle
+    
+    @property
+    def pilot_sheet(self):
+        return self._worksheet('pilot_roster')
+    
+    @property
+    def drone_sheet(self):
+        return self._worksheet('drone_fleet')
+    
+    @property
+    def missions_sheet(self):
+        return self._worksheet('missions')
+    
+    def _read_sheet(self, title: str, typed: bool = False) -> pd.DataFrame:
+        """Read a sheet through the cache, plus any writes buffered in this thread's batch"""
+        df, typed_df = self._sheet_frames(title)
+        batch = self._active_batch()
+        if batch is not None:
+            pending = batch.overlay(title, df)
+            if pending is not df:
+                df, typed_df = pending, self._type_dates(title, pending)
+        return (typed_df if typed else df).copy()
+    
+    def _sheet_frames(self, title: str) -> tuple:
+        """(df, typed_df) from the cache, fetched only when stale (or changed, with delta sync); not copied"""
+        expired = False
+        with self._cache_lock:
+            entry = self._cache.get(title)
+            if entry is not None:
+                fetched_at, version, df, typed_df = entry
+                if version == self._versions[title]:
+                    if time.monotonic() - fetched_at < self.cache_ttl:
+                        self.cache_hits += 1
+                        get_metrics().inc('sheets_cache', sheet=title, result='hit')
+                        return df, typed_df
+                    expired = True
+        
+        revision = None
+        if expired and self.delta_sync is not None:
+            stale, revision = self._revalidate([title])
+            if not stale:
+                with self._cache_lock:
+                    self.cache_hits += 1
+                get_metrics().inc('sheets_cache', sheet=title, result='revalidated')
+                return df, typed_df
+        
+        with self._cache_lock:
+            self.cache_misses += 1
+        get_metrics().inc('sheets_cache', sheet=title, result='miss')
+        try:
+            df, typed_df = self._fetch_sheet(title, revision)
+        except Exception as e:
+            frames = self._stale_frames([title], e)
+            if frames is None:
+                raise
+            df, typed_df = frames[0]
+        return df, typed_df
+    
+    def _revision(self) -> Optional[str]:
+        """
+        The spreadsheet's revision (its Drive modifiedTime), which changes on
+        every edit; None if the backend can't tell
+        """
+        if self._spreadsheet is None and time.monotonic() < self._next_connect:
+            return None  # offline; the download that follows falls back to the snapshot
         try:
-            import streamlit as st
-            if hasattr(st, 'secrets') and 'GOOGLE_SHEETS_ID' in st.secrets:
-                self.spreadsheet_id = st.secrets['GOOGLE_SHEETS_ID']
+            getter = getattr(self.spreadsheet, 'get_lastUpdateTime', None)
+            if getter is None:
+                return None
+            return self._call('get_lastUpdateTime', None, getter)
+        except Exception as e:
+            print(f"Error reading spreadsheet revision: {e}")
+            return None
+    
+    def _snapshot_revision(self) -> Optional[str]:
+        """
+        The revision to save a download under when none was read to revalidate it
+        
+        Only read with a snapshot to save (and delta sync on): the saved copy
+        can then be revalidated after a restart instead of downloaded again.
+        Without one, the check would just add an API call to every first load.
+        """
+        if self.snapshot is None or self.delta_sync is None or self.cache_ttl <= 0:
+            return None
+        return self._revision()
+    
+    def _revalidate(self, titles: List[str]) -> tuple:
+        """
+        Renew the expired cache entries of sheets that haven't changed
+        
+        One revision check covers all the titles.
+        
+        Returns:
+            (titles that still need downloading, the revision read or None)
+        """
+        revision = self._revision()
+        current = self.delta_sync.current(titles, revision)
+        if current:
+            now = time.monotonic()
+            with self._cache_lock:
+                for title in current:
+                    entry = self._cache.get(title)
+                    if entry is not None and entry[1] == self._versions[title]:
+                        self._cache[title] = (now,) + entry[1:]
+                    self._stale.pop(title, None)
+            if self.snapshot is not None:
+                self.snapshot.confirm(current)
+            get_metrics().inc('sheets_sync', len(current), result='unchanged')
+        return [title for title in titles if title not in current], revision
+    
+    def _fetch_sheet(self, title: str, revision: Optional[str] = None) -> tuple:
+        """Download a sheet, refreshing both the read cache and the row index"""
+        with self._cache_lock:
+            version = self._versions[title]
+        if revision is None:
+            revision = self._snapshot_revision()
+        
+        requested_at = time.monotonic()
+        started = time.perf_counter()
+        data = self._call('get_all_records', title, self._worksheet(title).get_all_records)
+        self.last_fetch_timings[title] = time.perf_counter() - started
+        df = self._fix_dataframe_columns(pd.DataFrame(data))
+        keys = [record.get(KEY_COLUMNS[title], '') for record in data]
+        return self._store_fetched(title, version, df, keys, time.monotonic(), revision, requested_at)
+    
+    def _store_fetched(self, title: str, version: int, df: pd.DataFrame, keys: List[Any], fetched_at: float,
+                       revision: Optional[str] = None, requested_at: Optional[float] = None) -> tuple:
+        """
+        Type, cache and index a freshly downloaded sheet; returns (df, typed_df)
+        
+        With delta sync, the download is also diffed against the previous
+        one and listeners get an event per row changed outside this manager.
+        """
+        typed_df = self._type_dates(title, df)
+        with self._cache_lock:
+            # Don't store data that a concurrent write has already made stale
+            if version == self._versions[title]:
+                if self.cache_ttl > 0:
+                    self._cache[title] = (fetched_at, version, df, typed_df)
+                self._build_index(title, keys)
+                # Saved in the background; later writes reach it through the listener
+                if self.snapshot is not None:
+                    self.snapshot.save(title, KEY_COLUMNS[title], df, revision)
+            self._stale.pop(title, None)
+        
+        # Tell listeners about rows changed outside this manager since the last
+        # download (rows our own writes changed were reported already; repeats are no-ops)
+        if self.delta_sync is not None:
+            events = self.delta_sync.record(title, KEY_COLUMNS[title], df, revision,
+                                            requested_at if requested_at is not None else fetched_at)
+            if events:
+                get_metrics().inc('sheets_sync', result='changed')
+                get_metrics().inc('sheets_sync_rows', len(events), sheet=title)
+            for event in events:
+                self._notify(event)
+        return df, typed_df
+    
+    def _type_dates(self, title: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a sheet's date columns to datetime64 in one vectorized pass
+        
+        '–' and blanks become NaT. Malformed dates also become NaT; they are
+        recorded in load_errors and printed the first time they are seen.
+        """
+        typed = df.copy()
+        key_column = KEY_COLUMNS[title]
+        errors = []
+        for column in typed.columns:
+            if str(column).lower().strip() not in DATE_COLUMNS[title]:
+                continue
+            raw = typed[column].fillna('').astype(str).str.strip()
+            parsed = pd.to_datetime(raw, format=DATE_FORMAT, errors='coerce')
+            malformed = parsed.isna() & ~raw.isin(NO_DATE)
+            if malformed.any():
+                keys = typed[key_column] if key_column in typed.columns else pd.Series('', index=typed.index)
+                for key, value in zip(keys[malformed], raw[malformed]):
+                    errors.append({'sheet': title, 'key': str(key), 'column': str(column), 'value': value})
+            typed[column] = parsed
+        
+        with self._cache_lock:
+            self.load_errors[title] = errors
+            new_errors = [e for e in errors if (e['sheet'], e['key'], e['column'], e['value']) not in self._reported_errors]
+            self._reported_errors.update((e['sheet'], e['key'], e['column'], e['value']) for e in new_errors)
+        for e in new_errors:
+            print(f"Error parsing {e['column']} for {e['key']} in {e['sheet']}: '{e['value']}' is not a YYYY-MM-DD date")
+        return typed
+    
+    def _build_index(self, title: str, keys: List[Any]):
+        """Rebuild the primary key -> row number index from the key column"""
+        index: Dict[str, int] = {}
+        for idx, key in enumerate(keys):
+            # First occurrence wins, matching the old linear scans
+            index.setdefault(str(key), idx + 2)  # +2 for header and 1-indexing
+        self._row_index[title] = index
+        self._row_counts[title] = len(keys)
+    
+    def _row_number(self, title: str, key: str) -> Optional[int]:
+        """
+        Look up the sheet row holding a primary key
+        
+        The index is built by the first read of the sheet and then kept in
+        step with our own appends and deletes, so lookups need no API call.
+        Rows buffered in this thread's batch are found there (other threads
+        don't see them until the batch is sent).
+        
+        Returns:
+            1-indexed row number, a negative row number for a row buffered
+            in the active batch, or None if the key does not exist
+        """
+        with self._cache_lock:
+            indexed = title in self._row_index
+            row_number = self._row_index[title].get(str(key)) if indexed else None
+        if not indexed:
+            self._fetch_sheet(title)
+            with self._cache_lock:
+                row_number = self._row_index.get(title, {}).get(str(key))
+        batch = self._active_batch()
+        if row_number is None and batch is not None:
+            row_number = batch.pending_row(title, key)
+        return row_number
+    
+    def _has_key(self, title: str, key: str) -> bool:
+        """Check whether a primary key already exists in a sheet"""
+        return self._row_number(title, key) is not None
+    
+    def _known_ids(self, title: str) -> set:
+        """Get the set of primary keys in a sheet (with the rows buffered in this thread's batch)"""
+        with self._cache_lock:
+            ids = set(self._row_index[title]) if title in self._row_index else None
+        if ids is None:
+            self._fetch_sheet(title)
+            with self._cache_lock:
+                ids = set(self._row_index.get(title, {}))
+        batch = self._active_batch()
+        return ids | batch.pending_keys(title) if batch is not None else ids
+    
+    def _index_appended(self, title: str, keys: List[Any], response: Any):
+        """
+        Record rows appended by one call, at the rows the API says they landed on
+        
+        Args:
+            title: Sheet title
+            keys: Primary keys of the appended rows, in order
+            response: The append_row/append_rows response (updates.updatedRange)
+        """
+        first_row = appended_first_row(response)
+        with self._cache_lock:
+            if title not in self._row_index:
+                return
+            if first_row is None:
+                # No range to go by: re-read the row numbers rather than guess them
+                self._drop_index(title)
+                return
+            for offset, key in enumerate(keys):
+                self._row_index[title].setdefault(str(key), first_row + offset)
+            self._row_counts[title] = max(self._row_counts[title], first_row + len(keys) - 2)
+    
+    def _index_deleted(self, title: str, row_number: int):
+        """Drop a deleted row and shift every row below it up by one"""
+        with self._cache_lock:
+            index = self._row_index.get(title)
+            if index is None:
+                return
+            self._row_index[title] = {
+                key: row - 1 if row > row_number else row
+                for key, row in index.items()
+                if row != row_number
+            }
+            self._row_counts[title] -= 1
+    
+    def _drop_index(self, title: Optional[str] = None):
+        """Forget a sheet's row index (all of them if None); the next lookup re-reads the sheet"""
+        with self._cache_lock:
+            if title is None:
+                self._row_index.clear()
+                self._row_counts.clear()
             else:
-                self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_ID')
-        except ImportError:
-            self.spreadsheet_id = os.getenv('GOOGLE_SHEETS_ID')
-            
-        self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+                self._row_index.pop(title, None)
+                self._row_counts.pop(title, None)
+    
+    def _written(self, title: str):
+        """
+        Invalidate a sheet after one of our writes
         
-        # Cache for sheets
-        self.pilot_sheet = self.spreadsheet.worksheet('pilot_roster')
-        self.drone_sheet = self.spreadsheet.worksheet('drone_fleet')
-        self.missions_sheet = self.spreadsheet.worksheet('missions')
+        Inside a batch the write is only buffered: the cached rows still
+        match the sheet, and the flush invalidates it once the write is sent.
+        """
+        if self._active_batch() is None:
+            self.invalidate_cache(title)
+    
+    def invalidate_cache(self, title: Optional[str] = None):
+        """
+        Drop cached data so the next read fetches fresh rows
+        
+        Args:
+            title: Sheet to invalidate ('pilot_roster', 'drone_fleet' or
+                'missions'); all sheets if None
+        """
+        titles = [title] if title else list(SHEET_TITLES)
+        with self._cache_lock:
+            for t in titles:
+                self._versions[t] += 1
+                self._cache.pop(t, None)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get read-cache hit/miss counters"""
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+                'ttl': self.cache_ttl,
+                'cached_sheets': sorted(self._cache),
+                'concurrent': self.concurrent,
+                'fetch_timings': dict(self.last_fetch_timings),
+            }
     
     def _fix_dataframe_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Fix column names if they were read as a single comma-separated string"""
@@ -75,24 +996,134 @@ class SheetsManager:
             df.columns = col_names
         return df
     
-    def get_pilots(self) -> pd.DataFrame:
-        """Get all pilots data as DataFrame"""
-        data = self.pilot_sheet.get_all_records()
-        df = pd.DataFrame(data)
-        return self._fix_dataframe_columns(df)
+    @traced('sheets_method')
+    def get_pilots(self, typed: bool = False) -> pd.DataFrame:
+        """Get all pilots data as DataFrame (typed=True: available_from as datetime64)"""
+        return self._read_sheet('pilot_roster', typed)
     
-    def get_drones(self) -> pd.DataFrame:
-        """Get all drones data as DataFrame"""
-        data = self.drone_sheet.get_all_records()
-        df = pd.DataFrame(data)
-        return self._fix_dataframe_columns(df)
+    @traced('sheets_method')
+    def get_drones(self, typed: bool = False) -> pd.DataFrame:
+        """Get all drones data as DataFrame (typed=True: maintenance_due as datetime64)"""
+        return self._read_sheet('drone_fleet', typed)
+    
+    @traced('sheets_method')
+    def get_missions(self, typed: bool = False) -> pd.DataFrame:
+        """Get all missions data as DataFrame (typed=True: start/end dates as datetime64)"""
+        return self._read_sheet('missions', typed)
+    
+    @traced('sheets_method')
+    def get_snapshot(self, typed: bool = False) -> tuple:
+        """
+        Get pilots, drones and missions as one consistent set of DataFrames
+        
+        When any of the three sheets is not freshly cached, all three are
+        downloaded together in a single batched values request, so the
+        tables always come from the same point in time.
+        
+        Args:
+            typed: Return date columns as datetime64 (NaT for '–' and
+                malformed dates) instead of strings
+        
+        Returns:
+            (pilots, drones, missions) DataFrames
+        """
+        frames = self._snapshot_frames()
+        batch = self._active_batch()
+        if batch is not None:
+            # Inside a batch, include the writes it has buffered
+            for i, title in enumerate(SHEET_TITLES):
+                pending = batch.overlay(title, frames[i][0])
+                if pending is not frames[i][0]:
+                    frames[i] = (pending, self._type_dates(title, pending))
+        return tuple((typed_df if typed else df).copy() for df, typed_df in frames)
+    
+    def _snapshot_frames(self) -> List[tuple]:
+        """(df, typed_df) for each sheet, from the cache or one batched download (not copied)"""
+        with self._cache_lock:
+            now = time.monotonic()
+            entries = [self._cache.get(title) for title in SHEET_TITLES]
+            expired = [
+                title for title, entry in zip(SHEET_TITLES, entries)
+                if entry is None or entry[1] != self._versions[title] or now - entry[0] >= self.cache_ttl
+            ]
+            if not expired:
+                self.cache_hits += len(SHEET_TITLES)
+                get_metrics().inc('sheets_cache', len(SHEET_TITLES), sheet='snapshot', result='hit')
+                return [(entry[2], entry[3]) for entry in entries]
+            # Only expired by age: the revision can tell if they are still current
+            revalidate = self.delta_sync is not None and all(
+                self._cache.get(title) is not None and self._cache[title][1] == self._versions[title]
+                for title in expired
+            )
+        
+        revision = None
+        if revalidate:
+            stale, revision = self._revalidate(expired)
+            if not stale:
+                with self._cache_lock:
+                    entries = [self._cache.get(title) for title in SHEET_TITLES]
+                    if all(entry is not None for entry in entries):
+                        self.cache_hits += len(SHEET_TITLES)
+                        get_metrics().inc('sheets_cache', len(SHEET_TITLES), sheet='snapshot', result='revalidated')
+                        return [(entry[2], entry[3]) for entry in entries]
+        
+        if revision is None:
+            revision = self._snapshot_revision()
+        
+        with self._cache_lock:
+            self.cache_misses += len(SHEET_TITLES)
+            versions = [self._versions[title] for title in SHEET_TITLES]
+        get_metrics().inc('sheets_cache', len(SHEET_TITLES), sheet='snapshot', result='miss')
+        
+        requested_at = time.monotonic()
+        started = time.perf_counter()
+        try:
+            response = self._call('values_batch_get', None, self.spreadsheet.values_batch_get,
+                                  [f"'{title}'" for title in SHEET_TITLES])
+        except Exception as e:
+            frames = self._stale_frames(list(SHEET_TITLES), e)
+            if frames is None:
+                raise
+            return frames
+        self.last_fetch_timings['snapshot'] = time.perf_counter() - started
+        fetched_at = time.monotonic()
+        
+        frames = []
+        for title, version, value_range in zip(SHEET_TITLES, versions, response['valueRanges']):
+            df = self._values_to_dataframe(value_range.get('values', []))
+            key_column = KEY_COLUMNS[title]
+            keys = df[key_column].tolist() if key_column in df.columns else [''] * len(df)
+            frames.append(self._store_fetched(title, version, df, keys, fetched_at, revision, requested_at))
+        return frames
+    
+    @traced('sheets_method')
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the cached sheets up to date with the spreadsheet
+        
+        Sheets still within the cache TTL are left alone. Expired ones are
+        kept if the spreadsheet hasn't changed since they were downloaded
+        (one revision check); otherwise all three are downloaded in one
+        request, and listeners get an event for each row edited outside
+        this manager.
+        
+        Returns:
+            Delta sync counters (see DeltaSync.stats), or {} when delta sync is off
+        """
+        self._snapshot_frames()
+        return self.delta_sync.stats() if self.delta_sync is not None else {}
     
-    def get_missions(self) -> pd.DataFrame:
-        """Get all missions data as DataFrame"""
-        data = self.missions_sheet.get_all_records()
-        df = pd.DataFrame(data)
+    def _values_to_dataframe(self, values: List[List[Any]]) -> pd.DataFrame:
+        """Build a DataFrame from raw grid values (first row is the header)"""
+        if not values:
+            return pd.DataFrame()
+        header = values[0]
+        # The values API drops trailing empty cells; pad rows back to full width
+        rows = [row + [''] * (len(header) - len(row)) for row in values[1:]]
+        df = pd.DataFrame([row[:len(header)] for row in rows], columns=header)
         return self._fix_dataframe_columns(df)
     
+    @traced('sheets_method')
     def update_pilot_status(self, pilot_id: str, new_status: str) -> bool:
         """
         Update pilot status in Google Sheet
@@ -105,22 +1136,20 @@ class SheetsManager:
             bool: True if successful, False otherwise
         """
         try:
-            # Get all pilot data
-            pilots = self.pilot_sheet.get_all_records()
+            row_number = self._row_number('pilot_roster', pilot_id)
+            if row_number is None:
+                return False
             
-            # Find the pilot row (add 2: 1 for header, 1 for 0-indexing)
-            for idx, pilot in enumerate(pilots):
-                if pilot['pilot_id'] == pilot_id:
-                    row_number = idx + 2  # +2 because of header and 1-indexing
-                    # Update status column (column 6)
-                    self.pilot_sheet.update_cell(row_number, 6, new_status)
-                    return True
-            
-            return False
+            # Update status column (column 6)
+            self._write_cell('pilot_roster', row_number, 6, new_status)
+            self._written('pilot_roster')
+            self._emit('update', 'pilot_roster', pilot_id, {'status': new_status})
+            return True
         except Exception as e:
             print(f"Error updating pilot status: {e}")
             return False
     
+    @traced('sheets_method')
     def update_pilot_assignment(self, pilot_id: str, assignment: str, available_from: str = '–') -> bool:
         """
         Update pilot assignment in Google Sheet
@@ -134,22 +1163,24 @@ class SheetsManager:
             bool: True if successful
         """
         try:
-            pilots = self.pilot_sheet.get_all_records()
-            
-            for idx, pilot in enumerate(pilots):
-                if pilot['pilot_id'] == pilot_id:
-                    row_number = idx + 2
-                    # Update current_assignment (column 7) and available_from (column 8)
-                    self.pilot_sheet.update_cell(row_number, 7, assignment)
-                    if available_from != '–':
-                        self.pilot_sheet.update_cell(row_number, 8, available_from)
-                    return True
+            row_number = self._row_number('pilot_roster', pilot_id)
+            if row_number is None:
+                return False
             
-            return False
+            # Update current_assignment (column 7) and available_from (column 8)
+            self._write_cell('pilot_roster', row_number, 7, assignment)
+            changes = {'current_assignment': assignment}
+            if available_from != '–':
+                self._write_cell('pilot_roster', row_number, 8, available_from)
+                changes['available_from'] = available_from
+            self._written('pilot_roster')
+            self._emit('update', 'pilot_roster', pilot_id, changes)
+            return True
         except Exception as e:
             print(f"Error updating pilot assignment: {e}")
             return False
     
+    @traced('sheets_method')
     def update_drone_status(self, drone_id: str, new_status: str) -> bool:
         """
         Update drone status in Google Sheet
@@ -162,20 +1193,20 @@ class SheetsManager:
             bool: True if successful
         """
         try:
-            drones = self.drone_sheet.get_all_records()
-            
-            for idx, drone in enumerate(drones):
-                if drone['drone_id'] == drone_id:
-                    row_number = idx + 2
-                    # Update status column (column 4)
-                    self.drone_sheet.update_cell(row_number, 4, new_status)
-                    return True
+            row_number = self._row_number('drone_fleet', drone_id)
+            if row_number is None:
+                return False
             
-            return False
+            # Update status column (column 4)
+            self._write_cell('drone_fleet', row_number, 4, new_status)
+            self._written('drone_fleet')
+            self._emit('update', 'drone_fleet', drone_id, {'status': new_status})
+            return True
         except Exception as e:
             print(f"Error updating drone status: {e}")
             return False
     
+    @traced('sheets_method')
     def update_drone_assignment(self, drone_id: str, assignment: str) -> bool:
         """
         Update drone assignment in Google Sheet
@@ -188,20 +1219,49 @@ class SheetsManager:
             bool: True if successful
         """
         try:
-            drones = self.drone_sheet.get_all_records()
+            row_number = self._row_number('drone_fleet', drone_id)
+            if row_number is None:
+                return False
             
-            for idx, drone in enumerate(drones):
-                if drone['drone_id'] == drone_id:
-                    row_number = idx + 2
-                    # Update current_assignment (column 6)
-                    self.drone_sheet.update_cell(row_number, 6, assignment)
-                    return True
-            
-            return False
+            # Update current_assignment (column 6)
+            self._write_cell('drone_fleet', row_number, 6, assignment)
+            self._written('drone_fleet')
+            self._emit('update', 'drone_fleet', drone_id, {'current_assignment': assignment})
+            return True
         except Exception as e:
             print(f"Error updating drone assignment: {e}")
             return False
     
+    @traced('sheets_method')
+    def assign_mission(self, project_id: str, pilot_id: str, drone_id: str, available_from: str = '–') -> bool:
+        """
+        Assign a pilot and a drone to a mission in one batched write
+        
+        Args:
+            project_id: Mission project ID (e.g., 'PRJ001')
+            pilot_id: Pilot ID
+            drone_id: Drone ID
+            available_from: Date the pilot becomes available again (usually the mission end date)
+        
+        Returns:
+            bool: True if successful
+        """
+        try:
+            if not self._has_key('pilot_roster', pilot_id) or not self._has_key('drone_fleet', drone_id):
+                return False
+            
+            # Five cell edits across two sheets, sent as a single request
+            with self.batch():
+                self.update_pilot_status(pilot_id, 'Assigned')
+                self.update_pilot_assignment(pilot_id, project_id, available_from)
+                self.update_drone_status(drone_id, 'Assigned')
+                self.update_drone_assignment(drone_id, project_id)
+            return True
+        except Exception as e:
+            print(f"Error assigning mission: {e}")
+            return False
+    
+    @traced('sheets_method')
     def add_pilot(self, pilot_data: dict) -> bool:
         """
         Add a new pilot to Google Sheet
@@ -222,11 +1282,9 @@ class SheetsManager:
         """
         try:
             # Check if pilot_id already exists
-            pilots = self.pilot_sheet.get_all_records()
-            for pilot in pilots:
-                if pilot['pilot_id'] == pilot_data['pilot_id']:
-                    print(f"Pilot {pilot_data['pilot_id']} already exists")
-                    return False
+            if self._has_key('pilot_roster', pilot_data['pilot_id']):
+                print(f"Pilot {pilot_data['pilot_id']} already exists")
+                return False
             
             # Append new row
             row = [
@@ -239,12 +1297,15 @@ class SheetsManager:
                 pilot_data.get('current_assignment', '–'),
                 pilot_data.get('available_from', '–')
             ]
-            self.pilot_sheet.append_row(row)
+            self._append_row('pilot_roster', row)
+            self._written('pilot_roster')
+            self._emit('add', 'pilot_roster', pilot_data['pilot_id'], dict(zip(SHEET_COLUMNS['pilot_roster'], row)))
             return True
         except Exception as e:
             print(f"Error adding pilot: {e}")
             return False
     
+    @traced('sheets_method')
     def add_drone(self, drone_data: dict) -> bool:
         """
         Add a new drone to Google Sheet
@@ -264,11 +1325,9 @@ class SheetsManager:
         """
         try:
             # Check if drone_id already exists
-            drones = self.drone_sheet.get_all_records()
-            for drone in drones:
-                if drone['drone_id'] == drone_data['drone_id']:
-                    print(f"Drone {drone_data['drone_id']} already exists")
-                    return False
+            if self._has_key('drone_fleet', drone_data['drone_id']):
+                print(f"Drone {drone_data['drone_id']} already exists")
+                return False
             
             # Append new row
             row = [
@@ -280,12 +1339,133 @@ class SheetsManager:
                 drone_data.get('current_assignment', '–'),
                 drone_data.get('maintenance_due', '2026-12-31')
             ]
-            self.drone_sheet.append_row(row)
+            self._append_row('drone_fleet', row)
+            self._written('drone_fleet')
+            self._emit('add', 'drone_fleet', drone_data['drone_id'], dict(zip(SHEET_COLUMNS['drone_fleet'], row)))
             return True
         except Exception as e:
             print(f"Error adding drone: {e}")
             return False
     
+    @traced('sheets_method')
+    def add_pilots(self, source: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Bulk-add pilots from a DataFrame or CSV file
+        
+        Args:
+            source: DataFrame or CSV path with the pilot_roster columns
+                (status, current_assignment and available_from are optional)
+        
+        Returns:
+            DataFrame report with one row per input row:
+            row, pilot_id, accepted, reason
+        """
+        return self._bulk_add('pilot_roster', source)
+    
+    @traced('sheets_method')
+    def add_drones(self, source: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Bulk-add drones from a DataFrame or CSV file
+        
+        Args:
+            source: DataFrame or CSV path with the drone_fleet columns
+                (status, current_assignment and maintenance_due are optional)
+        
+        Returns:
+            DataFrame report with one row per input row:
+            row, drone_id, accepted, reason
+        """
+        return self._bulk_add('drone_fleet', source)
+    
+    @traced('sheets_method')
+    def add_missions(self, source: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """
+        Bulk-add missions from a DataFrame or CSV file
+        
+        Args:
+            source: DataFrame or CSV path with the missions columns
+                (priority is optional)
+        
+        Returns:
+            DataFrame report with one row per input row:
+            row, project_id, accepted, reason
+        """
+        return self._bulk_add('missions', source)
+    
+    def _bulk_add(self, title: str, source: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """Validate rows in one vectorized pass and append the valid ones with one call"""
+        key_column = KEY_COLUMNS[title]
+        columns = SHEET_COLUMNS[title]
+        defaults = COLUMN_DEFAULTS[title]
+        
+        if isinstance(source, str):
+            df = pd.read_csv(source, dtype=str, keep_default_na=False)
+        else:
+            df = source.copy()
+        df.columns = df.columns.str.lower().str.strip()
+        df = df.reset_index(drop=True)
+        
+        report = pd.DataFrame({
+            'row': np.arange(len(df)),
+            key_column: df[key_column].astype(str).str.strip() if key_column in df.columns else '',
+            'accepted': False,
+            'reason': '',
+        })
+        
+        missing_columns = [c for c in columns if c not in df.columns and c not in defaults]
+        if missing_columns:
+            report['reason'] = f"Missing column(s): {', '.join(missing_columns)}"
+            return report
+        
+        # Normalise to stripped strings and fill optional columns
+        for column in columns:
+            if column not in df.columns:
+                df[column] = defaults[column]
+            df[column] = df[column].fillna('').astype(str).str.strip()
+            if column in defaults:
+                df.loc[df[column] == '', column] = defaults[column]
+        
+        # Each check is a boolean Series; a row is rejected for the first one that fails
+        required = [c for c in columns if c not in defaults]
+        checks = [
+            (df[required].eq('').any(axis=1), 'Missing required value'),
+            (df[key_column].isin(self._known_ids(title)), f'{key_column} already exists'),
+            (df[key_column].duplicated(keep='first'), f'Duplicate {key_column} in import'),
+        ]
+        if title in VALID_STATUSES:
+            checks.append((~df['status'].isin(VALID_STATUSES[title]), 'Invalid status'))
+        dates = {}
+        for column in DATE_COLUMNS[title]:
+            dates[column] = pd.to_datetime(df[column], format=DATE_FORMAT, errors='coerce')
+            checks.append((dates[column].isna() & ~df[column].isin(NO_DATE), f'Invalid {column}'))
+        if title == 'missions':
+            checks.append((dates['end_date'] < dates['start_date'], 'end_date before start_date'))
+        
+        report['reason'] = np.select(
+            [mask.to_numpy() for mask, _ in checks],
+            [reason for _, reason in checks],
+            default=''
+        )
+        report['accepted'] = report['reason'] == ''
+        
+        accepted = df.loc[report['accepted'].to_numpy(), columns]
+        if len(accepted) == 0:
+            return report
+        
+        try:
+            rows = accepted.values.tolist()
+            self._append_rows(title, rows)
+            for row in rows:
+                self._emit('add', title, row[0], dict(zip(columns, row)))
+        except Exception as e:
+            print(f"Error bulk adding to {title}: {e}")
+            report.loc[report['accepted'], 'reason'] = f"Write failed: {e}"
+            report['accepted'] = False
+        finally:
+            self._written(title)
+        return report
+    
+    @traced('sheets_method')
     def delete_pilot(self, pilot_id: str) -> bool:
         """
         Delete a pilot from Google Sheet
@@ -297,17 +1477,16 @@ class SheetsManager:
             bool: True if successful
         """
         try:
-            pilots = self.pilot_sheet.get_all_records()
-            for idx, pilot in enumerate(pilots):
-                if pilot['pilot_id'] == pilot_id:
-                    row_number = idx + 2  # +2 for header and 1-indexing
-                    self.pilot_sheet.delete_row(row_number)
-                    return True
-            return False
+            if not self._delete_row('pilot_roster', pilot_id):
+                return False
+            self.invalidate_cache('pilot_roster')
+            self._emit('delete', 'pilot_roster', pilot_id)
+            return True
         except Exception as e:
             print(f"Error deleting pilot: {e}")
             return False
     
+    @traced('sheets_method')
     def delete_drone(self, drone_id: str) -> bool:
         """
         Delete a drone from Google Sheet
@@ -319,23 +1498,34 @@ class SheetsManager:
             bool: True if successful
         """
         try:
-            drones = self.drone_sheet.get_all_records()
-            for idx, drone in enumerate(drones):
-                if drone['drone_id'] == drone_id:
-                    row_number = idx + 2  # +2 for header and 1-indexing
-                    self.drone_sheet.delete_row(row_number)
-                    return True
-            return False
+            if not self._delete_row('drone_fleet', drone_id):
+                return False
+            self.invalidate_cache('drone_fleet')
+            self._emit('delete', 'drone_fleet', drone_id)
+            return True
         except Exception as e:
             print(f"Error deleting drone: {e}")
             return False
     
+    @traced('sheets_method')
     def refresh_data(self):
         """Refresh cached data from Google Sheets"""
-        # Re-fetch worksheets to get latest data
-        self.pilot_sheet = self.spreadsheet.worksheet('pilot_roster')
-        self.drone_sheet = self.spreadsheet.worksheet('drone_fleet')
-        self.missions_sheet = self.spreadsheet.worksheet('missions')
+        if self.delta_sync is not None:
+            # Treat every cached sheet as expired; only changed data is downloaded
+            with self._cache_lock:
+                for title, entry in list(self._cache.items()):
+                    self._cache[title] = (float('-inf'),) + entry[1:]
+            self.sync()
+            return
+        
+        # Re-fetch worksheets to get latest data (lazily: on their next use)
+        if self.lazy:
+            self._handles.clear()
+        else:
+            self._open_worksheets()
+        self.invalidate_cache()
+        self._drop_index()
+        self._notify({'action': 'reload', 'sheet': None, 'key': None, 'values': {}})
 
 
 # Singleton instance
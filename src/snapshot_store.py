@@ -0,0 +1,205 @@
+"""
+Snapshot Store
+Keeps a copy of the three sheets in a local SQLite file, so a restarted
+app can show data before its first API call, and can keep answering in a
+stale read-only mode while Google Sheets is unreachable
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+
+from src.config import get_setting
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    title TEXT PRIMARY KEY,
+    key_column TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    revision TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    title TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (title, position)
+);
+CREATE INDEX IF NOT EXISTS rows_by_key ON rows (title, key);
+"""
+
+
+class SnapshotStore:
+    """
+    The last known contents of each sheet, on disk
+
+    save() replaces a sheet after each successful download, and apply()
+    (registered as a SheetsManager listener) writes every change through
+    row by row, so the file always matches what the app last saw. Each
+    sheet also records when it was last known to match the spreadsheet
+    (synced_at): a download, or a revision check passed to confirm(). The
+    writes run in order on one background thread, off the request path;
+    flush() waits for them. Errors are printed and never reach the caller.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite file; created (with its directory) if missing
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot')
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use (call with the lock held)"""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def _run(self, action: str, func, *args):
+        """Run a write on the background thread, printing any error"""
+        def task():
+            try:
+                with self._lock:
+                    db = self._connection()
+                    with db:
+                        func(db, *args)
+            except Exception as e:
+                print(f"Error {action} snapshot: {e}")
+        self._writer.submit(task)
+
+    def flush(self):
+        """Wait for the queued writes to finish"""
+        self._writer.submit(lambda: None).result()
+
+    def save(self, title: str, key_column: str, df: pd.DataFrame, revision: Optional[str] = None):
+        """
+        Replace a sheet with a fresh download (in the background)
+
+        Args:
+            title: Sheet title
+            key_column: The sheet's primary key column
+            df: The downloaded sheet (not modified afterwards)
+            revision: Spreadsheet revision the download is current for
+        """
+        self._run('saving', self._save, title, key_column, df, revision, time.time())
+
+    def _save(self, db: sqlite3.Connection, title: str, key_column: str, df: pd.DataFrame,
+              revision: Optional[str], synced_at: float):
+        columns = [str(column) for column in df.columns]
+        position = columns.index(key_column) if key_column in columns else None
+        rows = zip(*(df.iloc[:, i].tolist() for i in range(len(columns))))
+        db.execute("DELETE FROM rows WHERE title = ?", (title,))
+        db.executemany(
+            "INSERT INTO rows (title, position, key, data) VALUES (?, ?, ?, ?)",
+            (
+                (title, number, str(values[position]) if position is not None else '', json.dumps(values, default=str))
+                for number, values in enumerate(rows)
+            )
+        )
+        db.execute(
+            "INSERT OR REPLACE INTO sheets (title, key_column, columns, revision, synced_at) VALUES (?, ?, ?, ?, ?)",
+            (title, key_column, json.dumps(columns), revision, synced_at)
+        )
+
+    def confirm(self, titles: List[str]):
+        """Record that the saved sheets still matched the spreadsheet just now (in the background)"""
+        self._run('updating', self._confirm, list(titles), time.time())
+
+    def _confirm(self, db: sqlite3.Connection, titles: List[str], synced_at: float):
+        db.executemany("UPDATE sheets SET synced_at = ? WHERE title = ?", ((synced_at, title) for title in titles))
+
+    def apply(self, event: Dict[str, Any]):
+        """
+        Write a SheetsManager change event through to the snapshot (in the background)
+
+        Args:
+            event: Dict with action, sheet, key and values (see SheetsManager.add_listener)
+        """
+        if event['action'] in ('update', 'add', 'delete'):
+            self._run('updating', self._apply, event)
+
+    def _apply(self, db: sqlite3.Connection, event: Dict[str, Any]):
+        title, key, values = event['sheet'], str(event['key']), event['values']
+        sheet = db.execute("SELECT columns FROM sheets WHERE title = ?", (title,)).fetchone()
+        if sheet is None:
+            return  # never saved: the first download stores the whole sheet
+        columns = json.loads(sheet[0])
+        # Rows are matched by key, first occurrence, like SheetsManager's row index
+        row = db.execute(
+            "SELECT position, data FROM rows WHERE title = ? AND key = ? ORDER BY position LIMIT 1", (title, key)
+        ).fetchone()
+
+        if event['action'] == 'delete':
+            if row is not None:
+                db.execute("DELETE FROM rows WHERE title = ? AND position = ?", (title, row[0]))
+        elif event['action'] == 'update' or row is not None:
+            if row is None:
+                return
+            data = dict(zip(columns, json.loads(row[1])))
+            data.update(values)
+            db.execute(
+                "UPDATE rows SET data = ? WHERE title = ? AND position = ?",
+                (json.dumps([data.get(column, '') for column in columns], default=str), title, row[0])
+            )
+        else:  # add
+            last = db.execute("SELECT MAX(position) FROM rows WHERE title = ?", (title,)).fetchone()[0]
+            db.execute(
+                "INSERT INTO rows (title, position, key, data) VALUES (?, ?, ?, ?)",
+                (title, (last if last is not None else -1) + 1, key,
+                 json.dumps([values.get(column, '') for column in columns], default=str))
+            )
+
+    def load(self) -> Dict[str, Tuple[pd.DataFrame, float, Optional[str]]]:
+        """
+        Read every saved sheet
+
+        Returns:
+            {title: (DataFrame, synced_at as a Unix time, revision)}; empty
+            if nothing was saved yet or the file can't be read
+        """
+        self.flush()
+        try:
+            with self._lock:
+                db = self._connection()
+                sheets = db.execute("SELECT title, columns, revision, synced_at FROM sheets").fetchall()
+                data = {
+                    title: [json.loads(row[0]) for row in db.execute(
+                        "SELECT data FROM rows WHERE title = ? ORDER BY position", (title,)
+                    )]
+                    for title, _, _, _ in sheets
+                }
+        except Exception as e:
+            print(f"Error loading snapshot: {e}")
+            return {}
+        return {
+            title: (pd.DataFrame(data[title], columns=json.loads(columns)), synced_at, revision)
+            for title, columns, revision, synced_at in sheets
+        }
+
+    def close(self):
+        """Finish the queued writes and close the file"""
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def snapshot_store_from_settings() -> Optional[SnapshotStore]:
+    """The SnapshotStore at the SNAPSHOT_FILE setting, or None if it is empty"""
+    path = get_setting('SNAPSHOT_FILE', '.cache/sheets_snapshot.sqlite')
+    return SnapshotStore(path) if path else None
@@ -0,0 +1,303 @@
+"""
+Storage Backends
+Opens the spreadsheet that SheetsManager reads and writes.
+
+A backend is any object with the gspread Spreadsheet surface SheetsManager
+uses (``worksheet(title)``, ``values_batch_get``, ``values_batch_update`` and,
+for delta sync, ``get_lastUpdateTime``), whose worksheets provide
+``get_all_records``, ``get_all_values``, ``update_cell``, ``append_row``,
+``append_rows`` and ``delete_row``.
+The 'google' backend is a real gspread Spreadsheet; the 'local' backend keeps
+the three tables in memory, seeded from the CSV files in ``data/``.
+The 'fake' backend serves the local tables through src/fake_gspread.py,
+which counts API calls and can simulate latency and the 429 quota.
+"""
+
+import csv
+import os
+import re
+import threading
+from typing import Dict, List, Any, Optional
+
+from src.config import get_setting, get_bool_setting, get_float_setting
+
+# Worksheet title -> seed file in the local data directory
+SHEET_FILES = {
+    'pilot_roster': 'pilot_roster.csv',
+    'drone_fleet': 'drone_fleet.csv',
+    'missions': 'missions.csv',
+}
+
+A1_PATTERN = re.compile(r"^(?:'?(?P<title>[^'!]+)'?!)?(?P<col>[A-Z]+)(?P<row>\d+)(?::(?P<end_col>[A-Z]+)(?P<end_row>\d+))?$")
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def rowcol_to_a1(row: int, col: int) -> str:
+    """Convert a 1-indexed (row, col) pair to A1 notation, e.g. (2, 6) -> 'F2'"""
+    letters = ''
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"{letters}{row}"
+
+
+def a1_to_rowcol(label: str) -> tuple:
+    """Convert an A1 cell label to a 1-indexed (row, col) pair, e.g. 'F2' -> (2, 6)"""
+    match = re.match(r'^([A-Z]+)(\d+)$', label)
+    if not match:
+        raise ValueError(f"Invalid A1 cell label '{label}'")
+    col = 0
+    for char in match.group(1):
+        col = col * 26 + ord(char) - 64
+    return int(match.group(2)), col
+
+
+class LocalWorksheet:
+    """In-memory worksheet that mirrors the gspread Worksheet calls we use"""
+
+    def __init__(self, spreadsheet: 'LocalSpreadsheet', title: str, values: List[List[str]]):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        # Row 1 is the header, exactly like the Google Sheet grid
+        self._values = [[str(v) for v in row] for row in values]
+        self._append_lock = threading.Lock()
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the grid, including the header"""
+        return len(self._values)
+
+    def get_all_values(self) -> List[List[str]]:
+        """Get every row (header included) as lists of strings"""
+        return [list(row) for row in self._values]
+
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        """Get every data row as a dict keyed by the header row"""
+        if not self._values:
+            return []
+        header = self._values[0]
+        records = []
+        for row in self._values[1:]:
+            padded = row + [''] * (len(header) - len(row))
+            records.append(dict(zip(header, padded)))
+        return records
+
+    def update_cell(self, row: int, col: int, value: Any):
+        """Set a single cell (1-indexed, like gspread)"""
+        while len(self._values) < row:
+            self._values.append([])
+        cells = self._values[row - 1]
+        while len(cells) < col:
+            cells.append('')
+        cells[col - 1] = str(value)
+        self.spreadsheet._changed(self)
+
+    def append_row(self, values: List[Any], value_input_option: str = 'RAW') -> Dict[str, Any]:
+        """Append a row after the last row of the table"""
+        return self.append_rows([values], value_input_option)
+
+    def append_rows(self, values: List[List[Any]], value_input_option: str = 'RAW') -> Dict[str, Any]:
+        """
+        Append several rows in one call
+
+        Returns:
+            The Sheets API append response; updates.updatedRange is where
+            the rows landed
+        """
+        rows = [[str(v) for v in row] for row in values]
+        with self._append_lock:
+            self._values.extend(rows)
+            end = len(self._values)
+        self.spreadsheet._changed(self)
+        width = max([len(row) for row in rows] + [1])
+        return {'updates': {
+            'updatedRange': f"'{self.title}'!A{end - len(rows) + 1}:{rowcol_to_a1(end, width)}",
+            'updatedRows': len(rows),
+        }}
+
+    def update_values(self, row: int, col: int, values: List[List[Any]]):
+        """Write a block of values whose top-left cell is (row, col)"""
+        for r, row_values in enumerate(values):
+            while len(self._values) < row + r:
+                self._values.append([])
+            cells = self._values[row + r - 1]
+            while len(cells) < col + len(row_values) - 1:
+                cells.append('')
+            for c, value in enumerate(row_values):
+                cells[col + c - 1] = str(value)
+        self.spreadsheet._changed(self)
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None):
+        """Delete rows start_index..end_index (1-indexed, inclusive)"""
+        end_index = end_index or start_index
+        del self._values[start_index - 1:end_index]
+        self.spreadsheet._changed(self)
+
+    def delete_row(self, index: int):
+        """Delete a single row (1-indexed); rows below shift up by one"""
+        self.delete_rows(index)
+
+
+class LocalSpreadsheet:
+    """
+    In-memory spreadsheet seeded from CSV files
+
+    Args:
+        data_dir: Directory containing pilot_roster.csv, drone_fleet.csv and missions.csv
+        persist: Write each change back to the CSV file it came from
+    """
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, persist: bool = False):
+        self.data_dir = data_dir
+        self.persist = persist
+        self.revision = 0
+        self._worksheets: Dict[str, LocalWorksheet] = {}
+
+        for title, filename in SHEET_FILES.items():
+            path = os.path.join(data_dir, filename)
+            values = []
+            if os.path.exists(path):
+                with open(path, newline='', encoding='utf-8') as f:
+                    values = [row for row in csv.reader(f)]
+            self._worksheets[title] = LocalWorksheet(self, title, values)
+
+    @classmethod
+    def from_values(cls, tables: Dict[str, List[List[Any]]]) -> 'LocalSpreadsheet':
+        """
+        Build an in-memory spreadsheet from grid values instead of CSV files
+
+        Args:
+            tables: Worksheet title -> rows, header row first
+        """
+        spreadsheet = cls.__new__(cls)
+        spreadsheet.data_dir = None
+        spreadsheet.persist = False
+        spreadsheet.revision = 0
+        spreadsheet._worksheets = {}
+        for title, values in tables.items():
+            spreadsheet._worksheets[title] = LocalWorksheet(spreadsheet, title, values)
+        return spreadsheet
+
+    def worksheet(self, title: str) -> LocalWorksheet:
+        """Get a worksheet by title"""
+        if title not in self._worksheets:
+            raise KeyError(f"Worksheet '{title}' not found")
+        return self._worksheets[title]
+
+    def worksheets(self) -> List[LocalWorksheet]:
+        """Get all worksheets"""
+        return list(self._worksheets.values())
+
+    def values_batch_update(self, body: Dict[str, Any]):
+        """
+        Write several ranges in one call (mirrors Spreadsheet.values_batch_update)
+
+        Args:
+            body: {'valueInputOption': ..., 'data': [{'range': "'sheet'!A1", 'values': [[...]]}]}
+        """
+        for entry in body.get('data', []):
+            match = A1_PATTERN.match(entry['range'])
+            if not match or not match.group('title'):
+                raise ValueError(f"Invalid range '{entry['range']}'")
+            row, col = a1_to_rowcol(match.group('col') + match.group('row'))
+            self.worksheet(match.group('title')).update_values(row, col, entry['values'])
+        return {'totalUpdatedRanges': len(body.get('data', []))}
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Read several ranges in one call (mirrors Spreadsheet.values_batch_get)
+
+        Only whole-sheet ranges (a worksheet title, optionally quoted) are supported.
+        """
+        value_ranges = []
+        for name in ranges:
+            title = name.split('!')[0].strip("'")
+            values = self.worksheet(title).get_all_values()
+            width = len(values[0]) if values else 0
+            value_ranges.append({
+                'range': f"'{title}'!A1:{rowcol_to_a1(max(len(values), 1), max(width, 1))}",
+                'majorDimension': 'ROWS',
+                'values': values,
+            })
+        return {'valueRanges': value_ranges}
+
+    def get_lastUpdateTime(self) -> str:
+        """Stand-in for the Drive modifiedTime gspread reports: changes with every write"""
+        return str(self.revision)
+
+    def _changed(self, worksheet: LocalWorksheet):
+        """Called after every write; bumps the revision and saves the sheet back to CSV when persisting"""
+        self.revision += 1
+        if not self.persist or worksheet.title not in SHEET_FILES:
+            return
+        path = os.path.join(self.data_dir, SHEET_FILES[worksheet.title])
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(worksheet._values)
+
+
+def open_google_spreadsheet():
+    """Authorize with the service account and open the configured Google Sheet"""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = [
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive'
+    ]
+
+    # Try to load from Streamlit secrets first (for cloud deployment)
+    creds = None
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
+            creds = Credentials.from_service_account_info(
+                st.secrets['gcp_service_account'],
+                scopes=scopes
+            )
+    except ImportError:
+        # Running without Streamlit, use local file
+        pass
+
+    if creds is None:
+        credentials_file = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE', 'credentials.json')
+        creds = Credentials.from_service_account_file(credentials_file, scopes=scopes)
+
+    client = gspread.authorize(creds)
+    return client.open_by_key(get_setting('GOOGLE_SHEETS_ID'))
+
+
+def open_spreadsheet(backend: Optional[str] = None):
+    """
+    Open the spreadsheet for the configured storage backend
+
+    Args:
+        backend: 'google', 'local' or 'fake'; defaults to the STORAGE_BACKEND setting
+
+    Returns:
+        A gspread Spreadsheet, a LocalSpreadsheet, or a FakeSpreadsheet
+        (the local data with simulated API latency and quota)
+    """
+    backend = (backend or get_setting('STORAGE_BACKEND', 'google')).lower()
+
+    if backend in ('local', 'fake'):
+        spreadsheet = LocalSpreadsheet(
+            data_dir=get_setting('LOCAL_DATA_DIR', DEFAULT_DATA_DIR),
+            persist=get_bool_setting('LOCAL_DATA_PERSIST', False)
+        )
+        if backend == 'local':
+            return spreadsheet
+        # The local data behind simulated API latency and quota
+        from src.fake_gspread import FakeSpreadsheet
+        read_quota = int(get_float_setting('FAKE_SHEETS_READ_QUOTA', 0))
+        write_quota = int(get_float_setting('FAKE_SHEETS_WRITE_QUOTA', 0))
+        return FakeSpreadsheet(
+            spreadsheet,
+            latency=get_float_setting('FAKE_SHEETS_LATENCY', 0.0),
+            read_quota=read_quota or None,
+            write_quota=write_quota or None
+        )
+    if backend == 'google':
+        return open_google_spreadsheet()
+
+    raise ValueError(f"Unknown storage backend '{backend}'. Use 'google', 'local' or 'fake'.")
@@ -0,0 +1,196 @@
+"""
+Synthetic Fleet Generator
+Seeded pilot rosters, drone fleets and missions with the sheet column
+schemas, for benchmarks and load tests at 10^3 - 10^6 rows
+"""
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from src.storage import LocalSpreadsheet
+
+# Cities weighted towards the two main hubs, like the real roster
+LOCATIONS = ['Bangalore', 'Mumbai', 'Delhi', 'Pune', 'Hyderabad', 'Chennai', 'Kolkata', 'Ahmedabad']
+LOCATION_WEIGHTS = [0.25, 0.22, 0.12, 0.1, 0.1, 0.09, 0.07, 0.05]
+
+SKILLS = ['Mapping', 'Survey', 'Inspection', 'Thermal']
+CAPABILITIES = ['RGB', 'Thermal', 'LiDAR', 'Multispectral']
+CERTIFICATIONS = ['DGCA', 'DGCA, Night Ops']
+
+FIRST_NAMES = [
+    'Arjun', 'Neha', 'Rohit', 'Sneha', 'Vikram', 'Priya', 'Karan', 'Ananya', 'Rahul', 'Divya',
+    'Aditya', 'Meera', 'Sanjay', 'Kavya', 'Nikhil', 'Pooja', 'Varun', 'Isha', 'Manish', 'Ritu',
+]
+LAST_NAMES = [
+    'Sharma', 'Iyer', 'Patel', 'Reddy', 'Nair', 'Gupta', 'Rao', 'Menon', 'Singh', 'Das',
+    'Kulkarni', 'Joshi', 'Bose', 'Pillai', 'Chopra', 'Mehta',
+]
+DRONE_MODELS = ['DJI M300', 'DJI M350', 'DJI Mavic 3', 'DJI Mavic 3T', 'Autel Evo II', 'senseFly eBee X']
+CLIENT_PREFIXES = ['Apex', 'Blue', 'Coastal', 'Delta', 'Everest', 'Green', 'Horizon', 'Metro', 'Orion', 'Sun']
+CLIENT_SUFFIXES = ['Infra', 'Energy', 'Agro', 'Mining', 'Realty', 'Telecom', 'Logistics', 'Surveys']
+
+PILOT_STATUSES = ['Available', 'Assigned', 'On Leave']
+PILOT_STATUS_WEIGHTS = [0.65, 0.25, 0.1]
+DRONE_STATUSES = ['Available', 'Maintenance', 'Assigned']
+DRONE_STATUS_WEIGHTS = [0.65, 0.1, 0.25]
+PRIORITIES = ['Urgent', 'High', 'Standard']
+PRIORITY_WEIGHTS = [0.15, 0.35, 0.5]
+
+# Missions start within this many days of the base date
+MISSION_WINDOW_DAYS = 180
+NO_VALUE = '–'
+
+
+def _ids(prefix: str, n: int) -> np.ndarray:
+    """Sequential IDs such as P001 or P000123, zero-padded to fit n"""
+    width = max(3, len(str(n)))
+    return np.char.add(prefix, np.char.zfill(np.arange(1, n + 1).astype(str), width)).astype(object)
+
+
+def _combos(tokens: Sequence[str]) -> List[str]:
+    """Every non-empty subset of tokens as a comma-separated string, indexed by bitmask"""
+    return [''] + [
+        ', '.join(t for bit, t in enumerate(tokens) if mask >> bit & 1)
+        for mask in range(1, 2 ** len(tokens))
+    ]
+
+
+def _tag_sets(rng: np.random.Generator, tokens: Sequence[str], n: int, max_tags: int = 2) -> np.ndarray:
+    """Pick 1..max_tags distinct tokens per row, as comma-separated strings"""
+    masks = np.zeros(n, dtype=np.int64)
+    counts = rng.integers(1, max_tags + 1, n)
+    for i in range(max_tags):
+        bits = rng.integers(0, len(tokens), n)
+        masks |= np.where(counts > i, 1 << bits, 0)
+    return np.array(_combos(tokens), dtype=object)[masks]
+
+
+def _dates(base: pd.Timestamp, offsets: np.ndarray) -> np.ndarray:
+    """Dates as 'YYYY-MM-DD' strings, offsets in days from base"""
+    values = base.to_datetime64().astype('datetime64[D]') + offsets.astype('timedelta64[D]')
+    return values.astype(str).astype(object)
+
+
+def generate_missions(n: int, rng: np.random.Generator, base: pd.Timestamp) -> pd.DataFrame:
+    """Missions spread over the next MISSION_WINDOW_DAYS, lasting 1-10 days"""
+    start = rng.integers(0, MISSION_WINDOW_DAYS, n)
+    duration = rng.integers(0, 10, n)
+    clients = np.array([f"{a} {b}" for a, b in itertools.product(CLIENT_PREFIXES, CLIENT_SUFFIXES)], dtype=object)
+    return pd.DataFrame({
+        'project_id': _ids('PRJ', n),
+        'client': rng.choice(clients, n),
+        'location': rng.choice(LOCATIONS, n, p=LOCATION_WEIGHTS).astype(object),
+        'required_skills': _tag_sets(rng, SKILLS, n, max_tags=1),
+        'required_certs': rng.choice(CERTIFICATIONS, n, p=[0.7, 0.3]).astype(object),
+        'start_date': _dates(base, start),
+        'end_date': _dates(base, start + duration),
+        'priority': rng.choice(PRIORITIES, n, p=PRIORITY_WEIGHTS).astype(object),
+    })
+
+
+def _assign(rng: np.random.Generator, status: np.ndarray, location: np.ndarray,
+            missions: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Give every 'Assigned' row a mission, moving it to the mission's location
+
+    Returns:
+        (current_assignment, location, index of the mission or -1)
+    """
+    assigned = status == 'Assigned'
+    if len(missions) == 0:
+        status[assigned] = 'Available'
+        assigned[:] = False
+    picks = np.where(assigned, rng.integers(0, max(len(missions), 1), len(status)), -1)
+    assignment = np.full(len(status), NO_VALUE, dtype=object)
+    location = location.copy()
+    if assigned.any():
+        assignment[assigned] = missions['project_id'].to_numpy()[picks[assigned]]
+        location[assigned] = missions['location'].to_numpy()[picks[assigned]]
+    return assignment, location, picks
+
+
+def generate_pilots(n: int, rng: np.random.Generator, base: pd.Timestamp, missions: pd.DataFrame) -> pd.DataFrame:
+    """Pilots; assigned ones are on a real mission and free the day after it ends"""
+    status = rng.choice(PILOT_STATUSES, n, p=PILOT_STATUS_WEIGHTS).astype(object)
+    location = rng.choice(LOCATIONS, n, p=LOCATION_WEIGHTS).astype(object)
+    assignment, location, picks = _assign(rng, status, location, missions)
+
+    available_from = np.where(rng.random(n) < 0.5, NO_VALUE, _dates(base, rng.integers(-10, 20, n)))
+    on_leave = status == 'On Leave'
+    available_from[on_leave] = _dates(base, rng.integers(7, 60, int(on_leave.sum())))
+    assigned = picks >= 0
+    if assigned.any():
+        end = pd.to_datetime(missions['end_date'].to_numpy()[picks[assigned]]) + pd.Timedelta(days=1)
+        available_from[assigned] = end.strftime('%Y-%m-%d').to_numpy(dtype=object)
+
+    names = np.char.add(np.char.add(rng.choice(FIRST_NAMES, n), ' '), rng.choice(LAST_NAMES, n)).astype(object)
+    return pd.DataFrame({
+        'pilot_id': _ids('P', n),
+        'name': names,
+        'skills': _tag_sets(rng, SKILLS, n, max_tags=3),
+        'certifications': rng.choice(CERTIFICATIONS, n, p=[0.6, 0.4]).astype(object),
+        'location': location,
+        'status': status,
+        'current_assignment': assignment,
+        'available_from': available_from.astype(object),
+    })
+
+
+def generate_drones(n: int, rng: np.random.Generator, base: pd.Timestamp, missions: pd.DataFrame) -> pd.DataFrame:
+    """Drones; a few are overdue for maintenance, assigned ones are on a real mission"""
+    status = rng.choice(DRONE_STATUSES, n, p=DRONE_STATUS_WEIGHTS).astype(object)
+    location = rng.choice(LOCATIONS, n, p=LOCATION_WEIGHTS).astype(object)
+    assignment, location, _ = _assign(rng, status, location, missions)
+    return pd.DataFrame({
+        'drone_id': _ids('D', n),
+        'model': rng.choice(DRONE_MODELS, n).astype(object),
+        'capabilities': _tag_sets(rng, CAPABILITIES, n, max_tags=2),
+        'status': status,
+        'location': location,
+        'current_assignment': assignment,
+        'maintenance_due': _dates(base, rng.integers(-20, 365, n)),
+    })
+
+
+def generate_fleet(
+    n_pilots: int,
+    n_drones: Optional[int] = None,
+    n_missions: Optional[int] = None,
+    seed: int = 0,
+    base_date: str = '2026-02-01'
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Generate a consistent roster, fleet and mission list
+
+    The same arguments always give the same data. Assigned pilots and
+    drones point at generated missions in the same location.
+
+    Args:
+        n_pilots: Pilot rows
+        n_drones: Drone rows (default: same as n_pilots)
+        n_missions: Mission rows (default: half of n_pilots)
+        seed: Random seed
+        base_date: Date the schedule is generated around
+
+    Returns:
+        (pilots, drones, missions) DataFrames with the sheet column schemas
+    """
+    n_drones = n_pilots if n_drones is None else n_drones
+    n_missions = max(n_pilots // 2, 1) if n_missions is None else n_missions
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp(base_date)
+
+    missions = generate_missions(n_missions, rng, base)
+    pilots = generate_pilots(n_pilots, rng, base, missions)
+    drones = generate_drones(n_drones, rng, base, missions)
+    return pilots, drones, missions
+
+
+def to_spreadsheet(pilots: pd.DataFrame, drones: pd.DataFrame, missions: pd.DataFrame) -> LocalSpreadsheet:
+    """Load generated tables into an in-memory LocalSpreadsheet (nothing is written to disk)"""
+    tables: Dict[str, List[List[str]]] = {}
+    for title, df in (('pilot_roster', pilots), ('drone_fleet', drones), ('missions', missions)):
+        tables[title] = [list(df.columns)] + df.astype(str).to_numpy().tolist()
+    return LocalSpreadsheet.from_values(tables)
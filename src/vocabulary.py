@@ -0,0 +1,153 @@
+"""
+Vocabulary Interning
+Encodes comma-separated skills, certifications and capabilities as integer
+bitmasks, so "what is missing" is a single AND-NOT instead of list scans
+"""
+
+import threading
+from typing import Dict, List, Iterable, Optional, Union
+import numpy as np
+import pandas as pd
+
+Mask = Union[int, str]
+
+
+class Vocabulary:
+    """
+    Interns tokens to bit positions
+
+    Each distinct token gets the next free bit. A comma-separated value such
+    as "Mapping, Survey" encodes to the OR of its tokens' bits. Masks are
+    Python ints (unbounded) for scalar use; encode_series() packs them into
+    uint64 words for NumPy.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self._bits: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._encoded: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for token in tokens:
+            self.intern(token)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @property
+    def words(self) -> int:
+        """Number of uint64 words needed to hold a mask"""
+        return max(1, (len(self._tokens) + 63) // 64)
+
+    def intern(self, token: str) -> int:
+        """Get the bit position for a token, assigning a new one if needed"""
+        token = token.strip()
+        bit = self._bits.get(token)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(token)
+                if bit is None:
+                    bit = len(self._tokens)
+                    self._tokens.append(token)
+                    self._bits[token] = bit
+        return bit
+
+    def encode(self, value: Mask) -> int:
+        """Encode a comma-separated string to a bitmask (ints pass through)"""
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        mask = self._encoded.get(value)
+        if mask is None:
+            mask = 0
+            for token in str(value).split(','):
+                if token.strip():
+                    mask |= 1 << self.intern(token)
+            self._encoded[value] = mask
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        """List the tokens in a mask, in interning order"""
+        tokens = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                tokens.append(self._tokens[bit])
+            mask >>= 1
+            bit += 1
+        return tokens
+
+    def missing(self, have: Mask, need: Mask) -> List[str]:
+        """
+        List the required tokens that are not held
+
+        When need is a string its order is preserved, so messages read the
+        same as the string-based checks; otherwise tokens come in bit order.
+        """
+        missing = self.encode(need) & ~self.encode(have)
+        if not missing:
+            return []
+        if isinstance(need, str):
+            tokens = [t.strip() for t in need.split(',') if t.strip()]
+            return [t for t in dict.fromkeys(tokens) if missing >> self._bits[t] & 1]
+        return self.decode(missing)
+
+    def encode_series(self, values: pd.Series, words: Optional[int] = None) -> np.ndarray:
+        """
+        Encode a column to packed uint64 words (rows x words)
+
+        Each distinct string is encoded once, then broadcast back to rows.
+        """
+        codes, uniques = pd.factorize(values.fillna('').astype(str))
+        masks = [self.encode(u) for u in uniques]
+        words = words or self.words
+        packed = np.zeros((len(uniques), words), dtype=np.uint64)
+        for i, mask in enumerate(masks):
+            for w in range(words):
+                packed[i, w] = (mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF
+        return packed[codes]
+
+
+def encode_columns(vocabulary: Vocabulary, *columns: pd.Series) -> List[np.ndarray]:
+    """Encode several columns with the same vocabulary and the same word count"""
+    for values in columns:
+        for value in pd.unique(values.fillna('').astype(str)):
+            vocabulary.encode(value)
+    return [vocabulary.encode_series(values, vocabulary.words) for values in columns]
+
+
+def lacks(need: np.ndarray, have: np.ndarray) -> np.ndarray:
+    """
+    Compare packed masks: does each row of `have` miss any bit of each row of `need`?
+
+    Args:
+        need: (M, W) uint64 required masks
+        have: (N, W) uint64 held masks
+
+    Returns:
+        (M, N) boolean array
+    """
+    result = np.zeros((need.shape[0], have.shape[0]), dtype=bool)
+    for w in range(need.shape[1]):
+        result |= (need[:, w, None] & ~have[None, :, w]) != 0
+    return result
+
+
+# Shared vocabularies, filled as data is loaded
+SKILLS = Vocabulary()
+CERTIFICATIONS = Vocabulary()
+CAPABILITIES = Vocabulary()
+
+_capability_masks: Dict[int, int] = {}
+
+
+def required_capabilities(required_skills: Mask, skill_to_capability: Dict[str, str]) -> int:
+    """Translate a required-skills mask to the capability mask a drone needs"""
+    skills_mask = SKILLS.encode(required_skills)
+    caps = _capability_masks.get(skills_mask)
+    if caps is None:
+        caps = 0
+        for skill in SKILLS.decode(skills_mask):
+            capability = skill_to_capability.get(skill)
+            if capability:
+                caps |= 1 << CAPABILITIES.intern(capability)
+        _capability_masks[skills_mask] = caps
+    return caps
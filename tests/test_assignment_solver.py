@@ -0,0 +1,33 @@
+"""
+AssignmentSolver regression tests
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.assignment_solver import AssignmentSolver
+from src.batch_conflict_detector import BatchConflictDetector
+
+
+def mission(project_id: str, certs: str, priority: str) -> dict:
+    return {'project_id': project_id, 'client': 'Client', 'location': 'Pune', 'required_skills': 'Mapping',
+            'required_certs': certs, 'start_date': '2026-03-01', 'end_date': '2026-03-05', 'priority': priority}
+
+
+def test_drone_not_wasted_on_mission_without_pilot():
+    pilots = pd.DataFrame([{'pilot_id': 'P1', 'name': 'Asha', 'skills': 'Mapping', 'certifications': 'DGCA',
+                            'location': 'Pune', 'status': 'Available', 'current_assignment': '–',
+                            'available_from': '2026-01-01'}])
+    drones = pd.DataFrame([{'drone_id': 'D1', 'model': 'M3', 'capabilities': 'RGB', 'status': 'Available',
+                            'location': 'Pune', 'current_assignment': '–', 'maintenance_due': '2027-01-01'}])
+    missions = pd.DataFrame([mission('A', 'Night Ops', 'Urgent'), mission('B', 'DGCA', 'Standard')])
+
+    result = AssignmentSolver(BatchConflictDetector(pilots, drones, missions)).solve().set_index('project_id')
+
+    assert not result.loc['A', 'assigned']
+    assert result.loc['B', 'assigned']
+    assert (result.loc['B', 'pilot_id'], result.loc['B', 'drone_id']) == ('P1', 'D1')
@@ -0,0 +1,33 @@
+"""
+ConflictState regression tests: edits made directly in the sheet reach
+"check conflicts" once the state ages out, with or without delta sync
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.conflict_state import get_conflict_state
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.storage import LocalSpreadsheet
+
+
+@pytest.mark.parametrize('delta_sync', [False, True])
+def test_outside_edit_shows_up_after_ttl(delta_sync):
+    local = LocalSpreadsheet()
+    manager = SheetsManager(FakeSpreadsheet(local), scheduler=RequestScheduler(), snapshot=None,
+                            delta_sync=delta_sync)
+    manager.cache_ttl = 0.0
+    before = get_conflict_state(manager).conflicts()
+    assert not any('D001' in conflict for conflict in before)
+
+    sheet = local.worksheet('drone_fleet')
+    sheet.update_cell(2, sheet.get_all_values()[0].index('status') + 1, 'Maintenance')
+
+    after = get_conflict_state(manager).conflicts()
+    assert any('D001' in conflict for conflict in after)
@@ -0,0 +1,59 @@
+"""
+Row index regression tests: appended rows are indexed where the sheet
+says they landed, not where a local row count expects them
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.storage import LocalSpreadsheet
+
+
+def make_manager(latency: float = 0.0):
+    local = LocalSpreadsheet()
+    manager = SheetsManager(FakeSpreadsheet(local, latency=latency), scheduler=RequestScheduler(), snapshot=None)
+    manager.get_pilots()  # build the row index
+    return manager, local
+
+
+def pilot(pilot_id: str) -> dict:
+    return {'pilot_id': pilot_id, 'name': pilot_id, 'skills': 'Mapping',
+            'certifications': 'DGCA', 'location': 'Pune'}
+
+
+def statuses(local: LocalSpreadsheet) -> dict:
+    rows = local.worksheet('pilot_roster').get_all_values()
+    header = rows[0]
+    return {row[0]: row[header.index('status')] for row in rows[1:]}
+
+
+def test_append_after_outside_append_indexes_landed_row():
+    manager, local = make_manager()
+    # Someone else appends straight to the sheet; our index doesn't know
+    local.worksheet('pilot_roster').append_row(['PX', 'X', 'Mapping', 'DGCA', 'Pune', 'Available', '–', '–'])
+    assert manager.add_pilot(pilot('P9'))
+    assert manager.update_pilot_status('P9', 'On Leave')
+    after = statuses(local)
+    assert after['P9'] == 'On Leave'
+    assert after['PX'] == 'Available'
+
+
+def test_concurrent_appends_keep_their_own_rows():
+    manager, local = make_manager(latency=0.01)
+    ids = [f'P{n}' for n in range(10, 20)]
+    threads = [threading.Thread(target=manager.add_pilot, args=(pilot(pilot_id),)) for pilot_id in ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    for pilot_id in ids:
+        assert manager.update_pilot_status(pilot_id, 'On Leave')
+    after = statuses(local)
+    assert all(after[pilot_id] == 'On Leave' for pilot_id in ids)
+    assert sum(status == 'On Leave' for status in after.values()) == len(ids) + 1  # P004 starts on leave
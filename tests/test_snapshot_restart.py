@@ -0,0 +1,66 @@
+"""
+Snapshot regression tests: a warm restart against an unchanged sheet
+revalidates the saved copy instead of downloading it again
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.snapshot_store import SnapshotStore
+from src.storage import LocalSpreadsheet
+
+DOWNLOADS = ('values_batch_get', 'get_all_records')
+
+
+def start(fake: FakeSpreadsheet, path: str) -> SheetsManager:
+    return SheetsManager(fake, scheduler=RequestScheduler(), snapshot=SnapshotStore(path), delta_sync=True)
+
+
+def restart_calls(fake: FakeSpreadsheet, path: str):
+    with fake.track() as calls:
+        manager = start(fake, path)
+        manager.get_snapshot()
+        manager.get_pilots()
+    return calls
+
+
+def test_warm_restart_downloads_nothing(tmp_path):
+    path = str(tmp_path / 'snapshot.sqlite')
+    fake = FakeSpreadsheet(LocalSpreadsheet())
+    first = start(fake, path)
+    first.get_snapshot()
+    first.snapshot.close()
+
+    calls = restart_calls(fake, path)
+    assert not any(calls[operation] for operation in DOWNLOADS)
+
+
+def test_warm_restart_after_own_write_downloads_nothing(tmp_path):
+    path = str(tmp_path / 'snapshot.sqlite')
+    fake = FakeSpreadsheet(LocalSpreadsheet())
+    first = start(fake, path)
+    first.get_snapshot()
+    assert first.update_pilot_status('P001', 'On Leave')
+    first.get_snapshot()  # downloads the written sheet again
+    first.snapshot.close()
+
+    calls = restart_calls(fake, path)
+    assert not any(calls[operation] for operation in DOWNLOADS)
+
+
+def test_warm_restart_downloads_changed_sheet(tmp_path):
+    path = str(tmp_path / 'snapshot.sqlite')
+    local = LocalSpreadsheet()
+    fake = FakeSpreadsheet(local)
+    first = start(fake, path)
+    first.get_snapshot()
+    first.snapshot.close()
+    local.worksheet('pilot_roster').update_cell(2, 6, 'On Leave')
+
+    calls = restart_calls(fake, path)
+    assert any(calls[operation] for operation in DOWNLOADS)
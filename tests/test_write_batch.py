@@ -0,0 +1,104 @@
+"""
+WriteBatch regression tests: buffered appends must not desync the
+primary key -> row number index, for this thread or any other
+"""
+
+import os
+import threading
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fake_gspread import FakeSpreadsheet
+from src.request_scheduler import RequestScheduler
+from src.sheets_manager import SheetsManager
+from src.storage import LocalSpreadsheet
+
+
+def make_manager() -> SheetsManager:
+    manager = SheetsManager(FakeSpreadsheet(LocalSpreadsheet()), scheduler=RequestScheduler(), snapshot=None)
+    manager.get_pilots()  # build the row index
+    return manager
+
+
+def pilot(pilot_id: str) -> dict:
+    return {'pilot_id': pilot_id, 'name': pilot_id, 'skills': 'Mapping',
+            'certifications': 'DGCA', 'location': 'Pune'}
+
+
+def statuses(manager: SheetsManager) -> dict:
+    pilots = manager.get_pilots()
+    return dict(zip(pilots['pilot_id'], pilots['status']))
+
+
+def test_read_inside_batch_sees_buffered_rows():
+    manager = make_manager()
+    with manager.batch():
+        manager.add_pilot(pilot('P9'))
+        manager.update_pilot_status('P001', 'On Leave')
+        inside = statuses(manager)
+    assert inside['P9'] == 'Available'
+    assert inside['P001'] == 'On Leave'
+    assert statuses(manager) == inside
+
+
+def test_read_between_appends_keeps_row_numbers():
+    manager = make_manager()
+    with manager.batch():
+        manager.add_pilot(pilot('P9'))
+        manager.get_pilots()
+        manager.add_pilot(pilot('P10'))
+    assert manager.update_pilot_status('P10', 'On Leave')
+    after = statuses(manager)
+    assert after['P9'] == 'Available'
+    assert after['P10'] == 'On Leave'
+
+
+def test_read_after_single_append_finds_row():
+    manager = make_manager()
+    with manager.batch():
+        manager.add_pilot(pilot('P9'))
+        manager.get_pilots()
+    assert manager.update_pilot_status('P9', 'On Leave')
+    assert statuses(manager)['P9'] == 'On Leave'
+
+
+def test_buffered_row_hidden_from_other_threads():
+    manager = make_manager()
+    held, added = threading.Event(), threading.Event()
+
+    def batched():
+        with manager.batch():
+            manager.add_pilot(pilot('P9'))
+            held.set()
+            added.wait(5)
+
+    thread = threading.Thread(target=batched)
+    thread.start()
+    held.wait(5)
+    assert manager.add_pilot(pilot('P10'))
+    assert manager.update_pilot_status('P10', 'On Leave')
+    added.set()
+    thread.join(5)
+
+    after = statuses(manager)
+    assert after['P9'] == 'Available'
+    assert after['P10'] == 'On Leave'
+    assert '' not in after
+
+
+def test_edit_of_buffered_row_goes_into_the_append():
+    manager = make_manager()
+    with manager.batch() as batch:
+        manager.add_pilot(pilot('P9'))
+        assert manager.update_pilot_status('P9', 'On Leave')
+    assert batch.report()['requests_made'] == 1
+    assert statuses(manager)['P9'] == 'On Leave'
+
+
+def test_delete_of_buffered_row_inside_batch():
+    manager = make_manager()
+    with manager.batch():
+        manager.add_pilot(pilot('P9'))
+        assert manager.delete_pilot('P9')
+    assert 'P9' not in statuses(manager)